@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "FastAPI Auth"
@@ -8,6 +8,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Threads for bcrypt hashing/verification; bounds concurrent password work per worker
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Authentication cache (per process)
+    AUTH_CLAIMS_CACHE_SIZE: int = 10000
+    # Invalidation only reaches the worker that changed the user, so this also bounds
+    # how long other workers may serve a stale user
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    # Accounts allowed to call admin-only routes, as a JSON list, e.g. '["ops@example.com"]'
+    ADMIN_EMAILS: List[str] = []
+
+    # Revoked-token denylist held in memory by every worker
+    AUTH_DENYLIST_BLOOM_CAPACITY: int = 100000
+    AUTH_DENYLIST_BLOOM_ERROR_RATE: float = 0.001
+    AUTH_DENYLIST_SYNC_SECONDS: float = 5.0
+    # Each sync re-reads this many ids below the highest one seen, so rows whose ids were
+    # allocated earlier but committed later are not skipped
+    AUTH_DENYLIST_SYNC_OVERLAP_IDS: int = 1000
+    AUTH_DENYLIST_SWEEP_SECONDS: float = 3600.0
+    AUTH_DENYLIST_SWEEP_BATCH_SIZE: int = 1000
 
     # Database Configuration
     DATABASE_HOST: str
@@ -17,13 +37,29 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
 
     DATABASE_URL: str = ""
+    ASYNC_DATABASE_URL: str = ""
+
+    # Connection pool (applies to the sync and async engines separately, per worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
 
     def __init__(self, **data):
         super().__init__(**data)
-        self.DATABASE_URL = (
-            f'postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}'
-            f'@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}'
-        )
+        # An explicit DATABASE_URL (e.g. SQLite for local benchmarks) wins over the parts
+        if not self.DATABASE_URL:
+            self.DATABASE_URL = (
+                f'postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}'
+                f'@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}'
+            )
+        if not self.ASYNC_DATABASE_URL:
+            self.ASYNC_DATABASE_URL = (
+                self.DATABASE_URL
+                .replace('postgresql://', 'postgresql+asyncpg://', 1)
+                .replace('sqlite://', 'sqlite+aiosqlite://', 1)
+            )
 
     # Email
     SMTP_SERVER: str
@@ -32,6 +68,22 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str
     EMAILS_FROM_EMAIL: str
     EMAILS_FROM_NAME: str
+    # Pooled SMTP connections per worker; idle ones are reopened after EMAIL_SMTP_IDLE_SECONDS
+    EMAIL_SMTP_POOL_SIZE: int = 2
+    EMAIL_SMTP_IDLE_SECONDS: float = 60.0
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Outbox drained by the background worker
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 300.0
+    # Sent and failed rows are deleted after this long
+    EMAIL_OUTBOX_RETENTION_DAYS: int = 14
+    EMAIL_OUTBOX_SWEEP_SECONDS: float = 3600.0
+    EMAIL_OUTBOX_SWEEP_BATCH_SIZE: int = 1000
+    # Compiled Jinja bytecode for app/templates; defaults to a directory under the system temp dir
+    EMAIL_TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
 
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: str
@@ -40,9 +92,68 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
 
+    # AI response cache
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_MEMORY_MAX_ENTRIES: int = 1024
+    AI_CACHE_PERSISTENT: bool = True
+    AI_CACHE_DEFAULT_TTL_SECONDS: int = 3600
+    # Expired rows of the persistent tier are deleted in batches this often
+    AI_CACHE_SWEEP_SECONDS: float = 3600.0
+    AI_CACHE_SWEEP_BATCH_SIZE: int = 1000
+
+    # Outbound AI request limits (per worker process)
+    AI_MAX_CONCURRENT_REQUESTS: int = 8
+    AI_REQUESTS_PER_MINUTE: int = 500
+    AI_TOKENS_PER_MINUTE: int = 150000
+    AI_COMPLETION_TOKEN_RESERVE: int = 1024
+
+    # Chat streaming
+    CHAT_SSE_HEARTBEAT_SECONDS: float = 15.0
+    CHAT_STREAM_BUFFER_TTL_SECONDS: int = 300
+    CHAT_STREAM_MAX_BUFFERED: int = 1000
+
+    # Chat history sent to the model: recent messages within the budget, older ones summarized
+    CHAT_HISTORY_TOKEN_BUDGET: int = 3000
+    CHAT_HISTORY_MAX_MESSAGES: int = 200
+
+    # Rebuild interval of the in-process chat context index (used when the database has no full-text search)
+    CHAT_CONTEXT_INDEX_TTL_SECONDS: int = 60
+    CHAT_SEMANTIC_RETRIEVAL_ENABLED: bool = True
+
+    # Embeddings and the memory-mapped vector index shared by all workers
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_DIMENSIONS: int = 512
+    VECTOR_INDEX_DIR: str = "./vector_index"
+    VECTOR_INDEX_IVF_THRESHOLD: int = 50000
+    VECTOR_INDEX_NPROBE: int = 8
+    CHAT_SUMMARY_TRIGGER_TOKENS: int = 1000
+    CHAT_SUMMARY_MAX_TOKENS: int = 400
+    # A long backlog is folded into the summary in chunks of about this many tokens
+    CHAT_SUMMARY_CHUNK_TOKENS: int = 4000
+    CHAT_SUMMARY_CHUNK_MAX_MESSAGES: int = 100
+
     # ScraperAPI Configuration
     SCRAPER_API_KEY: Optional[str] = None
-    SCRAPER_API_BASE_URL: str = "http://api.scraperapi.com/"
+    # HTTPS so HTTP/2 can be negotiated (ALPN); plain http:// stays on HTTP/1.1
+    SCRAPER_API_BASE_URL: str = "https://api.scraperapi.com/"
+    SCRAPER_HTTP2: bool = True
+    SCRAPER_MAX_CONNECTIONS: int = 20
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int = 4
+    SCRAPER_KEEPALIVE_SECONDS: float = 30.0
+    SCRAPER_TIMEOUT_SECONDS: float = 30.0
+    SCRAPER_CONNECT_TIMEOUT_SECONDS: float = 10.0
+
+    # Feed ingestion scheduler (sources live in the feed_sources table)
+    # Off by default: polling spends ScraperAPI credits and OpenAI categorization calls.
+    # Enable it in the deployment's environment; POST /trends/fetch-and-process
+    # (and the news-feed equivalent) run due sources once when the loop is off
+    FEED_SCHEDULER_ENABLED: bool = False
+    FEED_SCHEDULER_MAX_PARALLEL: int = 4
+    FEED_SCHEDULER_POLL_SECONDS: float = 30.0
+    # Each run is rescheduled at interval * (1 +/- jitter)
+    FEED_SCHEDULER_JITTER: float = 0.1
+    FEED_SCHEDULER_MAX_BACKOFF_SECONDS: float = 21600.0
+    FEED_SCHEDULER_LEASE_SECONDS: float = 900.0
 
     # OAuth2
     GOOGLE_CLIENT_ID: Optional[str] = None
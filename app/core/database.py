@@ -1,16 +1,61 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
+from .pool_metrics import PoolMetrics, instrumented_pool_class, listen_for_connection_events
 
-engine = create_engine(settings.DATABASE_URL)
+# SQLite connections are shared between the threadpool and the event loop
+connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=connect_args,
+    poolclass=instrumented_pool_class(QueuePool, sync_pool_metrics),
+    **pool_options
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+    **pool_options
+)
+# Attributes stay loaded after commit; async sessions cannot lazy-load on access
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+listen_for_connection_events(engine, sync_pool_metrics)
+listen_for_connection_events(async_engine.sync_engine, async_pool_metrics)
+
 Base = declarative_base()
 
+def get_pool_stats() -> dict:
+    return {
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.pool),
+    }
+
 # Database dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async database dependency, for async def routes
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,68 @@
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+class PoolMetrics:
+    """Counters for one connection pool: checkout volume, time spent waiting for a connection, and failures."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.connections_opened = 0
+        self.connections_invalidated = 0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "avg_checkout_wait_ms": round(self.total_wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_checkout_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "connections_opened": self.connections_opened,
+            "connections_invalidated": self.connections_invalidated,
+        }
+        # QueuePool-style pools expose their current occupancy
+        for attribute in ("size", "checkedout", "checkedin", "overflow"):
+            method = getattr(pool, attribute, None)
+            if callable(method):
+                stats[attribute] = method()
+        return stats
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass of `base` that times every connection checkout.
+
+    The metrics live on the class so they survive pool recreation (engine.dispose()).
+    """
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.checkout_timeouts += 1
+                raise
+            metrics.record_checkout(time.perf_counter() - started_at)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+def listen_for_connection_events(pool_target: Any, metrics: PoolMetrics) -> None:
+    @event.listens_for(pool_target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connections_opened += 1
+
+    @event.listens_for(pool_target, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.connections_invalidated += 1
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.crud.base import CRUDBase
+from app.models.ai_response_cache import AIResponseCacheEntry
+
+class CRUDAIResponseCache(CRUDBase[AIResponseCacheEntry, None, None]):
+    def get_valid(self, db: Session, *, cache_key: str) -> Optional[AIResponseCacheEntry]:
+        return db.query(self.model).filter(
+            self.model.cache_key == cache_key,
+            self.model.expires_at > datetime.now(timezone.utc)
+        ).first()
+
+    def upsert(self, db: Session, *, cache_key: str, response_model: str, payload: Dict[str, Any], expires_at: datetime) -> AIResponseCacheEntry:
+        db_obj = db.query(self.model).filter(self.model.cache_key == cache_key).first()
+        if db_obj is None:
+            db_obj = self.model(cache_key=cache_key)
+        db_obj.response_model = response_model
+        db_obj.payload = payload
+        db_obj.expires_at = expires_at
+        db.add(db_obj)
+        db.commit()
+        return db_obj
+
+    def delete_expired_batch(self, db: Session, *, batch_size: int) -> int:
+        """Deletes up to `batch_size` expired rows (uses the expires_at index); returns how many were deleted."""
+        expired_ids = (
+            select(self.model.id)
+            .filter(self.model.expires_at <= datetime.now(timezone.utc))
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = db.execute(delete(self.model).where(self.model.id.in_(expired_ids)))
+        db.commit()
+        return result.rowcount
+
+ai_response_cache = CRUDAIResponseCache(AIResponseCacheEntry)
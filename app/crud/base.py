@@ -1,6 +1,11 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, Set, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel
+from pydantic import AnyUrl, BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.database import Base
 
@@ -31,13 +36,47 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
-    def update(
-        self,
-        db: Session,
-        *,
-        db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
-    ) -> ModelType:
+    def get_existing_slugs(self, db: Session, *, slugs: List[str]) -> Set[str]:
+        """Which of `slugs` already exist, in one IN query."""
+        if not slugs:
+            return set()
+        rows = db.query(self.model.slug).filter(self.model.slug.in_(slugs)).all()
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _insert_values(obj_in: CreateSchemaType) -> Dict[str, Any]:
+        # Python values for a Core insert: datetimes stay datetimes, URLs and enums become plain strings
+        values = obj_in.model_dump()
+        for key, value in values.items():
+            if isinstance(value, AnyUrl):
+                values[key] = str(value)
+            elif isinstance(value, Enum):
+                values[key] = value.value
+        return values
+
+    def create_many_by_slug(self, db: Session, *, objs_in: List[CreateSchemaType], batch_size: int = 500) -> List[Tuple[int, str]]:
+        """
+        Inserts `objs_in` with multi-row INSERT ... ON CONFLICT (slug) DO NOTHING RETURNING id, slug
+        and one commit. Rows whose slug already exists (e.g. written by a concurrent run) are
+        skipped; returns (id, slug) of the rows actually written.
+        """
+        if not objs_in:
+            return []
+        insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else postgresql_insert
+        values = [self._insert_values(obj_in) for obj_in in objs_in]
+        created: List[Tuple[int, str]] = []
+        for start in range(0, len(values), batch_size):
+            statement = (
+                insert(self.model)
+                .values(values[start:start + batch_size])
+                .on_conflict_do_nothing(index_elements=["slug"])
+                .returning(self.model.id, self.model.slug)
+            )
+            created.extend((row.id, row.slug) for row in db.execute(statement))
+        db.commit()
+        return created
+
+    def _apply_update(self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> None:
         obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -46,6 +85,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        self._apply_update(db_obj, obj_in)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -55,4 +103,54 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
-        return obj
\ No newline at end of file
+        return obj
+
+    # Async variants, for use with AsyncSession from async def routes
+
+    async def aget(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def aget_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def aget_by_ids(self, db: AsyncSession, ids: List[Any]) -> List[ModelType]:
+        """Rows for `ids`, in the order of `ids`; missing ids are skipped."""
+        if not ids:
+            return []
+        result = await db.execute(select(self.model).filter(self.model.id.in_(ids)))
+        rows = {row.id: row for row in result.scalars().all()}
+        return [rows[id] for id in ids if id in rows]
+
+    async def aget_by_email(self, db: AsyncSession, email: str) -> Optional[ModelType]:
+        result = await db.execute(select(self.model).filter(self.model.email == email).limit(1))
+        return result.scalars().first()
+
+    async def acreate(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        self._apply_update(db_obj, obj_in)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def adelete(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
 from app.models.bookmarked_supplier import BookmarkedSupplier
+from app.models.supplier import Supplier
 from app.schemas.bookmarked_supplier import BookmarkedSupplierCreate
 
 class CRUDBookmarkedSupplier(CRUDBase[BookmarkedSupplier, BookmarkedSupplierCreate, None]):
@@ -12,4 +13,9 @@ class CRUDBookmarkedSupplier(CRUDBase[BookmarkedSupplier, BookmarkedSupplierCrea
             self.model.supplier_id == supplier_id
         ).first()
 
+    def get_suppliers_for_user(self, db: Session, *, user_id: int) -> List[Supplier]:
+        return db.query(Supplier).join(self.model, self.model.supplier_id == Supplier.id).filter(
+            self.model.user_id == user_id
+        ).all()
+
 bookmarked_supplier = CRUDBookmarkedSupplier(BookmarkedSupplier)
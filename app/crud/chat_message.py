@@ -1,4 +1,6 @@
-from typing import List
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.chat_message import ChatMessage
@@ -6,6 +8,44 @@ from app.schemas.chat_message import ChatMessageCreate, ChatMessageUpdate
 
 class CRUDChatMessage(CRUDBase[ChatMessage, ChatMessageCreate, ChatMessageUpdate]):
     def get_by_conversation_id(self, db: Session, *, conversation_id: int) -> List[ChatMessage]:
-        return db.query(self.model).filter(self.model.conversation_id == conversation_id).all()
+        return db.query(self.model).filter(self.model.conversation_id == conversation_id).order_by(self.model.id).all()
+
+    def _last_query(self, conversation_id: int, limit: int, before_id: Optional[int], after_id: Optional[int]):
+        query = select(self.model).filter(self.model.conversation_id == conversation_id)
+        if before_id is not None:
+            query = query.filter(self.model.id < before_id)
+        if after_id is not None:
+            query = query.filter(self.model.id > after_id)
+        return query.order_by(self.model.id.desc()).limit(limit)
+
+    def get_last(
+        self, db: Session, *, conversation_id: int, limit: int, before_id: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[ChatMessage]:
+        """
+        The newest `limit` messages older than `before_id` (keyset cursor), oldest first.
+        Read newest-first on (conversation_id, id) and re-ordered in memory.
+        """
+        rows = db.execute(self._last_query(conversation_id, limit, before_id, after_id)).scalars().all()
+        return list(reversed(rows))
+
+    async def aget_by_conversation_id(
+        self, db: AsyncSession, *, conversation_id: int, after_id: Optional[int] = None, up_to_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[ChatMessage]:
+        query = select(self.model).filter(self.model.conversation_id == conversation_id)
+        if after_id is not None:
+            query = query.filter(self.model.id > after_id)
+        if up_to_id is not None:
+            query = query.filter(self.model.id <= up_to_id)
+        query = query.order_by(self.model.id)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def aget_last(
+        self, db: AsyncSession, *, conversation_id: int, limit: int, before_id: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[ChatMessage]:
+        result = await db.execute(self._last_query(conversation_id, limit, before_id, after_id))
+        return list(reversed(result.scalars().all()))
 
 chat_message = CRUDChatMessage(ChatMessage)
@@ -1,4 +1,6 @@
 from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.conversation import Conversation
@@ -17,4 +19,26 @@ class CRUDConversation(CRUDBase[Conversation, ConversationCreate, ConversationUp
             self.model.user_id == user_id
         ).first()
 
+    async def aget_by_id_and_user(self, db: AsyncSession, *, conversation_id: int, user_id: int) -> Optional[Conversation]:
+        result = await db.execute(select(self.model).filter(
+            self.model.id == conversation_id,
+            self.model.user_id == user_id
+        ).limit(1))
+        return result.scalars().first()
+
+    async def aupdate_summary(
+        self, db: AsyncSession, *, conversation_id: int, summary: str, summary_message_id: int, expected_message_id: Optional[int]
+    ) -> bool:
+        """Stores a new rolling summary unless another writer advanced it first."""
+        result = await db.execute(
+            update(self.model)
+            .where(
+                self.model.id == conversation_id,
+                self.model.summary_message_id.is_(None) if expected_message_id is None else self.model.summary_message_id == expected_message_id
+            )
+            .values(summary=summary, summary_message_id=summary_message_id)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
 conversation = CRUDConversation(Conversation)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.crud.base import CRUDBase
+from app.models.email_outbox import EmailOutbox
+
+class CRUDEmailOutbox(CRUDBase[EmailOutbox, None, None]):
+    def enqueue(self, db: Session, *, to_email: str, subject: str, template_name: str, template_context: Dict[str, Any]) -> EmailOutbox:
+        db_obj = self.model(
+            to_email=to_email,
+            subject=subject,
+            template_name=template_name,
+            template_context=template_context,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+        db.add(db_obj)
+        db.commit()
+        return db_obj
+
+    def enqueue_many(self, db: Session, *, subject: str, template_name: str, recipients: List[Tuple[str, Dict[str, Any]]]) -> int:
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            self.model(
+                to_email=to_email,
+                subject=subject,
+                template_name=template_name,
+                template_context=template_context,
+                status="pending",
+                attempts=0,
+                next_attempt_at=now,
+            )
+            for to_email, template_context in recipients
+        ])
+        db.commit()
+        return len(recipients)
+
+    async def aclaim_due(self, db: AsyncSession, *, batch_size: int, lease_seconds: float) -> List[EmailOutbox]:
+        """
+        Claims up to `batch_size` due rows by pushing their next_attempt_at past the lease.
+        SKIP LOCKED lets several workers drain the outbox without sending a row twice.
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(self.model)
+            .filter(self.model.status == "pending", self.model.next_attempt_at <= now)
+            .order_by(self.model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = list(result.scalars().all())
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        await db.commit()
+        return rows
+
+    async def amark_sent(self, db: AsyncSession, *, ids: List[int]) -> None:
+        """Marks rows sent and drops their template context, which may hold reset tokens."""
+        if not ids:
+            return
+        await db.execute(
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(status="sent", sent_at=datetime.now(timezone.utc), last_error=None, template_context={})
+        )
+        await db.commit()
+
+    async def amark_failed(self, db: AsyncSession, *, id: int, error: str, retry_at: Optional[datetime]) -> None:
+        """Reschedules the row for `retry_at`, or gives up on it when `retry_at` is None."""
+        values: Dict[str, Any] = {"last_error": error[:2000]}
+        if retry_at is None:
+            values["status"] = "failed"
+            values["template_context"] = {}
+        else:
+            values["next_attempt_at"] = retry_at
+        await db.execute(update(self.model).where(self.model.id == id).values(**values))
+        await db.commit()
+
+    async def adelete_finished_batch(self, db: AsyncSession, *, before: datetime, batch_size: int) -> int:
+        """Deletes up to `batch_size` sent or failed rows created before `before`; returns how many were deleted."""
+        finished_ids = (
+            select(self.model.id)
+            .filter(self.model.status.in_(("sent", "failed")), self.model.created_at < before)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(delete(self.model).where(self.model.id.in_(finished_ids)))
+        await db.commit()
+        return result.rowcount
+
+email_outbox = CRUDEmailOutbox(EmailOutbox)
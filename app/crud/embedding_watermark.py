@@ -0,0 +1,28 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import CRUDBase
+from app.models.embedding_watermark import EmbeddingWatermark
+
+class CRUDEmbeddingWatermark(CRUDBase[EmbeddingWatermark, None, None]):
+    async def aget_by_kind(self, db: AsyncSession, *, kind: str) -> Optional[EmbeddingWatermark]:
+        result = await db.execute(select(self.model).filter(self.model.kind == kind).limit(1))
+        return result.scalars().first()
+
+    async def aget_last_id(self, db: AsyncSession, *, kind: str, embedding_model: str) -> int:
+        watermark = await self.aget_by_kind(db, kind=kind)
+        if watermark is None or watermark.embedding_model != embedding_model:
+            return 0
+        return watermark.last_id
+
+    async def aadvance(self, db: AsyncSession, *, kind: str, embedding_model: str, last_id: int) -> EmbeddingWatermark:
+        watermark = await self.aget_by_kind(db, kind=kind)
+        if watermark is None:
+            watermark = self.model(kind=kind)
+        watermark.embedding_model = embedding_model
+        watermark.last_id = last_id
+        db.add(watermark)
+        await db.commit()
+        return watermark
+
+embedding_watermark = CRUDEmbeddingWatermark(EmbeddingWatermark)
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import CRUDBase
+from app.models.feed_source import FeedSource
+
+class CRUDFeedSource(CRUDBase[FeedSource, None, None]):
+    async def aclaim_due(self, db: AsyncSession, *, limit: int, lease_seconds: float) -> List[FeedSource]:
+        """
+        Claims up to `limit` due sources by pushing their next_run_at past the lease.
+        SKIP LOCKED keeps two workers from running the same source.
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(self.model)
+            .filter(self.model.enabled.is_(True), self.model.next_run_at <= now)
+            .order_by(self.model.next_run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        sources = list(result.scalars().all())
+        for source in sources:
+            source.next_run_at = now + timedelta(seconds=lease_seconds)
+        await db.commit()
+        return sources
+
+    async def atrigger(self, db: AsyncSession, *, kind: Optional[str] = None) -> int:
+        """Makes every enabled source (of `kind`, if given) due now; returns how many."""
+        statement = update(self.model).where(self.model.enabled.is_(True))
+        if kind is not None:
+            statement = statement.where(self.model.kind == kind)
+        result = await db.execute(statement.values(next_run_at=datetime.now(timezone.utc)))
+        await db.commit()
+        return result.rowcount
+
+    async def arecord_run(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        next_run_at: datetime,
+        duration_ms: int,
+        item_count: Optional[int],
+        error: Optional[str],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        values = {
+            "next_run_at": next_run_at,
+            "last_run_at": now,
+            "last_duration_ms": duration_ms,
+            "last_error": error[:2000] if error else None,
+        }
+        if error is None:
+            values.update(consecutive_failures=0, last_success_at=now, last_item_count=item_count)
+        else:
+            values["consecutive_failures"] = self.model.consecutive_failures + 1
+        await db.execute(update(self.model).where(self.model.id == id).values(**values))
+        await db.commit()
+
+    async def aget_all(self, db: AsyncSession) -> List[FeedSource]:
+        result = await db.execute(select(self.model).order_by(self.model.id))
+        return list(result.scalars().all())
+
+feed_source = CRUDFeedSource(FeedSource)
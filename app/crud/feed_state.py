@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import CRUDBase
+from app.models.feed_state import FeedState
+
+class CRUDFeedState(CRUDBase[FeedState, None, None]):
+    async def aget_by_url(self, db: AsyncSession, *, url: str) -> Optional[FeedState]:
+        result = await db.execute(select(self.model).filter(self.model.url == url).limit(1))
+        return result.scalars().first()
+
+    async def amark_fetched(self, db: AsyncSession, *, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Records a fetch that found the feed unchanged; validators that are given replace the stored ones."""
+        state = await self.aget_by_url(db, url=url)
+        if state is None:
+            return
+        if etag:
+            state.etag = etag
+        if last_modified:
+            state.last_modified = last_modified
+        state.last_fetched_at = datetime.now(timezone.utc)
+        await db.commit()
+
+    async def asave(self, db: AsyncSession, *, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str) -> FeedState:
+        now = datetime.now(timezone.utc)
+        state = await self.aget_by_url(db, url=url)
+        if state is None:
+            state = self.model(url=url)
+        state.etag = etag
+        state.last_modified = last_modified
+        state.content_hash = content_hash
+        state.last_fetched_at = now
+        state.last_changed_at = now
+        db.add(state)
+        await db.commit()
+        return state
+
+feed_state = CRUDFeedState(FeedState)
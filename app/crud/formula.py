@@ -1,6 +1,8 @@
 from typing import List, Optional
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.sql import func
 
 from app.crud.base import CRUDBase
@@ -75,4 +77,49 @@ class CRUDFormula(CRUDBase[Formula, FormulaCreate, FormulaUpdate]):
         formula.updated_at = func.now()
         db.commit()
         return self.get(db, id=formula_id)
+
+    async def aget(self, db: AsyncSession, id: int) -> Optional[Formula]:
+        # Everything the Formula schema serialises must be loaded up front
+        result = await db.execute(
+            select(self.model)
+            .options(
+                selectinload(self.model.ingredients).selectinload(FormulaIngredient.ingredient),
+                selectinload(self.model.ingredients).selectinload(FormulaIngredient.supplier)
+            )
+            .filter(self.model.id == id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    async def aget_with_full_details(self, db: AsyncSession, id: int) -> Optional[Formula]:
+        from app.models.ingredient import Ingredient
+        result = await db.execute(
+            select(self.model)
+            .options(
+                selectinload(self.model.ingredients).selectinload(FormulaIngredient.ingredient).selectinload(Ingredient.suppliers),
+                selectinload(self.model.ingredients).selectinload(FormulaIngredient.supplier)
+            )
+            .filter(self.model.id == id)
+        )
+        return result.scalars().first()
+
+    async def acreate_with_author(
+        self, db: AsyncSession, *, obj_in: FormulaCreate, author_id: int, conversation_id: Optional[int] = None
+    ) -> Formula:
+        formula_data = obj_in.dict(exclude={"ingredients"})
+        db_formula = Formula(**formula_data, author_id=author_id, conversation_id=conversation_id)
+        db.add(db_formula)
+        await db.flush()
+
+        for ingredient_in in obj_in.ingredients:
+            db.add(FormulaIngredient(
+                formula_id=db_formula.id,
+                ingredient_id=ingredient_in.ingredient_id,
+                quantity=ingredient_in.quantity,
+                supplier_id=ingredient_in.supplier_id,
+            ))
+
+        await db.commit()
+        return await self.aget(db, id=db_formula.id)
+
 formula = CRUDFormula(Formula)
@@ -1,5 +1,7 @@
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 from app.crud.base import CRUDBase
 from app.models.ingredient import Ingredient
@@ -15,6 +17,36 @@ class CRUDIngredient(CRUDBase[Ingredient, IngredientCreate, IngredientUpdate]):
             query = query.filter(self.model.name.ilike(f"%{search}%"))
         return query.offset(skip).limit(limit).all()
 
+    async def aget_by_slug(self, db: AsyncSession, *, slug: str) -> Ingredient | None:
+        result = await db.execute(select(self.model).filter(self.model.slug == slug).limit(1))
+        return result.scalars().first()
+
+    async def aget_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[Ingredient]:
+        query = select(self.model)
+        if search:
+            query = query.filter(self.model.name.ilike(f"%{search}%"))
+        result = await db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def asearch_ranked(self, db: AsyncSession, *, keywords: List[str], limit: int = 5) -> List[Ingredient]:
+        """Postgres full-text search on the generated (GIN-indexed) search_vector column, best match first."""
+        search_vector = literal_column("ingredients.search_vector")
+        ts_query = func.to_tsquery("english", " | ".join(keywords))
+        result = await db.execute(
+            select(self.model)
+            .filter(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank(search_vector, ts_query).desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def aget_search_documents(self, db: AsyncSession) -> List[Tuple[Any, ...]]:
+        """(id, name, description, function, benefits) of every ingredient, for the in-process search index."""
+        result = await db.execute(select(
+            self.model.id, self.model.name, self.model.description, self.model.function, self.model.benefits
+        ))
+        return [tuple(row) for row in result.all()]
+
     def add_supplier(self, db: Session, ingredient: Ingredient, supplier: "Supplier") -> Ingredient:
         if supplier not in ingredient.suppliers:
             ingredient.suppliers.append(supplier)
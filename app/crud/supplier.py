@@ -2,15 +2,20 @@ from app.crud.base import CRUDBase
 from app.models.supplier import Supplier
 from app.schemas.supplier import SupplierCreate, SupplierUpdate
 from typing import List, Optional
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.encoders import jsonable_encoder
 
 class CRUDSupplier(CRUDBase[Supplier, SupplierCreate, SupplierUpdate]):
-    def create(self, db: Session, *, obj_in: SupplierCreate) -> Supplier:
+    def _build(self, obj_in: SupplierCreate) -> Supplier:
         obj_in_data = jsonable_encoder(obj_in)
         model_columns = [c.key for c in self.model.__table__.columns]
         filtered_data = {k: v for k, v in obj_in_data.items() if k in model_columns}
-        db_obj = self.model(**filtered_data)
+        return self.model(**filtered_data)
+
+    def create(self, db: Session, *, obj_in: SupplierCreate) -> Supplier:
+        db_obj = self._build(obj_in)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -29,7 +34,6 @@ class CRUDSupplier(CRUDBase[Supplier, SupplierCreate, SupplierUpdate]):
         return db.query(self.model).join(Ingredient.suppliers).filter(Ingredient.id == ingredient_id).order_by(self.model.price_per_unit.asc()).first()
 
     def link_supplier_to_ingredient(self, db: Session, supplier_id: int, ingredient_id: int):
-        from sqlalchemy import insert
         from app.models.ingredient import ingredient_suppliers
         db.execute(insert(ingredient_suppliers).values(
             ingredient_id=ingredient_id,
@@ -37,4 +41,28 @@ class CRUDSupplier(CRUDBase[Supplier, SupplierCreate, SupplierUpdate]):
         ))
         db.commit()
 
+    async def acreate(self, db: AsyncSession, *, obj_in: SupplierCreate) -> Supplier:
+        db_obj = self._build(obj_in)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        if hasattr(obj_in, 'ingredient_id') and obj_in.ingredient_id is not None:
+            await self.alink_supplier_to_ingredient(db, db_obj.id, obj_in.ingredient_id)
+        return db_obj
+
+    async def aget_cheapest_supplier_for_ingredient(self, db: AsyncSession, ingredient_id: int) -> Optional[Supplier]:
+        from app.models.ingredient import Ingredient # Import here to avoid circular dependency
+        result = await db.execute(
+            select(self.model).join(Ingredient.suppliers).filter(Ingredient.id == ingredient_id).order_by(self.model.price_per_unit.asc()).limit(1)
+        )
+        return result.scalars().first()
+
+    async def alink_supplier_to_ingredient(self, db: AsyncSession, supplier_id: int, ingredient_id: int):
+        from app.models.ingredient import ingredient_suppliers
+        await db.execute(insert(ingredient_suppliers).values(
+            ingredient_id=ingredient_id,
+            supplier_id=supplier_id
+        ))
+        await db.commit()
+
 supplier = CRUDSupplier(Supplier)
@@ -1,11 +1,38 @@
+from datetime import datetime, timezone
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.token_denylist import TokenDenylist
 from app.schemas.token_denylist import TokenDenylistCreate
-from typing import Optional
+from typing import List, Optional
 
 class CRUDTokenDenylist(CRUDBase[TokenDenylist, TokenDenylistCreate, None]):
     def get_by_jti(self, db: Session, *, jti: str) -> Optional[TokenDenylist]:
         return db.query(self.model).filter(self.model.jti == jti).first()
 
+    async def aget_by_jti(self, db: AsyncSession, *, jti: str) -> Optional[TokenDenylist]:
+        result = await db.execute(select(self.model).filter(self.model.jti == jti).limit(1))
+        return result.scalars().first()
+
+    async def aget_unexpired_after(self, db: AsyncSession, *, after_id: int) -> List[TokenDenylist]:
+        result = await db.execute(
+            select(self.model)
+            .filter(self.model.id > after_id, self.model.exp > datetime.now(timezone.utc))
+            .order_by(self.model.id)
+        )
+        return list(result.scalars().all())
+
+    async def adelete_expired_batch(self, db: AsyncSession, *, batch_size: int) -> int:
+        """Deletes up to `batch_size` expired rows (uses the exp index); returns how many were deleted."""
+        expired_ids = (
+            select(self.model.id)
+            .filter(self.model.exp <= datetime.now(timezone.utc))
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(delete(self.model).where(self.model.id.in_(expired_ids)))
+        await db.commit()
+        return result.rowcount
+
 token_denylist = CRUDTokenDenylist(TokenDenylist)
@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import CRUDBase
 from app.models.trend import TrendData
 from app.schemas.trend import TrendDataCreate, TrendCategory
-from typing import Optional, List
+from typing import Any, Optional, List, Tuple
 
 class CRUDTrendData(CRUDBase[TrendData, TrendDataCreate, None]):
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[TrendData]:
@@ -22,5 +23,35 @@ class CRUDTrendData(CRUDBase[TrendData, TrendDataCreate, None]):
             ))
         return query.order_by(self.model.scraped_at.desc()).offset(skip).limit(limit).all()
 
+    async def aget_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, category: Optional[TrendCategory] = None, search: Optional[str] = None
+    ) -> List[TrendData]:
+        query = select(self.model)
+        if category:
+            query = query.filter(self.model.category == category.value)
+        if search:
+            query = query.filter(or_(
+                self.model.title.ilike(f"%{search}%"),
+                self.model.description.ilike(f"%{search}%")
+            ))
+        result = await db.execute(query.order_by(self.model.scraped_at.desc()).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def asearch_ranked(self, db: AsyncSession, *, keywords: List[str], limit: int = 5) -> List[TrendData]:
+        """Postgres full-text search on the generated (GIN-indexed) search_vector column, best match first."""
+        search_vector = literal_column("trend_data.search_vector")
+        ts_query = func.to_tsquery("english", " | ".join(keywords))
+        result = await db.execute(
+            select(self.model)
+            .filter(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank(search_vector, ts_query).desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def aget_search_documents(self, db: AsyncSession) -> List[Tuple[Any, ...]]:
+        """(id, title, description) of every trend, for building the in-process search index."""
+        result = await db.execute(select(self.model.id, self.model.title, self.model.description))
+        return [tuple(row) for row in result.all()]
 
 trend = CRUDTrendData(TrendData)
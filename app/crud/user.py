@@ -3,15 +3,16 @@ from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import pwd_context
+from app.core.security import pwd_context, verify_password
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    def create(self, db: Session, *, obj_in: UserCreate, hashed_password: Optional[str] = None) -> User:
+        """Async callers should pass `hashed_password` (from security.hash_password) to keep bcrypt off the event loop."""
         create_data = obj_in.dict()
         create_data.pop("password")
         db_obj = User(
             **create_data,
-            hashed_password=pwd_context.hash(obj_in.password),
+            hashed_password=hashed_password or pwd_context.hash(obj_in.password),
         )
         db.add(db_obj)
         db.commit()
@@ -21,11 +22,11 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_reset_token(self, db: Session, *, token: str) -> Optional[User]:
         return db.query(User).filter(User.reset_token == token).first()
 
-    def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
+    async def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not pwd_context.verify(password, user.hashed_password):
+        if not await verify_password(password, user.hashed_password):
             return None
         return user
 
@@ -7,8 +7,9 @@ from app.schemas import user as user_schema
 from app.utils.deps import get_current_user
 from app.utils.logger import setup_logger
 from app.models.user import User
-from app.services.email import EmailService
+from app.services.email_outbox import email_outbox_worker
 from app.services.user import UserService
+from app.services.auth_cache import auth_cache
 from app.schemas.utility import APIResponse
 
 logger = setup_logger("account_api", "account.log")
@@ -49,9 +50,10 @@ async def change_password(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        user_service.change_password(db, current_user, old_password, new_password)
+        await user_service.change_password(db, current_user, old_password, new_password)
 
-        EmailService.send_email(
+        email_outbox_worker.enqueue(
+            db,
             to_email=current_user.email,
             subject="Password Reset Successfully",
             template_name="reset-password-success.html",
@@ -72,6 +74,7 @@ async def delete_account(
 ):
     try:
         user_crud.delete(db, id=current_user.id)
+        auth_cache.invalidate_user(current_user.email)
         logger.info(f"Account deleted: {current_user.email}")
         return APIResponse(message="Account deleted successfully")
     except Exception as e:
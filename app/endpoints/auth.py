@@ -7,16 +7,17 @@ from jose import jwt
 
 from app.core.database import get_db
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.security import create_access_token, hash_password
 from app.crud.user import user as user_crud
 from app.crud.token_denylist import token_denylist as token_denylist_crud
 from app.schemas import auth as auth_schema
 from app.schemas.token_denylist import TokenDenylistCreate
-from app.services.email import EmailService
+from app.services.email_outbox import email_outbox_worker
 from app.utils.logger import setup_logger
 from app.services.user import UserService
 from app.services.auth import AuthService
 from app.services.oauth import oauth_service
+from app.services.token_denylist import token_denylist_cache
 from app.schemas.utility import APIResponse
 
 logger = setup_logger("auth_api", "auth.log")
@@ -31,7 +32,7 @@ auth_service = AuthService()
 async def signup(user_data: auth_schema.UserCreate, db: Session = Depends(get_db)):
     try:
 
-        user = user_service.create_user(db, user_data=user_data)
+        user = await user_service.create_user(db, user_data=user_data)
 
         return APIResponse(message="User created successfully", data={"user_id": user.id, "email": user.email})
     except Exception as e:
@@ -43,7 +44,7 @@ async def email_login(user_data: auth_schema.UserLogin, db: Session = Depends(ge
     try:
         user = user_service.find_user_by_email(db, email=user_data.email)
 
-        if not auth_service.verify_password(user_data.password, user.hashed_password):
+        if not await auth_service.verify_password(user_data.password, user.hashed_password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password")
 
         # Check for weak passwords on login and force reset
@@ -77,14 +78,16 @@ async def google_login(
 
         user = user_crud.get_by_email(db, email=user_data["email"])
         if not user:
+            password = "".join(oauth_service.generate_random_password())
             user = user_crud.create(
                 db,
                 obj_in=auth_schema.UserCreate(
-                    password="".join(oauth_service.generate_random_password()),
+                    password=password,
                     email=user_data["email"],
                     full_name=user_data["name"],
                     auth_provider="google"
-                )
+                ),
+                hashed_password=await hash_password(password)
             )
 
         access_token = create_access_token(data={"sub": user.email})
@@ -128,7 +131,8 @@ async def request_forgot_password(reset_data: auth_schema.UserEmail, db: Session
 
         reset_link = f"{reset_data.frontend_url}?token={reset_token}" if reset_data.frontend_url else reset_token
 
-        EmailService.send_email(
+        email_outbox_worker.enqueue(
+            db,
             to_email=user.email,
             subject="Reset Your Password",
             template_name="reset_password.html",
@@ -139,7 +143,7 @@ async def request_forgot_password(reset_data: auth_schema.UserEmail, db: Session
             }
         )
 
-        logger.info(f"Password reset link sent to: {user.email}")
+        logger.info(f"Password reset link queued for: {user.email}")
         return APIResponse(message="Reset link sent to email")
     except Exception as e:
         logger.error(f"Password reset failed: {str(e)}")
@@ -151,9 +155,10 @@ async def request_forgot_password(reset_data: auth_schema.UserEmail, db: Session
 async def reset_password(reset_data: auth_schema.PasswordResetConfirm, db: Session = Depends(get_db)):
     try:
         user = user_service.find_user_by_email(db, email=reset_data.email)
-        auth_service.change_password_via_token(db, user, reset_data)
+        await auth_service.change_password_via_token(db, user, reset_data)
 
-        EmailService.send_email(
+        email_outbox_worker.enqueue(
+            db,
             to_email=user.email,
             subject="Password Reset Successfully",
             template_name="reset-password-success.html",
@@ -178,6 +183,7 @@ async def logout(
 
        obj_in = TokenDenylistCreate(jti=jti, exp=exp)
        token_denylist_crud.create(db, obj_in=obj_in)
+       token_denylist_cache.add(jti, exp)
 
        return APIResponse(message="Logged out successfully")
    except Exception as e:
@@ -1,17 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, Form, File, Header, Query, UploadFile
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_async_db
 from app.schemas.chat import ChatRequest, Message
 from app.services.chat import ChatService
+from app.services.chat_stream import chat_stream_registry
 from app.services.voice import VoiceService
 from app.utils.deps import get_current_user
 from app.models.user import User
 from app.schemas.utility import APIResponse
 from app.utils.logger import setup_logger
-from app.schemas.conversation import Conversation as ConversationSchema, ConversationCreateRequest
+from app.utils.sse import SSE_HEADERS, encode_stream
+from app.schemas.conversation import Conversation as ConversationSchema, ConversationCreateRequest, ConversationListItem
 
 logger = setup_logger("chat_api", "chat.log")
 
@@ -42,7 +46,7 @@ async def stream_chat(
     audio_file: Optional[UploadFile] = File(None, description="Audio file for voice input"),
     agent_type: str = Form("innovative", description="Type of AI agent to use"),
     conversation_id: int = Form(..., description="Conversation ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
@@ -50,11 +54,23 @@ async def stream_chat(
             message, audio_file, agent_type, conversation_id, current_user.id, db
         )
 
+        messages_for_ai = await chat_service.prepare_streaming_turn(
+            processed_messages, db, agent_type, conversation
+        )
+        # Hand the connection back to the pool before the (long) AI stream starts
+        await db.close()
+
+        # Generation runs detached from this connection so a dropped client can resume it
+        stream = chat_stream_registry.start(
+            current_user.id,
+            conversation_id,
+            chat_service.stream_assistant_reply(messages_for_ai, conversation_id)
+        )
+
         return StreamingResponse(
-            chat_service.send_streaming_message(
-                processed_messages, db, agent_type, conversation_id, current_user.id
-            ),
-            media_type="text/event-stream"
+            encode_stream(stream.subscribe(), heartbeat_seconds=settings.CHAT_SSE_HEARTBEAT_SECONDS),
+            media_type="text/event-stream",
+            headers={**SSE_HEADERS, "X-Stream-Id": stream.stream_id}
         )
 
     except ValueError as e:
@@ -71,6 +87,34 @@ async def stream_chat(
         if audio_file:
             await audio_file.close()
 
+@router.get("/streams/{stream_id}")
+async def resume_chat_stream(
+    stream_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Resume a chat stream after a disconnect, replaying events after Last-Event-ID
+    without re-running the completion.
+    """
+    stream = chat_stream_registry.get(stream_id, current_user.id)
+    if not stream:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stream not found or expired")
+
+    try:
+        after = int(last_event_id) if last_event_id is not None else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+    if after is not None and after < 0:
+        # Event ids are buffer positions; a negative one would replay from the end of the list
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+
+    return StreamingResponse(
+        encode_stream(stream.subscribe(after), heartbeat_seconds=settings.CHAT_SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={**SSE_HEADERS, "X-Stream-Id": stream.stream_id}
+    )
+
 @router.get("/history", response_model=APIResponse)
 def get_chat_history(
     db: Session = Depends(get_db),
@@ -81,8 +125,29 @@ def get_chat_history(
     """
     try:
         conversations = chat_service.get_user_conversations(db, current_user.id)
-        conversations_response = [ConversationSchema.from_orm(c) for c in conversations]
+        conversations_response = [ConversationListItem.from_orm(c) for c in conversations]
         return APIResponse(message="Chat history retrieved successfully", data=conversations_response)
     except Exception as e:
         logger.error(f"Error in get_chat_history: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.get("/conversations/{conversation_id}/messages", response_model=APIResponse)
+def get_conversation_messages(
+    conversation_id: int,
+    before_id: Optional[int] = Query(None, description="Return messages older than this message ID"),
+    limit: int = Query(50, ge=1, le=200, description="Number of messages to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Page through a conversation's messages, newest first. Pass `next_before_id`
+    from the previous page as `before_id` to load older messages.
+    """
+    try:
+        page = chat_service.get_conversation_messages(db, conversation_id, current_user.id, before_id, limit)
+        return APIResponse(message="Messages retrieved successfully", data=page)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_conversation_messages: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.services.commercial_workflow import CommercialWorkflowService
 from app.schemas.commercial_workflow_analysis import (
     CommercializationAnalysisOutput,
@@ -19,7 +20,7 @@ service = CommercialWorkflowService()
 @router.get("/formulas/{formula_id}/analyze", response_model=APIResponse[CommercializationAnalysisOutput])
 async def analyze_formula_workflow(
     formula_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Analyzes a formula to generate a commercialization workflow, including
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.user import User
 from app.schemas.formula import Formula, FormulaGenerationRequest, FormulaIngredientCreate
 from app.schemas.utility import APIResponse
@@ -48,7 +49,7 @@ def read_formula(
 @router.post("/generate-from-concept", response_model=APIResponse)
 async def generate_formula_from_concept(
     request: FormulaGenerationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -58,7 +59,7 @@ async def generate_formula_from_concept(
     if request.conversation_id:
         from app.services.chat import ChatService
         chat_service = ChatService()
-        chat_service.validate_conversation_access(db, request.conversation_id, current_user.id)
+        await chat_service.validate_conversation_access(db, request.conversation_id, current_user.id)
 
     generated_formula_data = await formula_service.generate_formula_from_concept(
         db, request.product_concept, current_user, request.market_insights, request.conversation_id
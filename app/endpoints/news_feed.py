@@ -5,6 +5,7 @@ from typing import Optional
 from app.core.database import get_db
 from app.services.news_feed import NewsFeedService
 from app.services.scraper import ScraperAPIScraper
+from app.services.feed_scheduler import feed_scheduler
 from app.schemas.utility import APIResponse
 from app.utils.deps import get_current_user, get_current_user_optional
 from app.models.user import User
@@ -20,15 +21,16 @@ news_feed_service = NewsFeedService(scraper=scraper)
 
 @router.post("/fetch-and-process", response_model=APIResponse)
 async def fetch_and_process_news(
-    db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Initiate fetching and processing of news from the Food Dive RSS feed.
+    Make every news feed source due now; the feed scheduler fetches and processes them in the background.
     """
     try:
-        background_tasks.add_task(news_feed_service.fetch_and_process_news, db)
+        await feed_scheduler.trigger(kind="news")
+        if not feed_scheduler.running:
+            background_tasks.add_task(feed_scheduler.run_due)
         return APIResponse(message="News feed fetching and processing initiated.")
     except Exception as e:
         logger.error(f"Error initiating news fetch: {e}")
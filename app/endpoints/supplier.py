@@ -92,13 +92,14 @@ def bookmark_supplier(
 
 @router.get("/bookmarked", response_model=APIResponse)
 def get_bookmarked_suppliers(
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve bookmarked suppliers for the current user.
     """
     try:
-        bookmarked = supplier_service.get_bookmarked_suppliers(current_user=current_user)
+        bookmarked = supplier_service.get_bookmarked_suppliers(db=db, current_user=current_user)
         bookmarked_response = [Supplier.from_orm(b) for b in bookmarked]
         return APIResponse(message="Bookmarked suppliers retrieved successfully", data=bookmarked_response)
     except Exception as e:
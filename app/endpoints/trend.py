@@ -9,6 +9,7 @@ from app.schemas.utility import APIResponse
 from app.utils.logger import setup_logger
 from app.services.scraper import ScraperAPIScraper
 from app.services.ai_provider import OpenAIProvider
+from app.services.feed_scheduler import feed_scheduler
 
 logger = setup_logger("trend_api", "trend.log")
 
@@ -21,15 +22,15 @@ ai_provider = OpenAIProvider()
 @router.post("/fetch-and-process", response_model=APIResponse)
 async def fetch_and_process_trends(
     *,
-    db: Session = Depends(get_db),
     background_tasks: BackgroundTasks,
 ):
     """
-    Initiate fetching and processing of trends from a hardcoded RSS feed in the background.
+    Make every trend feed source due now; the feed scheduler fetches and processes them in the background.
     """
     try:
-        trend_service = TrendService(scraper=scraper, ai_provider=ai_provider)
-        background_tasks.add_task(trend_service.fetch_and_process_trends, db, background_tasks)
+        await feed_scheduler.trigger(kind="trends")
+        if not feed_scheduler.running:
+            background_tasks.add_task(feed_scheduler.run_due)
         return APIResponse(message="Trend fetching and processing initiated in the background.")
     except Exception as e:
         logger.error(f"Error in fetch_and_process_trends: {str(e)}")
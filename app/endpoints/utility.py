@@ -1,15 +1,27 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_pool_stats
 from app.crud.user import user as user_crud
 from app.schemas import user as user_schema
-from app.utils.deps import get_current_user
+from app.utils.deps import get_current_admin
 from app.utils.logger import setup_logger
 from app.models.user import User
 from app.services.email import EmailService
+from app.services.email_outbox import email_outbox_worker
+from app.services.email_transport import smtp_pool
+from app.services.feed_state import feed_state_store
+from app.services.feed_scheduler import feed_scheduler
 from app.services.user import UserService
 from app.services.cloudinary import CloudinaryService
+from app.services.ai_cache import ai_response_cache, ai_single_flight
+from app.services.ai_rate_limiter import ai_rate_limiter
+from app.services.chat_history import conversation_summarizer
+from app.services.chat_stream import chat_stream_registry
+from app.services.auth_cache import auth_cache
+from app.services.token_denylist import token_denylist_cache
+from app.services.ai_provider import OpenAIProvider
+from app.services.embedding_pipeline import EmbeddingPipeline
 from app.schemas.utility import APIResponse
 
 logger = setup_logger("utility_api", "utility.log")
@@ -17,6 +29,7 @@ logger = setup_logger("utility_api", "utility.log")
 router = APIRouter()
 user_service = UserService()
 cloudinary_service = CloudinaryService()
+embedding_pipeline = EmbeddingPipeline(OpenAIProvider())
 
 @router.post("/upload-to-cloud", response_model=APIResponse)
 async def upload_to_cloud(
@@ -36,3 +49,39 @@ async def upload_to_cloud(
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
+
+
+@router.get("/metrics", response_model=APIResponse)
+def get_metrics(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Runtime counters for the process serving this request. Admins only.
+    """
+    metrics = {
+        "ai_cache": ai_response_cache.get_stats() if ai_response_cache else None,
+        "ai_rate_limiter": ai_rate_limiter.get_stats(),
+        "ai_single_flight": ai_single_flight.get_stats(),
+        "db_pool": get_pool_stats(),
+        "auth_cache": auth_cache.get_stats(),
+        "token_denylist": token_denylist_cache.get_stats(),
+        "chat_streams": chat_stream_registry.get_stats(),
+        "chat_summaries": conversation_summarizer.get_stats(),
+        "email_outbox": email_outbox_worker.get_stats(),
+        "smtp_pool": smtp_pool.get_stats(),
+        "feed_states": feed_state_store.get_stats(),
+        "feed_scheduler": feed_scheduler.get_stats(),
+    }
+    return APIResponse(message="Metrics retrieved successfully", data=metrics)
+
+@router.post("/embeddings/backfill", response_model=APIResponse)
+async def backfill_embeddings(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Embed every trend, news item and ingredient not yet in the vector index, in the background.
+    Resumes from the last completed batch. Admins only; 409 while a backfill is already running.
+    """
+    if not embedding_pipeline.start():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="An embedding backfill is already running.")
+    return APIResponse(message="Embedding backfill initiated in the background.")
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, JSON, DateTime, ForeignKey, String
+from sqlalchemy import Column, Integer, JSON, DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    # Serves keyset pagination and "last N messages" reads as a bounded index scan
+    __table_args__ = (Index("ix_chat_messages_conversation_id_id", "conversation_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class EmbeddingWatermark(Base):
+    __tablename__ = "embedding_watermarks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, unique=True, nullable=False, index=True)
+    # Highest source row id whose embedding is in the vector index
+    last_id = Column(Integer, nullable=False, default=0)
+    # Embedding model/dimensions the watermark refers to; a change restarts the backfill
+    embedding_model = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,22 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class FeedSource(Base):
+    __tablename__ = "feed_sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    # "trends" or "news"; decides which service ingests the feed
+    kind = Column(String, nullable=False, index=True)
+    url = Column(String, unique=True, nullable=False)
+    enabled = Column(Boolean, nullable=False, default=True)
+    interval_seconds = Column(Integer, nullable=False, default=1800)
+    # Due time of the next run; pushed out by a lease while a run is in progress
+    next_run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_duration_ms = Column(Integer, nullable=True)
+    last_item_count = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class FeedState(Base):
+    __tablename__ = "feed_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, nullable=False, index=True)
+    # Validators from the last successful fetch, sent back as If-None-Match / If-Modified-Since
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    # sha256 of the last body that was parsed, for servers that ignore conditional requests
+    content_hash = Column(String(64), nullable=True)
+    last_fetched_at = Column(DateTime(timezone=True), nullable=True)
+    last_changed_at = Column(DateTime(timezone=True), nullable=True)
@@ -7,4 +7,4 @@ class TokenDenylist(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     jti = Column(String, nullable=False, index=True)
-    exp = Column(DateTime(timezone=True), nullable=False)
+    exp = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
 
 class ChatMessageBase(BaseModel):
     role: str
@@ -19,3 +20,8 @@ class ChatMessage(ChatMessageBase):
 
     class Config:
         from_attributes = True
+
+class ChatMessagePage(BaseModel):
+    messages: List[ChatMessage]
+    # Pass as before_id to fetch the next (older) page; None when there are no older messages
+    next_before_id: Optional[int] = None
@@ -22,5 +22,15 @@ class Conversation(ConversationBase):
     class Config:
         from_attributes = True
 
+class ConversationListItem(ConversationBase):
+    """A conversation without its messages; those are paged from the messages endpoint."""
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class ConversationCreateRequest(BaseModel):
     title: Optional[str] = None
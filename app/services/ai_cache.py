@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.ai_response_cache import ai_response_cache as ai_response_cache_crud
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+def normalize_prompt(text: str) -> str:
+    """Collapses whitespace so formatting-only differences map to the same request."""
+    return " ".join(text.split())
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str, response_model_name: str) -> str:
+    """Content-addressed key for a structured AI call."""
+    raw = json.dumps(
+        [model, normalize_prompt(system_prompt), normalize_prompt(user_prompt), response_model_name],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class CacheHit(NamedTuple):
+    payload: Dict[str, Any]
+    # Seconds until the entry expires in the tier it was found in
+    ttl_seconds: float
+
+class CacheTier(ABC):
+    """A single storage tier of the AI response cache."""
+    name: str = "tier"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheHit]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, response_model_name: str, payload: Dict[str, Any], ttl_seconds: int) -> None:
+        pass
+
+class MemoryCacheTier(CacheTier):
+    """Per-process LRU tier with per-entry expiry."""
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CacheHit]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return CacheHit(payload, remaining)
+
+    async def set(self, key: str, response_model_name: str, payload: Dict[str, Any], ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DatabaseCacheTier(CacheTier):
+    """Persistent tier backed by the ai_response_cache table, shared by all workers."""
+    name = "database"
+
+    def _get_sync(self, key: str) -> Optional[CacheHit]:
+        with SessionLocal() as db:
+            entry = ai_response_cache_crud.get_valid(db, cache_key=key)
+            if entry is None:
+                return None
+            expires_at = entry.expires_at
+            if expires_at.tzinfo is None:
+                # SQLite hands back naive datetimes
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            return CacheHit(entry.payload, (expires_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _set_sync(self, key: str, response_model_name: str, payload: Dict[str, Any], ttl_seconds: int) -> None:
+        with SessionLocal() as db:
+            ai_response_cache_crud.upsert(
+                db,
+                cache_key=key,
+                response_model=response_model_name,
+                payload=payload,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+            )
+
+    def _sweep_sync(self, batch_size: int) -> int:
+        deleted = 0
+        while True:
+            with SessionLocal() as db:
+                batch = ai_response_cache_crud.delete_expired_batch(db, batch_size=batch_size)
+            deleted += batch
+            if batch < batch_size:
+                return deleted
+
+    async def get(self, key: str) -> Optional[CacheHit]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, response_model_name: str, payload: Dict[str, Any], ttl_seconds: int) -> None:
+        await asyncio.to_thread(self._set_sync, key, response_model_name, payload, ttl_seconds)
+
+    async def sweep(self, batch_size: int) -> int:
+        """Deletes expired rows in batches; returns how many were deleted."""
+        return await asyncio.to_thread(self._sweep_sync, batch_size)
+
+class AIResponseCache:
+    """
+    Read-through cache for validated AI responses.
+
+    Tiers are consulted in order; a hit in a slower tier is back-filled into the
+    faster ones. Tier failures are logged and treated as misses so the cache can
+    never take down an AI call. Back-filled entries keep the remaining lifetime of
+    the entry they were copied from.
+    """
+
+    def __init__(self, tiers: List[CacheTier], default_ttl_seconds: int):
+        self.tiers = tiers
+        self.default_ttl_seconds = default_ttl_seconds
+        self.stats: Dict[str, int] = {"misses": 0, "writes": 0, "errors": 0, "swept": 0}
+        for tier in tiers:
+            self.stats[f"hits_{tier.name}"] = 0
+
+    async def get(self, key: str, ttl_seconds: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        for index, tier in enumerate(self.tiers):
+            try:
+                hit = await tier.get(key)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"AI cache tier '{tier.name}' read failed: {e}")
+                continue
+            if hit is not None:
+                self.stats[f"hits_{tier.name}"] += 1
+                backfill_ttl = min(hit.ttl_seconds, ttl_seconds or self.default_ttl_seconds)
+                for faster_tier in self.tiers[:index]:
+                    try:
+                        await faster_tier.set(key, "", hit.payload, backfill_ttl)
+                    except Exception as e:
+                        self.stats["errors"] += 1
+                        logger.warning(f"AI cache tier '{faster_tier.name}' back-fill failed: {e}")
+                return hit.payload
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, response_model_name: str, payload: Dict[str, Any], ttl_seconds: Optional[int] = None) -> None:
+        ttl = ttl_seconds or self.default_ttl_seconds
+        for tier in self.tiers:
+            try:
+                await tier.set(key, response_model_name, payload, ttl)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"AI cache tier '{tier.name}' write failed: {e}")
+        self.stats["writes"] += 1
+
+    async def sweep(self, batch_size: int) -> int:
+        """Deletes expired entries from the tiers that store them persistently."""
+        deleted = 0
+        for tier in self.tiers:
+            if isinstance(tier, DatabaseCacheTier):
+                deleted += await tier.sweep(batch_size)
+        self.stats["swept"] += deleted
+        return deleted
+
+    async def run(self, sweep_interval_seconds: float, sweep_batch_size: int) -> None:
+        """Background loop: periodically sweep expired entries."""
+        while True:
+            await asyncio.sleep(sweep_interval_seconds)
+            try:
+                deleted = await self.sweep(sweep_batch_size)
+                if deleted:
+                    logger.info(f"Swept {deleted} expired AI cache rows.")
+            except Exception as e:
+                logger.error(f"AI cache sweep failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        for tier in self.tiers:
+            if isinstance(tier, MemoryCacheTier):
+                stats["memory_entries"] = len(tier)
+        return stats
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one underlying call.
+
+    The shared call runs in its own task, so a caller that is cancelled (e.g. a
+    client disconnect) does not cancel the work other callers are waiting on.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "coalesced": 0}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved; callers re-raise it themselves
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Returns (result, shared) where shared is True if another caller's call was joined."""
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["calls"] += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return await asyncio.shield(task), shared
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "in_flight": len(self._calls)}
+
+def build_default_cache() -> Optional[AIResponseCache]:
+    if not settings.AI_CACHE_ENABLED:
+        return None
+    tiers: List[CacheTier] = [MemoryCacheTier(max_entries=settings.AI_CACHE_MEMORY_MAX_ENTRIES)]
+    if settings.AI_CACHE_PERSISTENT:
+        tiers.append(DatabaseCacheTier())
+    return AIResponseCache(tiers, default_ttl_seconds=settings.AI_CACHE_DEFAULT_TTL_SECONDS)
+
+# Shared by every OpenAIProvider instance in the process
+ai_response_cache = build_default_cache()
+ai_single_flight = SingleFlight()
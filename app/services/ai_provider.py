@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Iterator, Dict, Any, Type, Optional
+from typing import List, Iterator, Dict, Any, Type, Optional, Callable, Awaitable
 import openai
 import json
 import logging
@@ -20,20 +20,64 @@ from app.schemas.ai_responses import (
     AITrendData,AITrendCategoryAndTags
 )
 from app.schemas.marketing import AIMarketingCopy
+from app.services.ai_cache import AIResponseCache, SingleFlight, ai_response_cache, ai_single_flight, make_cache_key
+from app.services.ai_rate_limiter import AIRateLimiter, ai_rate_limiter, estimate_tokens, wait_retry_after
 from app.utils import prompt_templates
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Cache lifetimes (seconds) for structured responses. Generative calls whose
+# output the user expects to vary between runs are not cached (0).
+CACHE_TTL_INGREDIENT_ENRICHMENT = 7 * 24 * 3600
+CACHE_TTL_INSIGHT_PORTAL = 6 * 3600
+CACHE_TTL_MARKETING_COPY = 24 * 3600
+CACHE_TTL_TREND_ANALYSIS = 7 * 24 * 3600
+CACHE_TTL_WORKFLOW_ANALYSIS = 24 * 3600
+CACHE_TTL_FORMULA_DETAILS = 0
+
+# Retry policy for every OpenAI call. The SDK's own retries are off so that backoff
+# honours Retry-After and never sleeps while holding one of the limiter's slots.
+openai_retry = retry(
+    wait=wait_retry_after(wait_exponential(multiplier=1, min=2, max=10)),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception_type(openai.APIError),
+    reraise=True  # Reraise the exception after the final attempt
+)
+
 # Custom Exception for the provider
 class AIProviderError(Exception):
     """Custom exception for AI Provider failures."""
     pass
 
+# Every response model used with _make_ai_call; their schema prompts are built once at startup.
+STRUCTURED_RESPONSE_MODELS = (
+    AISummaryAndSentiment,
+    AITrendSignals,
+    AIIngredientEnrichment,
+    AIInsightPortalData,
+    AIFormulaDetails,
+    AIMarketingCopy,
+    AITrendData,
+    AITrendCategoryAndTags,
+    AICommercializationInsights,
+    AISupplierAnalysisOutput,
+    AICostAnalysisOutput,
+)
+
 class AIProvider(ABC):
     # ... (Abstract methods remain the same)
     @abstractmethod
-    async def generate_chat_completion(self, messages: List[Message]) -> Iterator[str]:
+    async def generate_chat_completion(self, messages: List[Message], usage: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        """Streams the reply; if `usage` is given it is filled with the token usage once the stream ends."""
+        pass
+
+    @abstractmethod
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        pass
+
+    @abstractmethod
+    async def generate_conversation_summary(self, previous_summary: Optional[str], messages: List[Message]) -> str:
         pass
 
     @abstractmethod
@@ -80,6 +124,14 @@ class AIProvider(ABC):
     async def extract_trend_data(self, article_title: str, article_content: str) -> AITrendData:
         pass
 
+    @abstractmethod
+    async def generate_trend_category_and_tags(self, article_title: str, article_content: str) -> AITrendCategoryAndTags:
+        pass
+
+    @abstractmethod
+    async def generate_commercialization_insights(self, formula_name: str, formula_description: str, master_tasks_data: List[Dict[str, Any]]) -> AICommercializationInsights:
+        pass
+
     @abstractmethod
     async def generate_supplier_analysis(self, workflow_request_data: Dict[str, Any]) -> Dict[str, Any]:
         pass
@@ -89,35 +141,86 @@ class AIProvider(ABC):
         pass
 
 class OpenAIProvider(AIProvider):
-    def __init__(self):
-        self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(
+        self,
+        cache: Optional[AIResponseCache] = ai_response_cache,
+        limiter: AIRateLimiter = ai_rate_limiter,
+        single_flight: SingleFlight = ai_single_flight
+    ):
+        # Retries are owned by openai_retry and the shared limiter, not the SDK
+        self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
         self.model = "gpt-4-turbo"
+        self.cache = cache
+        self.limiter = limiter
+        self.single_flight = single_flight
+        prompt_templates.schema_prompts.warm(STRUCTURED_RESPONSE_MODELS)
 
     def _create_prompt_from_model(self, model_class: Type[BaseModel], instruction: str) -> str:
-        schema = model_class.model_json_schema()
-        schema_str = json.dumps(schema, indent=2)
-        return (
-            f"{instruction}\n\n"
-            "Your response MUST be a single JSON object that strictly adheres to the following JSON Schema.\n\n"
-            "### JSON Schema\n"
-            f"{schema_str}"
-        )
+        return prompt_templates.schema_prompts.build(model_class, instruction)
 
-    @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(openai.APIError),
-        reraise=True  # Reraise the exception after the final attempt
-    )
     async def _make_ai_call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_model: Type[BaseModel],
+        cache_ttl: Optional[int] = None
+    ) -> BaseModel:
+        """
+        Structured AI call fronted by the response cache and in-flight request coalescing.
+
+        Concurrent calls with the same normalized prompts share one upstream request;
+        each caller receives its own copy of the validated result.
+
+        :param cache_ttl: Seconds to keep the response; None uses the cache default, 0 bypasses the cache
+            and coalescing, so every caller gets its own (varied) response.
+        """
+        use_cache = self.cache is not None and cache_ttl != 0
+        cache_key = make_cache_key(self.model, system_prompt, user_prompt, response_model.__name__)
+
+        if use_cache:
+            cached_payload = await self.cache.get(cache_key, ttl_seconds=cache_ttl)
+            if cached_payload is not None:
+                try:
+                    return response_model.model_validate(cached_payload)
+                except ValidationError:
+                    logger.warning(f"Discarding stale cached response for {response_model.__name__}.")
+
+        async def fetch() -> BaseModel:
+            result = await self._request_structured_completion(system_prompt, user_prompt, response_model)
+            if use_cache:
+                await self.cache.set(cache_key, response_model.__name__, result.model_dump(mode="json"), ttl_seconds=cache_ttl)
+            return result
+
+        if cache_ttl == 0:
+            return await fetch()
+        result, shared = await self.single_flight.do(cache_key, fetch)
+        return result.model_copy(deep=True) if shared else result
+
+    @openai_retry
+    async def _create(self, create: Callable[..., Awaitable[Any]], estimated_tokens: int, **kwargs) -> Any:
+        """Makes one SDK call under the shared limiter, retrying on API errors."""
+        try:
+            async with self.limiter.acquire(estimated_tokens):
+                response = await create(**kwargs)
+        except openai.RateLimitError as e:
+            self.limiter.record_rate_limited(e)
+            raise
+        usage = getattr(response, "usage", None)
+        self.limiter.record_usage(estimated_tokens, usage.total_tokens if usage else None)
+        return response
+
+    async def _request_structured_completion(
         self,
         system_prompt: str,
         user_prompt: str,
         response_model: Type[BaseModel]
     ) -> BaseModel:
         """Helper function to make a structured, validated, and resilient call to the OpenAI API."""
+        estimated_tokens = estimate_tokens(system_prompt, user_prompt) + settings.AI_COMPLETION_TOKEN_RESERVE
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create(
+                self.client.chat.completions.create,
+                estimated_tokens,
                 model=self.model,
                 response_format={"type": "json_object"},
                 messages=[
@@ -131,47 +234,108 @@ class OpenAIProvider(AIProvider):
             logger.error(f"Pydantic validation error for {response_model.__name__}: {e}")
             raise AIProviderError(f"AI response failed validation for {response_model.__name__}.") from e
         except openai.APIError as e:
-            logger.warning(f"OpenAI API error on attempt: {e}. Retrying...")
+            logger.warning(f"OpenAI API error after retries: {e}")
             raise
         except Exception as e:
             logger.error(f"An unexpected error occurred in the AI call: {e}")
             raise AIProviderError("An unexpected error occurred.") from e
 
-    async def generate_chat_completion(self, messages: List[Message]) -> Iterator[str]: # type: ignore
+    async def generate_chat_completion(self, messages: List[Message], usage: Optional[Dict[str, int]] = None) -> Iterator[str]: # type: ignore
         message_dicts = [msg.dict() for msg in messages]
+        estimated_tokens = estimate_tokens(*(msg.content for msg in messages)) + settings.AI_COMPLETION_TOKEN_RESERVE
         try:
-            stream = await self.client.chat.completions.create(
+            # The limiter slot covers opening the stream only; the token budget is already
+            # reserved, and holding the slot while a reply trickles in would starve other calls
+            stream = await self._create(
+                self.client.chat.completions.create,
+                estimated_tokens,
                 model="gpt-4",
                 messages=message_dicts,
                 stream=True,
+                stream_options={"include_usage": True},
             )
             async for chunk in stream:
+                # The final chunk carries usage and no choices
+                if chunk.usage:
+                    self.limiter.record_usage(estimated_tokens, chunk.usage.total_tokens)
+                    if usage is not None:
+                        usage.update(
+                            prompt_tokens=chunk.usage.prompt_tokens,
+                            completion_tokens=chunk.usage.completion_tokens,
+                            total_tokens=chunk.usage.total_tokens,
+                        )
+                if not chunk.choices:
+                    continue
                 content = chunk.choices[0].delta.content
                 if content:
                     yield content
+        except openai.RateLimitError as e:
+            logger.error(f"OpenAI API stream rate limited: {e}")
+            yield "Error: The AI service is busy. Please try again shortly."
         except Exception as e:
             logger.error(f"OpenAI API stream error: {e}")
             yield "Error: Could not connect to the AI service."
 
+    @openai_retry
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """One embedding per text, in order, from a single batched request."""
+        estimated_tokens = estimate_tokens(*texts)
+        try:
+            async with self.limiter.acquire(estimated_tokens):
+                response = await self.client.embeddings.create(
+                    model=settings.EMBEDDING_MODEL,
+                    input=texts,
+                    dimensions=settings.EMBEDDING_DIMENSIONS,
+                )
+            self.limiter.record_usage(estimated_tokens, response.usage.total_tokens if response.usage else None)
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except openai.RateLimitError as e:
+            self.limiter.record_rate_limited(e)
+            logger.error(f"OpenAI embeddings rate limited: {e}")
+            raise
+
+    async def generate_conversation_summary(self, previous_summary: Optional[str], messages: List[Message]) -> str:
+        """Folds `messages` into the running summary of a chat conversation."""
+        system_prompt = prompt_templates.CONVERSATION_SUMMARY_SYSTEM_PROMPT
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        user_prompt = f"Existing summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"
+        estimated_tokens = estimate_tokens(system_prompt, user_prompt) + settings.CHAT_SUMMARY_MAX_TOKENS
+        try:
+            response = await self._create(
+                self.client.chat.completions.create,
+                estimated_tokens,
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+                temperature=0.2,
+            )
+            return response.choices[0].message.content.strip()
+        except openai.APIError as e:
+            logger.error(f"OpenAI conversation summary error: {e}")
+            raise AIProviderError("Failed to summarize conversation.") from e
+
     async def generate_summary_and_sentiment(self, text_content: str) -> AISummaryAndSentiment:
         system_prompt = self._create_prompt_from_model(AISummaryAndSentiment, prompt_templates.SUMMARY_AND_SENTIMENT_INSTRUCTION)
-        return await self._make_ai_call(system_prompt, text_content, AISummaryAndSentiment)
+        return await self._make_ai_call(system_prompt, text_content, AISummaryAndSentiment, cache_ttl=CACHE_TTL_TREND_ANALYSIS)
 
     async def generate_trend_signals(self, combined_content: str) -> AITrendSignals:
         system_prompt = self._create_prompt_from_model(AITrendSignals, prompt_templates.TREND_SIGNALS_INSTRUCTION)
-        return await self._make_ai_call(system_prompt, combined_content, AITrendSignals)
+        return await self._make_ai_call(system_prompt, combined_content, AITrendSignals, cache_ttl=CACHE_TTL_TREND_ANALYSIS)
 
     async def generate_ingredient_enrichment(self, ingredient_name: str) -> AIIngredientEnrichment:
         instruction = prompt_templates.INGREDIENT_ENRICHMENT_INSTRUCTION.format(ingredient_name=ingredient_name)
         system_prompt = self._create_prompt_from_model(AIIngredientEnrichment, instruction)
         user_prompt = f"Generate enrichment data for {ingredient_name}."
-        return await self._make_ai_call(system_prompt, user_prompt, AIIngredientEnrichment)
+        return await self._make_ai_call(system_prompt, user_prompt, AIIngredientEnrichment, cache_ttl=CACHE_TTL_INGREDIENT_ENRICHMENT)
 
     async def generate_insight_portal_data(self, ingredient_name: str) -> AIInsightPortalData:
         instruction = prompt_templates.INSIGHT_PORTAL_INSTRUCTION.format(ingredient_name=ingredient_name)
         system_prompt = self._create_prompt_from_model(AIInsightPortalData, instruction)
         user_prompt = f"Generate insight portal data for {ingredient_name}."
-        return await self._make_ai_call(system_prompt, user_prompt, AIInsightPortalData)
+        return await self._make_ai_call(system_prompt, user_prompt, AIInsightPortalData, cache_ttl=CACHE_TTL_INSIGHT_PORTAL)
 
     async def generate_insight_portal_data_with_context(self, ingredient_name: str, chat_context: str) -> AIInsightPortalData:
         """Generate insight portal data with personalized chat context."""
@@ -205,7 +369,7 @@ Focus your analysis on the ingredients, trends, and topics they've been explorin
 """
         system_prompt = self._create_prompt_from_model(AIInsightPortalData, contextual_instruction)
         user_prompt = f"Analyze the conversation context and generate market insights for the most relevant ingredient discussed."
-        return await self._make_ai_call(system_prompt, user_prompt, AIInsightPortalData)
+        return await self._make_ai_call(system_prompt, user_prompt, AIInsightPortalData, cache_ttl=CACHE_TTL_INSIGHT_PORTAL)
 
     async def generate_formula_details(self, product_concept: str, market_insights: Optional[Dict[str, Any]] = None) -> AIFormulaDetails:
         if market_insights:
@@ -227,7 +391,7 @@ Create a formula that leverages current market trends and addresses identified o
             system_prompt = self._create_prompt_from_model(AIFormulaDetails, prompt_templates.FORMULA_DETAILS_INSTRUCTION)
             user_prompt = f"The product concept is: {product_concept}"
 
-        return await self._make_ai_call(system_prompt, user_prompt, AIFormulaDetails)
+        return await self._make_ai_call(system_prompt, user_prompt, AIFormulaDetails, cache_ttl=CACHE_TTL_FORMULA_DETAILS)
 
     async def generate_formula_details_with_context(self, product_concept: str, market_insights: Optional[Dict[str, Any]] = None, chat_context: Optional[str] = None) -> AIFormulaDetails:
         """Generate formula details with conversation context for personalization."""
@@ -260,17 +424,19 @@ Use this conversation history to understand the user's preferences, previously d
             system_prompt = self._create_prompt_from_model(AIFormulaDetails, base_instruction)
             user_prompt = f"The product concept is: {product_concept}"
 
-        return await self._make_ai_call(system_prompt, user_prompt, AIFormulaDetails)
+        return await self._make_ai_call(system_prompt, user_prompt, AIFormulaDetails, cache_ttl=CACHE_TTL_FORMULA_DETAILS)
 
     async def generate_marketing_copy(self, formula_name: str, formula_description: str) -> AIMarketingCopy:
         system_prompt = self._create_prompt_from_model(AIMarketingCopy, prompt_templates.MARKETING_COPY_INSTRUCTION)
         user_prompt = f"Formula Name: {formula_name}\nFormula Description: {formula_description}"
-        return await self._make_ai_call(system_prompt, user_prompt, AIMarketingCopy)
+        return await self._make_ai_call(system_prompt, user_prompt, AIMarketingCopy, cache_ttl=CACHE_TTL_MARKETING_COPY)
 
     async def generate_image(self, prompt: str) -> str:
         """Generates an image using DALL-E 3 and returns the URL."""
         try:
-            response = await self.client.images.generate(
+            response = await self._create(
+                self.client.images.generate,
+                estimate_tokens(prompt),
                 model="dall-e-3",
                 prompt=prompt,
                 n=1,
@@ -286,12 +452,15 @@ Use this conversation history to understand the user's preferences, previously d
     async def categorize_product(self, product_name: str, product_description: str) -> str:
         """Categorizes the product into one of several predefined categories."""
         system_prompt = prompt_templates.PRODUCT_CATEGORIZATION_SYSTEM_PROMPT
+        user_prompt = f"Product Name: {product_name}\nDescription: {product_description}"
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create(
+                self.client.chat.completions.create,
+                estimate_tokens(system_prompt, user_prompt) + 16,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Product Name: {product_name}\nDescription: {product_description}"}
+                    {"role": "user", "content": user_prompt}
                 ],
                 temperature=0,
             )
@@ -304,13 +473,13 @@ Use this conversation history to understand the user's preferences, previously d
         instruction = prompt_templates.TREND_DATA_EXTRACTION_INSTRUCTION
         system_prompt = self._create_prompt_from_model(AITrendData, instruction)
         user_prompt = f"Article Title: {article_title}\nArticle Content: {article_content}"
-        return await self._make_ai_call(system_prompt, user_prompt, AITrendData)
+        return await self._make_ai_call(system_prompt, user_prompt, AITrendData, cache_ttl=CACHE_TTL_TREND_ANALYSIS)
 
     async def generate_trend_category_and_tags(self, article_title: str, article_content: str) -> AITrendCategoryAndTags:
         instruction = prompt_templates.TREND_CATEGORY_AND_TAGS_INSTRUCTION
         system_prompt = self._create_prompt_from_model(AITrendCategoryAndTags, instruction)
         user_prompt = f"Article Title: {article_title}\nArticle Content: {article_content}"
-        return await self._make_ai_call(system_prompt, user_prompt, AITrendCategoryAndTags)
+        return await self._make_ai_call(system_prompt, user_prompt, AITrendCategoryAndTags, cache_ttl=CACHE_TTL_TREND_ANALYSIS)
 
     async def generate_commercialization_insights(
         self,
@@ -328,16 +497,16 @@ Use this conversation history to understand the user's preferences, previously d
             f"Defined Tasks (predict durations for these): {json.dumps(master_tasks_data, indent=2)}\n\n"
             "Based on this information, predict accurate durations for each task, identify all potential risks, and generate comprehensive recommendations to optimize the workflow, reduce risks, and improve the timeline. Focus on actionable insights."
         )
-        return await self._make_ai_call(system_prompt, user_prompt, AICommercializationInsights)
+        return await self._make_ai_call(system_prompt, user_prompt, AICommercializationInsights, cache_ttl=CACHE_TTL_WORKFLOW_ANALYSIS)
 
     async def generate_supplier_analysis(self, workflow_request_data: Dict[str, Any]) -> AISupplierAnalysisOutput:
         instruction = prompt_templates.SUPPLIER_ANALYSIS_INSTRUCTION
         system_prompt = self._create_prompt_from_model(AISupplierAnalysisOutput, instruction)
         user_prompt = f"Analyze suppliers for the following workflow request: {json.dumps(workflow_request_data, indent=2)}"
-        return await self._make_ai_call(system_prompt, user_prompt, AISupplierAnalysisOutput)
+        return await self._make_ai_call(system_prompt, user_prompt, AISupplierAnalysisOutput, cache_ttl=CACHE_TTL_WORKFLOW_ANALYSIS)
 
     async def generate_cost_analysis(self, workflow_request_data: Dict[str, Any]) -> AICostAnalysisOutput:
         instruction = prompt_templates.COST_ANALYSIS_INSTRUCTION
         system_prompt = self._create_prompt_from_model(AICostAnalysisOutput, instruction)
         user_prompt = f"Calculate costs for the following workflow request: {json.dumps(workflow_request_data, indent=2)}"
-        return await self._make_ai_call(system_prompt, user_prompt, AICostAnalysisOutput)
+        return await self._make_ai_call(system_prompt, user_prompt, AICostAnalysisOutput, cache_ttl=CACHE_TTL_WORKFLOW_ANALYSIS)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(*texts: str) -> int:
+    """Cheap token estimate (~4 characters per token) used to reserve budget before a call."""
+    return sum(len(text) for text in texts if text) // 4 + 1
+
+def retry_after_seconds(exc: Optional[BaseException]) -> Optional[float]:
+    """Reads the server-suggested delay from an OpenAI error response, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    retry_after = headers.get("retry-after")
+    try:
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        if retry_after is not None:
+            return float(retry_after)
+    except ValueError:
+        return None
+    return None
+
+def wait_retry_after(fallback: Callable[[Any], float]) -> Callable[[Any], float]:
+    """Tenacity wait strategy that honours Retry-After and otherwise defers to `fallback`."""
+    def _wait(retry_state) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after_seconds(exc)
+        return delay if delay is not None else fallback(retry_state)
+    return _wait
+
+class _TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self._updated_at = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    def seconds_until(self, amount: float) -> float:
+        deficit = min(amount, self.capacity) - self.available
+        return max(0.0, deficit / self.refill_per_second)
+
+class AIRateLimiter:
+    """
+    Process-wide gate for outbound AI requests.
+
+    Enforces a maximum number of in-flight requests plus requests-per-minute and
+    tokens-per-minute budgets. Callers queue in FIFO order for budget; a 429 with
+    Retry-After pauses the whole queue rather than just the failing caller.
+    """
+
+    def __init__(self, max_concurrent: int, requests_per_minute: int, tokens_per_minute: int):
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._budget_lock = asyncio.Lock()
+        self._requests = _TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._tokens = _TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._paused_until = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats: Dict[str, float] = {
+            "acquired": 0,
+            "rate_limited": 0,
+            "max_waiting": 0,
+            "total_wait_seconds": 0.0,
+        }
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        async with self._budget_lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                self._requests.refill()
+                self._tokens.refill()
+                delay = max(self._requests.seconds_until(1), self._tokens.seconds_until(tokens))
+                if delay <= 0:
+                    self._requests.available -= 1
+                    self._tokens.available -= min(tokens, self._tokens.capacity)
+                    return
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """Holds one in-flight slot for the duration of the block, after reserving budget."""
+        started_at = time.monotonic()
+        self.waiting += 1
+        self.stats["max_waiting"] = max(self.stats["max_waiting"], self.waiting)
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._wait_for_budget(estimated_tokens)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.stats["acquired"] += 1
+        self.stats["total_wait_seconds"] += time.monotonic() - started_at
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Corrects the token budget once the real usage of a call is known."""
+        if actual_tokens is None:
+            return
+        self._tokens.available -= actual_tokens - min(estimated_tokens, self._tokens.capacity)
+
+    def record_rate_limited(self, exc: BaseException) -> None:
+        self.stats["rate_limited"] += 1
+        delay = retry_after_seconds(exc)
+        if delay:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            logger.warning(f"AI rate limit hit; pausing outbound AI requests for {delay:.1f}s.")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats.update({
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+        })
+        return stats
+
+# Shared by every OpenAIProvider instance in the process
+ai_rate_limiter = AIRateLimiter(
+    max_concurrent=settings.AI_MAX_CONCURRENT_REQUESTS,
+    requests_per_minute=settings.AI_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.AI_TOKENS_PER_MINUTE,
+)
@@ -0,0 +1,263 @@
+"""
+Record/replay AI providers.
+
+RecordingProvider wraps a real provider and writes every response to a fixture
+directory; ReplayProvider serves those fixtures back with configurable synthetic
+latency so the application's own overhead can be measured without calling OpenAI.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.schemas.chat import Message
+from app.schemas.ai_responses import (
+    AICommercializationInsights,
+    AICostAnalysisOutput,
+    AISummaryAndSentiment,
+    AISupplierAnalysisOutput,
+    AITrendSignals,
+    AIIngredientEnrichment,
+    AIInsightPortalData,
+    AIFormulaDetails,
+    AITrendData,
+    AITrendCategoryAndTags
+)
+from app.schemas.marketing import AIMarketingCopy
+from app.services.ai_provider import AIProvider, AIProviderError
+from app.services.ai_rate_limiter import estimate_tokens
+from app.services.embedding_pipeline import HashingEmbedder
+
+logger = logging.getLogger(__name__)
+
+# Response model for each structured method; methods not listed return plain JSON values.
+RESPONSE_MODELS: Dict[str, Type[BaseModel]] = {
+    "generate_summary_and_sentiment": AISummaryAndSentiment,
+    "generate_trend_signals": AITrendSignals,
+    "generate_ingredient_enrichment": AIIngredientEnrichment,
+    "generate_insight_portal_data": AIInsightPortalData,
+    "generate_insight_portal_data_with_context": AIInsightPortalData,
+    "generate_formula_details": AIFormulaDetails,
+    "generate_formula_details_with_context": AIFormulaDetails,
+    "generate_marketing_copy": AIMarketingCopy,
+    "extract_trend_data": AITrendData,
+    "generate_trend_category_and_tags": AITrendCategoryAndTags,
+    "generate_commercialization_insights": AICommercializationInsights,
+    "generate_supplier_analysis": AISupplierAnalysisOutput,
+    "generate_cost_analysis": AICostAnalysisOutput,
+}
+
+class FixtureStore:
+    """Stores one JSON file per (method, arguments) pair under `<root>/<method>/<hash>.json`."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    @staticmethod
+    def make_key(method: str, arguments: Dict[str, Any]) -> str:
+        raw = json.dumps([method, jsonable_encoder(arguments)], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, method: str, key: str) -> Path:
+        return self.root / method / f"{key}.json"
+
+    def save(self, method: str, arguments: Dict[str, Any], response: Any) -> None:
+        key = self.make_key(method, arguments)
+        path = self._path(method, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fixture = {"method": method, "arguments": jsonable_encoder(arguments), "response": response}
+        path.write_text(json.dumps(fixture, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def load(self, method: str, arguments: Dict[str, Any]) -> Optional[Any]:
+        path = self._path(method, self.make_key(method, arguments))
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+
+    def load_any(self, method: str) -> Optional[Any]:
+        """Any recorded response for `method`, for inputs that vary between runs (e.g. chat history)."""
+        method_dir = self.root / method
+        if not method_dir.is_dir():
+            return None
+        for path in sorted(method_dir.glob("*.json")):
+            return json.loads(path.read_text(encoding="utf-8"))["response"]
+        return None
+
+class RecordingProvider(AIProvider):
+    """Delegates to a real provider and records each response as a fixture."""
+
+    def __init__(self, provider: AIProvider, fixtures_dir: str):
+        self.provider = provider
+        self.store = FixtureStore(fixtures_dir)
+
+    async def _record(self, method: str, **arguments) -> Any:
+        result = await getattr(self.provider, method)(**arguments)
+        self.store.save(method, arguments, result.model_dump(mode="json") if isinstance(result, BaseModel) else result)
+        return result
+
+    async def generate_chat_completion(self, messages: List[Message], usage: Optional[Dict[str, int]] = None) -> Iterator[str]: # type: ignore
+        chunks = []
+        async for chunk in self.provider.generate_chat_completion(messages, usage=usage):
+            chunks.append(chunk)
+            yield chunk
+        self.store.save("generate_chat_completion", {"messages": messages}, chunks)
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await self._record("generate_embeddings", texts=texts)
+
+    async def generate_conversation_summary(self, previous_summary: Optional[str], messages: List[Message]) -> str:
+        return await self._record("generate_conversation_summary", previous_summary=previous_summary, messages=messages)
+
+    async def generate_summary_and_sentiment(self, text_content: str) -> AISummaryAndSentiment:
+        return await self._record("generate_summary_and_sentiment", text_content=text_content)
+
+    async def generate_trend_signals(self, combined_content: str) -> AITrendSignals:
+        return await self._record("generate_trend_signals", combined_content=combined_content)
+
+    async def generate_ingredient_enrichment(self, ingredient_name: str) -> AIIngredientEnrichment:
+        return await self._record("generate_ingredient_enrichment", ingredient_name=ingredient_name)
+
+    async def generate_insight_portal_data(self, ingredient_name: str) -> AIInsightPortalData:
+        return await self._record("generate_insight_portal_data", ingredient_name=ingredient_name)
+
+    async def generate_insight_portal_data_with_context(self, ingredient_name: str, chat_context: str) -> AIInsightPortalData:
+        return await self._record("generate_insight_portal_data_with_context", ingredient_name=ingredient_name, chat_context=chat_context)
+
+    async def generate_formula_details(self, product_concept: str, market_insights: Optional[Dict[str, Any]] = None) -> AIFormulaDetails:
+        return await self._record("generate_formula_details", product_concept=product_concept, market_insights=market_insights)
+
+    async def generate_formula_details_with_context(self, product_concept: str, market_insights: Optional[Dict[str, Any]] = None, chat_context: Optional[str] = None) -> AIFormulaDetails:
+        return await self._record("generate_formula_details_with_context", product_concept=product_concept, market_insights=market_insights, chat_context=chat_context)
+
+    async def generate_marketing_copy(self, formula_name: str, formula_description: str) -> AIMarketingCopy:
+        return await self._record("generate_marketing_copy", formula_name=formula_name, formula_description=formula_description)
+
+    async def generate_image(self, prompt: str) -> str:
+        return await self._record("generate_image", prompt=prompt)
+
+    async def categorize_product(self, product_name: str, product_description: str) -> str:
+        return await self._record("categorize_product", product_name=product_name, product_description=product_description)
+
+    async def extract_trend_data(self, article_title: str, article_content: str) -> AITrendData:
+        return await self._record("extract_trend_data", article_title=article_title, article_content=article_content)
+
+    async def generate_trend_category_and_tags(self, article_title: str, article_content: str) -> AITrendCategoryAndTags:
+        return await self._record("generate_trend_category_and_tags", article_title=article_title, article_content=article_content)
+
+    async def generate_commercialization_insights(self, formula_name: str, formula_description: str, master_tasks_data: List[Dict[str, Any]]) -> AICommercializationInsights:
+        return await self._record("generate_commercialization_insights", formula_name=formula_name, formula_description=formula_description, master_tasks_data=master_tasks_data)
+
+    async def generate_supplier_analysis(self, workflow_request_data: Dict[str, Any]) -> AISupplierAnalysisOutput:
+        return await self._record("generate_supplier_analysis", workflow_request_data=workflow_request_data)
+
+    async def generate_cost_analysis(self, workflow_request_data: Dict[str, Any]) -> AICostAnalysisOutput:
+        return await self._record("generate_cost_analysis", workflow_request_data=workflow_request_data)
+
+class ReplayProvider(AIProvider):
+    """
+    Serves recorded fixtures with synthetic latency.
+
+    :param latency_seconds: Delay before each response (time to first token for streams).
+    :param chunk_latency_seconds: Delay between streamed chat chunks.
+    :param strict: If False, falls back to any fixture recorded for the method when the exact inputs were not recorded.
+    """
+
+    def __init__(self, fixtures_dir: str, latency_seconds: float = 0.0, chunk_latency_seconds: float = 0.0, strict: bool = False):
+        self.store = FixtureStore(fixtures_dir)
+        self.latency_seconds = latency_seconds
+        self.chunk_latency_seconds = chunk_latency_seconds
+        self.strict = strict
+
+    def _lookup(self, method: str, arguments: Dict[str, Any]) -> Any:
+        response = self.store.load(method, arguments)
+        if response is None and not self.strict:
+            response = self.store.load_any(method)
+        if response is None:
+            raise AIProviderError(f"No recorded fixture for {method}.")
+        return response
+
+    async def _replay(self, method: str, **arguments) -> Any:
+        response = self._lookup(method, arguments)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        response_model = RESPONSE_MODELS.get(method)
+        return response_model.model_validate(response) if response_model else response
+
+    async def generate_chat_completion(self, messages: List[Message], usage: Optional[Dict[str, int]] = None) -> Iterator[str]: # type: ignore
+        chunks = self._lookup("generate_chat_completion", {"messages": messages})
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        for chunk in chunks:
+            yield chunk
+            if self.chunk_latency_seconds:
+                await asyncio.sleep(self.chunk_latency_seconds)
+        if usage is not None:
+            # Fixtures do not record usage; estimate it the same way the rate limiter does
+            prompt_tokens = estimate_tokens(*(message.content for message in messages))
+            completion_tokens = estimate_tokens(*chunks)
+            usage.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens)
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        response = self.store.load("generate_embeddings", {"texts": texts})
+        if response is None and not self.strict:
+            # Another recording's vectors would not line up with these texts; embed them locally instead
+            response = await HashingEmbedder(settings.EMBEDDING_DIMENSIONS).generate_embeddings(texts)
+        if response is None:
+            raise AIProviderError("No recorded fixture for generate_embeddings.")
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return response
+
+    async def generate_conversation_summary(self, previous_summary: Optional[str], messages: List[Message]) -> str:
+        return await self._replay("generate_conversation_summary", previous_summary=previous_summary, messages=messages)
+
+    async def generate_summary_and_sentiment(self, text_content: str) -> AISummaryAndSentiment:
+        return await self._replay("generate_summary_and_sentiment", text_content=text_content)
+
+    async def generate_trend_signals(self, combined_content: str) -> AITrendSignals:
+        return await self._replay("generate_trend_signals", combined_content=combined_content)
+
+    async def generate_ingredient_enrichment(self, ingredient_name: str) -> AIIngredientEnrichment:
+        return await self._replay("generate_ingredient_enrichment", ingredient_name=ingredient_name)
+
+    async def generate_insight_portal_data(self, ingredient_name: str) -> AIInsightPortalData:
+        return await self._replay("generate_insight_portal_data", ingredient_name=ingredient_name)
+
+    async def generate_insight_portal_data_with_context(self, ingredient_name: str, chat_context: str) -> AIInsightPortalData:
+        return await self._replay("generate_insight_portal_data_with_context", ingredient_name=ingredient_name, chat_context=chat_context)
+
+    async def generate_formula_details(self, product_concept: str, market_insights: Optional[Dict[str, Any]] = None) -> AIFormulaDetails:
+        return await self._replay("generate_formula_details", product_concept=product_concept, market_insights=market_insights)
+
+    async def generate_formula_details_with_context(self, product_concept: str, market_insights: Optional[Dict[str, Any]] = None, chat_context: Optional[str] = None) -> AIFormulaDetails:
+        return await self._replay("generate_formula_details_with_context", product_concept=product_concept, market_insights=market_insights, chat_context=chat_context)
+
+    async def generate_marketing_copy(self, formula_name: str, formula_description: str) -> AIMarketingCopy:
+        return await self._replay("generate_marketing_copy", formula_name=formula_name, formula_description=formula_description)
+
+    async def generate_image(self, prompt: str) -> str:
+        return await self._replay("generate_image", prompt=prompt)
+
+    async def categorize_product(self, product_name: str, product_description: str) -> str:
+        return await self._replay("categorize_product", product_name=product_name, product_description=product_description)
+
+    async def extract_trend_data(self, article_title: str, article_content: str) -> AITrendData:
+        return await self._replay("extract_trend_data", article_title=article_title, article_content=article_content)
+
+    async def generate_trend_category_and_tags(self, article_title: str, article_content: str) -> AITrendCategoryAndTags:
+        return await self._replay("generate_trend_category_and_tags", article_title=article_title, article_content=article_content)
+
+    async def generate_commercialization_insights(self, formula_name: str, formula_description: str, master_tasks_data: List[Dict[str, Any]]) -> AICommercializationInsights:
+        return await self._replay("generate_commercialization_insights", formula_name=formula_name, formula_description=formula_description, master_tasks_data=master_tasks_data)
+
+    async def generate_supplier_analysis(self, workflow_request_data: Dict[str, Any]) -> AISupplierAnalysisOutput:
+        return await self._replay("generate_supplier_analysis", workflow_request_data=workflow_request_data)
+
+    async def generate_cost_analysis(self, workflow_request_data: Dict[str, Any]) -> AICostAnalysisOutput:
+        return await self._replay("generate_cost_analysis", workflow_request_data=workflow_request_data)
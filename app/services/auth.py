@@ -4,7 +4,7 @@ import random
 import string
 from app.services.user import UserService
 from datetime import datetime, timedelta
-from app.core.security import pwd_context
+from app.core.security import hash_password, verify_password
 
 user_service = UserService()
 
@@ -22,7 +22,7 @@ class AuthService:
 
 
 
-    def change_password_via_token(self, db, user, reset_data):
+    async def change_password_via_token(self, db, user, reset_data):
         if (user.reset_token != reset_data.token or
            user.reset_token_expires_at is None or
            user.reset_token_expires_at < datetime.utcnow()
@@ -32,7 +32,7 @@ class AuthService:
                detail="Invalid or expired reset token"
            )
 
-        hashed_password = pwd_context.hash(reset_data.new_password)
+        hashed_password = await hash_password(reset_data.new_password)
 
         user_service.update_user(db, user, {
            "hashed_password": hashed_password,
@@ -43,5 +43,5 @@ class AuthService:
            "reset_token_expires_at": None
        })
 
-    def verify_password(self, plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password, hashed_password):
+        return await verify_password(plain_password, hashed_password)
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+class AuthCache:
+    """
+    Per-process cache for get_current_user.
+
+    - Decoded JWT claims, LRU keyed by the raw token, valid until the token's exp.
+    - Users keyed by `sub` (email) for `user_ttl_seconds`, stored as column values
+      and rebuilt into a fresh detached User per request. UserService and the
+      account routes invalidate entries when a user changes, but only in the
+      process that made the change: other workers keep serving their copy until
+      it expires, so `user_ttl_seconds` is the cross-worker staleness bound and
+      should stay short.
+
+    Revoked tokens are checked against token_denylist_cache.
+    """
+
+    def __init__(self, claims_max_entries: int, user_ttl_seconds: int):
+        self.claims_max_entries = claims_max_entries
+        self.user_ttl_seconds = user_ttl_seconds
+        self._claims: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._users: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Resolved on first use; inspecting the mapper at import time would configure
+        # it before every model referenced by User's relationships is imported
+        self._columns: Optional[List[str]] = None
+        self.stats: Dict[str, int] = {
+            "claims_hits": 0, "claims_misses": 0,
+            "user_hits": 0, "user_misses": 0,
+        }
+
+    # Claims
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        payload = self._claims.get(token)
+        if payload is None or payload.get("exp", 0) <= time.time():
+            if payload is not None:
+                del self._claims[token]
+            self.stats["claims_misses"] += 1
+            return None
+        self._claims.move_to_end(token)
+        self.stats["claims_hits"] += 1
+        return payload
+
+    def set_claims(self, token: str, payload: Dict[str, Any]) -> None:
+        self._claims[token] = payload
+        self._claims.move_to_end(token)
+        while len(self._claims) > self.claims_max_entries:
+            self._claims.popitem(last=False)
+
+    # Users
+
+    def get_user(self, email: str) -> Optional[User]:
+        entry = self._users.get(email)
+        if entry is None or entry[0] <= time.monotonic():
+            self._users.pop(email, None)
+            self.stats["user_misses"] += 1
+            return None
+        self.stats["user_hits"] += 1
+        user = User(**entry[1])
+        make_transient_to_detached(user)
+        return user
+
+    def set_user(self, user: User) -> None:
+        if self._columns is None:
+            self._columns = [attribute.key for attribute in inspect(User).column_attrs]
+        values = {column: getattr(user, column) for column in self._columns}
+        self._users[user.email] = (time.monotonic() + self.user_ttl_seconds, values)
+
+    def invalidate_user(self, *emails: Optional[str]) -> None:
+        for email in emails:
+            if email:
+                self._users.pop(email, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "claims_entries": len(self._claims),
+            "user_entries": len(self._users),
+        }
+
+auth_cache = AuthCache(
+    claims_max_entries=settings.AUTH_CLAIMS_CACHE_SIZE,
+    user_ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
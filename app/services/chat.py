@@ -1,18 +1,22 @@
-from typing import List, Iterator, Optional
+from typing import Dict, List, Iterator, Optional
 from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.schemas.chat import Message
-from app.crud.trend import trend as trend_crud
-from app.crud.ingredient import ingredient as ingredient_crud
 from app.crud.conversation import conversation as conversation_crud
 from app.crud.chat_message import chat_message as chat_message_crud
 from app.services.ai_provider import AIProvider, OpenAIProvider
+from app.services.context_retrieval import context_retriever
+from app.services.chat_history import build_history_window, conversation_summarizer, summary_message
 from app.services.voice import VoiceService
 from app.utils import prompt_templates
+from app.utils.sse import ServerSentEvent
 from app.models.conversation import Conversation as ConversationModel
 from app.schemas.conversation import ConversationCreate
-from app.schemas.chat_message import ChatMessageCreate
+from app.schemas.chat_message import ChatMessage as ChatMessageSchema, ChatMessageCreate, ChatMessagePage
 
 class ChatService:
     def __init__(self, ai_provider: AIProvider = OpenAIProvider(), voice_service: VoiceService = None):
@@ -25,26 +29,35 @@ class ChatService:
         conversation = conversation_crud.create(db, obj_in=ConversationCreate(user_id=user_id, title=title))
         return conversation
 
-    def _retrieve_context(self, query: str, db: Session) -> str:
+    async def _retrieve_context(self, query: str, db: AsyncSession) -> str:
         context_parts = []
+        results = await context_retriever.retrieve(db, query, limit=2, ai_provider=self.ai_provider)
 
-        trends = trend_crud.get_multi(db, search=query, limit=2)
-        if trends:
+        if results["trends"]:
             context_parts.append("Relevant Trends:\n")
-            for trend in trends:
-                context_parts.append(f"- Title: {trend.title}\n  Content: {(trend.description or '')[:200]}...")
+            for trend in results["trends"]:
+                context_parts.append(f"- Title: {trend.title}\n  Content: {trend.description[:200]}...")
 
-        ingredients = ingredient_crud.get_multi(db, search=query, limit=2)
-        if ingredients:
+        if results["ingredients"]:
             context_parts.append("Relevant Ingredients:\n")
-            for ingredient in ingredients:
-                context_parts.append(f"- Name: {ingredient.name}\n  Description: {(ingredient.description or '')[:200]}...")
+            for ingredient in results["ingredients"]:
+                context_parts.append(f"- Name: {ingredient.title}\n  Description: {ingredient.description[:200]}...")
 
         return "\n".join(context_parts)
 
-    async def send_streaming_message(self, messages: List[Message], db: Session, agent_type: str, conversation_id: int, user_id: int) -> Iterator[str]: # type: ignore
+    async def prepare_streaming_turn(self, messages: List[Message], db: AsyncSession, agent_type: str, conversation: ConversationModel) -> List[Message]:
+        """
+        Does all database work for a chat turn up front: context retrieval, history
+        loading and persisting the user's messages. Returns the messages to send to the AI.
+
+        History is the conversation's rolling summary plus the most recent messages
+        that fit in CHAT_HISTORY_TOKEN_BUDGET; once enough messages have fallen out of
+        the window, or more than CHAT_HISTORY_MAX_MESSAGES are unsummarized, they are
+        folded into the summary in the background.
+        """
+        conversation_id = conversation.id
         latest_user_message = messages[-1].content if messages and messages[-1].role == "user" else ""
-        context = self._retrieve_context(latest_user_message, db)
+        context = await self._retrieve_context(latest_user_message, db)
 
         if agent_type == "innovative":
             system_prompt = prompt_templates.INNOVATIVE_AGENT_SYSTEM_PROMPT.format(context=context)
@@ -53,40 +66,74 @@ class ChatService:
         else:
             system_prompt = prompt_templates.DEFAULT_AGENT_SYSTEM_PROMPT.format(context=context)
 
-        history_from_db = chat_message_crud.get_by_conversation_id(db, conversation_id=conversation_id)
-
-        valid_chat_roles = {'user', 'assistant'}
-        historical_messages = [
-            Message(role=msg.role if msg.role in valid_chat_roles else 'user', content=msg.content)
-            for msg in history_from_db
-        ]
-
-        messages_for_ai = [Message(role="system", content=system_prompt)] + historical_messages + messages
+        # One extra row tells us whether unsummarized messages exist beyond the ones loaded
+        history_from_db = await chat_message_crud.aget_last(
+            db, conversation_id=conversation_id, limit=settings.CHAT_HISTORY_MAX_MESSAGES + 1, after_id=conversation.summary_message_id
+        )
+        truncated = len(history_from_db) > settings.CHAT_HISTORY_MAX_MESSAGES
+        if truncated:
+            history_from_db = history_from_db[1:]
+        window = build_history_window(history_from_db, settings.CHAT_HISTORY_TOKEN_BUDGET)
+        if truncated:
+            # Messages older than the loaded rows are in neither the window nor the summary;
+            # fold everything before the window in now rather than waiting for the token trigger
+            up_to_id = window.overflow[-1].id if window.overflow else history_from_db[0].id - 1
+            conversation_summarizer.schedule(self.ai_provider, conversation_id, up_to_id)
+        elif window.overflow_tokens >= settings.CHAT_SUMMARY_TRIGGER_TOKENS:
+            conversation_summarizer.schedule(self.ai_provider, conversation_id, window.overflow[-1].id)
+
+        messages_for_ai = [Message(role="system", content=system_prompt)]
+        if conversation.summary:
+            messages_for_ai.append(summary_message(conversation.summary))
+        messages_for_ai += window.messages + messages
 
         for message in messages:
-            chat_message_crud.create(db, obj_in=ChatMessageCreate(conversation_id=conversation_id, role=message.role, content=message.content))
+            await chat_message_crud.acreate(db, obj_in=ChatMessageCreate(conversation_id=conversation_id, role=message.role, content=message.content))
 
+        return messages_for_ai
+
+    async def stream_assistant_reply(self, messages_for_ai: List[Message], conversation_id: int) -> Iterator[ServerSentEvent]: # type: ignore
+        """
+        Streams the AI reply as events without holding a database connection; the
+        finished reply is persisted through a short-lived session of its own and
+        announced by a final `done` event.
+        """
         full_ai_response_content = []
+        usage: Dict[str, int] = {}
 
-        async for chunk in self.ai_provider.generate_chat_completion(messages_for_ai):
+        async for chunk in self.ai_provider.generate_chat_completion(messages_for_ai, usage=usage):
+            yield ServerSentEvent(data={"content": chunk})
             full_ai_response_content.append(chunk)
-            yield chunk
 
         ai_response_content = "".join(full_ai_response_content)
-        chat_message_crud.create(db, obj_in=ChatMessageCreate(conversation_id=conversation_id, role="assistant", content=ai_response_content))
+        async with AsyncSessionLocal() as db:
+            assistant_message = await chat_message_crud.acreate(db, obj_in=ChatMessageCreate(conversation_id=conversation_id, role="assistant", content=ai_response_content))
+
+        yield ServerSentEvent(data={"message_id": assistant_message.id, "usage": usage}, event="done")
 
     def get_user_conversations(self, db: Session, user_id: int) -> List[ConversationModel]:
         return conversation_crud.get_by_user_id_sorted(db, user_id=user_id)
 
-    def validate_conversation_access(self, db: Session, conversation_id: int, user_id: int) -> ConversationModel:
+    def get_conversation_messages(self, db: Session, conversation_id: int, user_id: int, before_id: Optional[int], limit: int) -> ChatMessagePage:
+        """One page of a conversation's messages, newest page first, each page oldest first."""
+        if not conversation_crud.get_by_id_and_user(db, conversation_id=conversation_id, user_id=user_id):
+            raise ValueError("Conversation not found or access denied")
+
+        # One extra row tells us whether an older page exists
+        rows = chat_message_crud.get_last(db, conversation_id=conversation_id, limit=limit + 1, before_id=before_id)
+        has_more = len(rows) > limit
+        rows = rows[1:] if has_more else rows
+        return ChatMessagePage(
+            messages=[ChatMessageSchema.model_validate(row) for row in rows],
+            next_before_id=rows[0].id if has_more else None
+        )
+
+    async def validate_conversation_access(self, db: AsyncSession, conversation_id: int, user_id: int) -> ConversationModel:
         """Validate that conversation exists and user has access."""
         if conversation_id <= 0:
             raise ValueError("Invalid conversation_id")
 
-        conversation = db.query(ConversationModel).filter(
-            ConversationModel.id == conversation_id,
-            ConversationModel.user_id == user_id
-        ).first()
+        conversation = await conversation_crud.aget_by_id_and_user(db, conversation_id=conversation_id, user_id=user_id)
 
         if not conversation:
             raise ValueError("Conversation not found or access denied")
@@ -126,11 +173,11 @@ class ChatService:
             raise ValueError(f"Invalid agent_type. Must be one of: {', '.join(ALLOWED_AGENT_TYPES)}")
 
     async def validate_and_process_input(self, message: Optional[str], audio_file: Optional[UploadFile],
-                                       agent_type: str, conversation_id: int, user_id: int, db: Session) -> tuple:
+                                       agent_type: str, conversation_id: int, user_id: int, db: AsyncSession) -> tuple:
         """Validate input and return processed messages and conversation."""
         self.validate_chat_input(message, audio_file, agent_type)
 
-        conversation = self.validate_conversation_access(db, conversation_id, user_id)
+        conversation = await self.validate_conversation_access(db, conversation_id, user_id)
 
         if audio_file:
             processed_messages = await self.process_audio_input(audio_file)
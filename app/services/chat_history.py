@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.chat_message import chat_message as chat_message_crud
+from app.crud.conversation import conversation as conversation_crud
+from app.models.chat_message import ChatMessage as ChatMessageModel
+from app.schemas.chat import Message
+from app.services.ai_rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+CHAT_MODEL = "gpt-4"
+# Fixed per-message cost of the chat format (role and delimiters)
+TOKENS_PER_MESSAGE = 4
+VALID_CHAT_ROLES = {"user", "assistant"}
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(CHAT_MODEL)
+    except Exception as e:
+        # The encoding files are downloaded on first use; fall back if that fails
+        logger.warning(f"tiktoken unavailable, estimating token counts instead: {e}")
+        return None
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def count_message_tokens(message: Message) -> int:
+    return count_tokens(message.content) + TOKENS_PER_MESSAGE
+
+def to_chat_message(row: ChatMessageModel) -> Message:
+    return Message(role=row.role if row.role in VALID_CHAT_ROLES else "user", content=row.content)
+
+class HistoryWindow(NamedTuple):
+    messages: List[Message]
+    # Rows older than the window that are not yet part of the conversation summary
+    overflow: List[ChatMessageModel]
+    overflow_tokens: int
+
+def build_history_window(rows: Sequence[ChatMessageModel], token_budget: int) -> HistoryWindow:
+    """
+    Keeps the most recent messages that fit in `token_budget`, walking back from
+    the newest. `rows` must be ordered oldest first.
+    """
+    used = 0
+    start = len(rows)
+    for index in range(len(rows) - 1, -1, -1):
+        tokens = count_message_tokens(to_chat_message(rows[index]))
+        if used + tokens > token_budget:
+            break
+        used += tokens
+        start = index
+
+    overflow = list(rows[:start])
+    overflow_tokens = sum(count_message_tokens(to_chat_message(row)) for row in overflow)
+    return HistoryWindow([to_chat_message(row) for row in rows[start:]], overflow, overflow_tokens)
+
+def summary_message(summary: str) -> Message:
+    return Message(role="system", content=f"Summary of the earlier conversation:\n{summary}")
+
+def take_within_budget(rows: Sequence[ChatMessageModel], token_budget: int) -> List[ChatMessageModel]:
+    """The oldest rows that fit in `token_budget`; always at least one, so a long message still moves things on."""
+    taken: List[ChatMessageModel] = []
+    used = 0
+    for row in rows:
+        tokens = count_message_tokens(to_chat_message(row))
+        if taken and used + tokens > token_budget:
+            break
+        taken.append(row)
+        used += tokens
+    return taken
+
+class ConversationSummarizer:
+    """
+    Folds messages that fell out of the history window into the conversation's
+    rolling summary, in the background and at most once at a time per conversation.
+    A long backlog is summarized in chunks of about CHAT_SUMMARY_CHUNK_TOKENS, and
+    the summary is saved after each, so no single prompt outgrows the model's context.
+    """
+
+    def __init__(self):
+        self._in_progress: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {"scheduled": 0, "completed": 0, "failed": 0, "chunks": 0}
+
+    def schedule(self, ai_provider, conversation_id: int, up_to_message_id: int) -> None:
+        if conversation_id in self._in_progress:
+            return
+        self._in_progress.add(conversation_id)
+        self.stats["scheduled"] += 1
+        task = asyncio.create_task(self._summarize(ai_provider, conversation_id, up_to_message_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize_chunk(self, ai_provider, conversation_id: int, up_to_message_id: int) -> bool:
+        """Folds the next chunk into the summary; returns False once there is nothing left to fold."""
+        async with AsyncSessionLocal() as db:
+            conversation = await conversation_crud.aget(db, conversation_id)
+            if conversation is None or (conversation.summary_message_id or 0) >= up_to_message_id:
+                return False
+            previous_message_id = conversation.summary_message_id
+            previous_summary = conversation.summary
+            rows = await chat_message_crud.aget_by_conversation_id(
+                db,
+                conversation_id=conversation_id,
+                after_id=previous_message_id,
+                up_to_id=up_to_message_id,
+                limit=settings.CHAT_SUMMARY_CHUNK_MAX_MESSAGES,
+            )
+        rows = take_within_budget(rows, settings.CHAT_SUMMARY_CHUNK_TOKENS)
+        if not rows:
+            return False
+
+        # No connection is held while the model writes the summary
+        summary = await ai_provider.generate_conversation_summary(previous_summary, [to_chat_message(row) for row in rows])
+
+        async with AsyncSessionLocal() as db:
+            # Another writer advancing the summary first ends this run
+            return await conversation_crud.aupdate_summary(
+                db,
+                conversation_id=conversation_id,
+                summary=summary,
+                summary_message_id=rows[-1].id,
+                expected_message_id=previous_message_id
+            )
+
+    async def _summarize(self, ai_provider, conversation_id: int, up_to_message_id: int) -> None:
+        try:
+            chunks = 0
+            while await self._summarize_chunk(ai_provider, conversation_id, up_to_message_id):
+                chunks += 1
+                self.stats["chunks"] += 1
+            if chunks:
+                self.stats["completed"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Failed to summarize conversation {conversation_id}: {e}", exc_info=True)
+        finally:
+            self._in_progress.discard(conversation_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "in_progress": len(self._in_progress)}
+
+conversation_summarizer = ConversationSummarizer()
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.utils.sse import ServerSentEvent
+
+logger = logging.getLogger(__name__)
+
+class ChatStream:
+    """
+    Buffered events of one chat turn.
+
+    Every event gets its position in the buffer as its SSE id, so a client that
+    reconnects with Last-Event-ID can be served the events it missed.
+    """
+
+    def __init__(self, stream_id: str, user_id: int, conversation_id: int):
+        self.stream_id = stream_id
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.events: List[ServerSentEvent] = []
+        self.finished_at: Optional[float] = None
+        self.created_at = time.monotonic()
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def append(self, event: ServerSentEvent) -> None:
+        self.events.append(event._replace(id=str(len(self.events))))
+        self._notify()
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[ServerSentEvent]:
+        """Yields buffered events after `last_event_id`, then live ones until the turn ends."""
+        position = 0 if last_event_id is None else max(0, last_event_id + 1)
+        while True:
+            changed = self._changed
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+class ChatStreamRegistry:
+    """
+    In-process registry of chat turns being generated or recently finished.
+
+    Generation runs in a background task that is independent of the client
+    connection, so a dropped client can resume from the buffer instead of
+    re-running the completion. Buffers are kept `ttl_seconds` after the turn
+    ends. Streams live in the worker that started them; resuming requires the
+    reconnect to reach the same worker (sticky sessions).
+    """
+
+    def __init__(self, ttl_seconds: int, max_streams: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[str, ChatStream]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {"started": 0, "resumed": 0, "failed": 0, "evicted": 0}
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for stream_id, stream in list(self._streams.items()):
+            if stream.finished and now - stream.finished_at > self.ttl_seconds:
+                del self._streams[stream_id]
+        # Over capacity: drop the oldest finished buffers first
+        for stream_id, stream in list(self._streams.items()):
+            if len(self._streams) <= self.max_streams:
+                break
+            if stream.finished:
+                del self._streams[stream_id]
+                self.stats["evicted"] += 1
+
+    async def _produce(self, stream: ChatStream, events: AsyncIterator[ServerSentEvent]) -> None:
+        try:
+            async for event in events:
+                stream.append(event)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Chat stream {stream.stream_id} failed: {e}", exc_info=True)
+            stream.append(ServerSentEvent(data={"detail": "An internal error occurred"}, event="error"))
+        finally:
+            stream.finish()
+
+    def start(self, user_id: int, conversation_id: int, events: AsyncIterator[ServerSentEvent]) -> ChatStream:
+        self._evict()
+        stream = ChatStream(secrets.token_urlsafe(16), user_id, conversation_id)
+        stream.append(ServerSentEvent(data={"stream_id": stream.stream_id, "conversation_id": conversation_id}, event="stream"))
+        self._streams[stream.stream_id] = stream
+        self.stats["started"] += 1
+
+        task = asyncio.create_task(self._produce(stream, events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return stream
+
+    def get(self, stream_id: str, user_id: int) -> Optional[ChatStream]:
+        self._evict()
+        stream = self._streams.get(stream_id)
+        if stream is None or stream.user_id != user_id:
+            return None
+        self.stats["resumed"] += 1
+        return stream
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "buffered": len(self._streams),
+            "generating": len(self._tasks),
+        }
+
+chat_stream_registry = ChatStreamRegistry(
+    ttl_seconds=settings.CHAT_STREAM_BUFFER_TTL_SECONDS,
+    max_streams=settings.CHAT_STREAM_MAX_BUFFERED,
+)
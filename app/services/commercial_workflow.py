@@ -1,5 +1,6 @@
 from fastapi import HTTPException, status
 from typing import Dict
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 import asyncio
@@ -21,8 +22,8 @@ class CommercialWorkflowService:
     def __init__(self, ai_provider: OpenAIProvider = OpenAIProvider()):
         self.ai_provider = ai_provider
 
-    async def analyze_formula(self, db: Session, formula_id: int) -> CommercializationAnalysisOutput:
-        formula = formula_crud.get_with_full_details(db, id=formula_id)
+    async def analyze_formula(self, db: AsyncSession, formula_id: int) -> CommercializationAnalysisOutput:
+        formula = await formula_crud.aget_with_full_details(db, id=formula_id)
 
         if not formula:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Formula not found")
@@ -97,7 +98,7 @@ class CommercialWorkflowService:
             is_custom=False
         )
         db.add(db_timeline)
-        db.commit()
+        await db.commit()
 
         return result
 
@@ -0,0 +1,138 @@
+import logging
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.crud.ingredient import ingredient as ingredient_crud
+from app.crud.trend import trend as trend_crud
+from app.services.semantic_search import semantic_search
+from app.utils.text_utils import extract_keywords
+
+logger = logging.getLogger(__name__)
+
+class ContextDocument(NamedTuple):
+    title: str
+    description: str
+
+class InvertedIndex:
+    """Small in-process TF-IDF index; the full-text fallback for databases without tsvector (SQLite)."""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._documents: Dict[int, ContextDocument] = {}
+
+    def add(self, doc_id: int, document: ContextDocument, weighted_fields: List[tuple]) -> None:
+        """`weighted_fields` is a list of (text, weight); title-like fields should weigh more."""
+        self._documents[doc_id] = document
+        term_weights: Counter = Counter()
+        for text, weight in weighted_fields:
+            for term in extract_keywords(text or "", max_keywords=10_000):
+                term_weights[term] += weight
+        for term, weight in term_weights.items():
+            self._postings[term][doc_id] = weight
+
+    def search(self, keywords: List[str], limit: int) -> List[ContextDocument]:
+        scores: Counter = Counter()
+        total = max(len(self._documents), 1)
+        for keyword in keywords:
+            postings = self._postings.get(keyword)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for doc_id, weight in postings.items():
+                scores[doc_id] += weight * idf
+        return [self._documents[doc_id] for doc_id, _ in scores.most_common(limit)]
+
+class ContextRetriever:
+    """
+    Finds trends and ingredients relevant to a chat message.
+
+    Semantic matches from the vector index come first when it has been built;
+    keyword matches fill the remaining slots. On Postgres keyword search ranks
+    generated tsvector columns with ts_rank (kept current by the database on
+    insert/update). Elsewhere it uses in-process inverted indexes rebuilt every
+    `index_ttl_seconds`.
+    """
+
+    def __init__(self, index_ttl_seconds: int):
+        self.index_ttl_seconds = index_ttl_seconds
+        self.use_full_text = async_engine.dialect.name == "postgresql"
+        self._trend_index: Optional[InvertedIndex] = None
+        self._ingredient_index: Optional[InvertedIndex] = None
+        self._built_at = 0.0
+
+    def invalidate(self) -> None:
+        self._built_at = 0.0
+
+    async def _ensure_indexes(self, db: AsyncSession) -> None:
+        if self._trend_index is not None and time.monotonic() - self._built_at < self.index_ttl_seconds:
+            return
+        trend_index = InvertedIndex()
+        for trend_id, title, description in await trend_crud.aget_search_documents(db):
+            trend_index.add(trend_id, ContextDocument(title, description or ""), [(title, 2.0), (description, 1.0)])
+        ingredient_index = InvertedIndex()
+        for ingredient_id, name, description, function, benefits in await ingredient_crud.aget_search_documents(db):
+            ingredient_index.add(
+                ingredient_id,
+                ContextDocument(name, description or ""),
+                [(name, 2.0), (description, 1.0), (function, 0.5), (benefits, 0.5)]
+            )
+        self._trend_index, self._ingredient_index = trend_index, ingredient_index
+        self._built_at = time.monotonic()
+
+    async def retrieve(self, db: AsyncSession, query: str, limit: int = 2, ai_provider=None) -> Dict[str, List[ContextDocument]]:
+        semantic = await self._retrieve_semantic(db, query, limit, ai_provider)
+        keyword = await self._retrieve_keywords(db, query, limit)
+        return {kind: self._merge(semantic[kind], keyword[kind], limit) for kind in ("trends", "ingredients")}
+
+    @staticmethod
+    def _merge(first: List[ContextDocument], second: List[ContextDocument], limit: int) -> List[ContextDocument]:
+        merged = list(first)
+        for document in second:
+            if document not in merged:
+                merged.append(document)
+        return merged[:limit]
+
+    async def _retrieve_semantic(self, db: AsyncSession, query: str, limit: int, ai_provider) -> Dict[str, List[ContextDocument]]:
+        empty = {"trends": [], "ingredients": []}
+        if ai_provider is None or not settings.CHAT_SEMANTIC_RETRIEVAL_ENABLED or not query.strip():
+            return empty
+        try:
+            if semantic_search.is_empty(kinds=("trends", "ingredients")):
+                return empty
+            ids = await semantic_search.search(ai_provider, query, limit, kinds=("trends", "ingredients"))
+        except Exception as e:
+            logger.warning(f"Semantic retrieval failed, using keyword retrieval only: {e}")
+            return empty
+        trends = await trend_crud.aget_by_ids(db, ids["trends"])
+        ingredients = await ingredient_crud.aget_by_ids(db, ids["ingredients"])
+        return {
+            "trends": [ContextDocument(trend.title, trend.description or "") for trend in trends],
+            "ingredients": [ContextDocument(ingredient.name, ingredient.description or "") for ingredient in ingredients],
+        }
+
+    async def _retrieve_keywords(self, db: AsyncSession, query: str, limit: int) -> Dict[str, List[ContextDocument]]:
+        keywords = extract_keywords(query)
+        if not keywords:
+            return {"trends": [], "ingredients": []}
+
+        if self.use_full_text:
+            trends = await trend_crud.asearch_ranked(db, keywords=keywords, limit=limit)
+            ingredients = await ingredient_crud.asearch_ranked(db, keywords=keywords, limit=limit)
+            return {
+                "trends": [ContextDocument(trend.title, trend.description or "") for trend in trends],
+                "ingredients": [ContextDocument(ingredient.name, ingredient.description or "") for ingredient in ingredients],
+            }
+
+        await self._ensure_indexes(db)
+        return {
+            "trends": self._trend_index.search(keywords, limit),
+            "ingredients": self._ingredient_index.search(keywords, limit),
+        }
+
+context_retriever = ContextRetriever(index_ttl_seconds=settings.CHAT_CONTEXT_INDEX_TTL_SECONDS)
@@ -1,15 +1,16 @@
 import os
-import smtplib
-import ssl
 import logging
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from jinja2 import Environment, FileSystemLoader, select_autoescape, Template, TemplateNotFound
-
-from app.core.config import settings
+from email.utils import formataddr
+from typing import List
 
+import aiosmtplib
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape, Template, TemplateNotFound
 
+from app.core.config import settings
+from app.services.email_transport import smtp_pool
 
 class EmailService:
     _template_env = None
@@ -27,12 +28,43 @@ class EmailService:
                 'templates'
             )
 
+            if settings.EMAIL_TEMPLATE_BYTECODE_CACHE_DIR:
+                os.makedirs(settings.EMAIL_TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(settings.EMAIL_TEMPLATE_BYTECODE_CACHE_DIR)
+            else:
+                bytecode_cache = FileSystemBytecodeCache()
+
             cls._template_env = Environment(
                 loader=FileSystemLoader(template_dir),
-                autoescape=select_autoescape(['html'])
+                autoescape=select_autoescape(['html']),
+                bytecode_cache=bytecode_cache,
+                # Templates ship with the code; skip the per-render mtime check
+                auto_reload=False
             )
         return cls._template_env
 
+    @staticmethod
+    def _default_context(context: dict) -> dict:
+        return {
+            'company_name': 'Your Company',
+            'current_year': datetime.now().year,
+            **context
+        }
+
+    @classmethod
+    def precompile_templates(cls) -> int:
+        """
+        Compile every template under app/templates, filling the bytecode cache, so the
+        first send of each does not pay for it. Called at startup.
+
+        :return: Number of templates compiled
+        """
+        env = cls._get_template_env()
+        template_names = env.list_templates(extensions=['html'])
+        for template_name in template_names:
+            env.get_template(template_name)
+        return len(template_names)
+
     @classmethod
     def render_template(cls, template_name: str, context: dict) -> str:
         """
@@ -42,24 +74,77 @@ class EmailService:
         :param context: Dictionary of template variables
         :return: Rendered HTML template
         """
-        try:
-            # Add default context variables
-            default_context = {
-                'company_name': 'Your Company',
-                'current_year': datetime.now().year,
-                **context
-            }
+        return cls.render_bulk(template_name, [context])[0]
 
+    @classmethod
+    def render_bulk(cls, template_name: str, contexts: List[dict]) -> List[str]:
+        """
+        Render one template for many recipients in a single pass
+
+        The template and the default context are looked up once for the whole batch,
+        so newsletter-style sends cost one render per recipient.
+
+        :param template_name: Name of the template file
+        :param contexts: One dictionary of template variables per recipient
+        :return: Rendered HTML, in the order of `contexts`
+        """
+        try:
             template_env = cls._get_template_env()
             template = template_env.get_template(template_name)
-            return template.render(**default_context)
+            defaults = cls._default_context({})
+            return [template.render({**defaults, **context}) for context in contexts]
+        except TemplateNotFound:
+            logging.error(f"Template '{template_name}' not found.")
+            raise ValueError(f"Template '{template_name}' does not exist.")
         except Exception as e:
             logging.error(f"Error rendering email template {template_name}: {e}")
             raise
 
+    @classmethod
+    def build_message(cls, to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+        """
+        Build the MIME message for an already rendered email.
+
+        :param to_email: Recipient email address
+        :param subject: Email subject
+        :param html_content: Rendered HTML body
+        """
+        # Create message container
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = formataddr((settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL))
+        msg['To'] = to_email
+
+        # Attach HTML content
+        msg.attach(MIMEText(html_content, 'html'))
+        return msg
 
     @classmethod
-    def send_email(
+    async def send_html(cls, to_email: str, subject: str, html_content: str):
+        """
+        Send an already rendered email over a pooled SMTP connection.
+
+        Request handlers should queue mail through the outbox instead
+        (app.services.email_outbox), so SMTP latency stays out of the request.
+
+        :param to_email: Recipient email address
+        :param subject: Email subject
+        :param html_content: Rendered HTML body
+        """
+        try:
+            msg = cls.build_message(to_email, subject, html_content)
+            await smtp_pool.send(msg, sender=settings.EMAILS_FROM_EMAIL, recipients=[to_email])
+            logging.info(f"Email sent successfully to {to_email}")
+
+        except aiosmtplib.SMTPException as smtp_error:
+            logging.error(f"SMTP error: {smtp_error}")
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error: {e}")
+            raise
+
+    @classmethod
+    async def send_email(
         cls,
         to_email: str,
         subject: str,
@@ -74,39 +159,5 @@ class EmailService:
         :param template_name: Name of the template file
         :param template_context: Dictionary of template variables
         """
-        try:
-            # Create message container
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = settings.EMAILS_FROM_NAME
-            msg['To'] = to_email
-
-            # Render HTML content
-            try:
-                template_env = cls._get_template_env()
-                template = template_env.get_template(template_name)
-                html_content = template.render(template_context)
-            except TemplateNotFound:
-                logging.error(f"Template '{template_name}' not found.")
-                raise ValueError(f"Template '{template_name}' does not exist.")
-
-            # Attach HTML content
-            msg.attach(MIMEText(html_content, 'html'))
-
-            # Create secure SSL context
-            context = ssl.create_default_context()
-
-            # Send email
-            with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-                server.starttls(context=context)
-                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-                server.sendmail(msg['From'], [to_email], msg.as_string())
-
-            logging.info(f"Email sent successfully to {to_email}")
-
-        except smtplib.SMTPException as smtp_error:
-            logging.error(f"SMTP error: {smtp_error}")
-            raise
-        except Exception as e:
-            logging.error(f"Unexpected error: {e}")
-            raise
\ No newline at end of file
+        html_content = cls.render_template(template_name, template_context)
+        await cls.send_html(to_email, subject, html_content)
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.email_outbox import email_outbox as email_outbox_crud
+from app.models.email_outbox import EmailOutbox
+from app.services.email import EmailService
+
+logger = logging.getLogger(__name__)
+
+class EmailOutboxWorker:
+    """
+    Durable queue for outgoing email.
+
+    Request handlers only insert a row (`enqueue`); the background loop claims due
+    rows in batches, sends them over the pooled SMTP transport and retries failures
+    with exponential backoff until `max_attempts` is reached. A row's template context
+    is cleared once it is sent or given up on, and finished rows are deleted after
+    `retention_days`.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        lease_seconds: float,
+        retention_days: int,
+        sweep_interval_seconds: float,
+        sweep_batch_size: int,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+        self.retention_days = retention_days
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.sweep_batch_size = sweep_batch_size
+        self._wakeup = asyncio.Event()
+        self.stats: Dict[str, int] = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "swept": 0}
+
+    def enqueue(self, db: Session, *, to_email: str, subject: str, template_name: str, template_context: Dict[str, Any]) -> EmailOutbox:
+        row = email_outbox_crud.enqueue(
+            db, to_email=to_email, subject=subject, template_name=template_name, template_context=template_context
+        )
+        self.stats["queued"] += 1
+        self._wakeup.set()
+        return row
+
+    def enqueue_many(self, db: Session, *, subject: str, template_name: str, recipients: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Queues one email per (to_email, template_context) pair in a single insert, e.g. for digests."""
+        count = email_outbox_crud.enqueue_many(db, subject=subject, template_name=template_name, recipients=recipients)
+        self.stats["queued"] += count
+        self._wakeup.set()
+        return count
+
+    def _render(self, rows: List[EmailOutbox]) -> Dict[int, Union[str, Exception]]:
+        """Renders a claimed batch, one bulk render per template; maps row id to HTML or the render error."""
+        by_template: Dict[str, List[EmailOutbox]] = defaultdict(list)
+        for row in rows:
+            by_template[row.template_name].append(row)
+        rendered: Dict[int, Union[str, Exception]] = {}
+        for template_name, template_rows in by_template.items():
+            try:
+                bodies = EmailService.render_bulk(template_name, [row.template_context or {} for row in template_rows])
+            except Exception as e:
+                bodies = [e] * len(template_rows)
+            for row, body in zip(template_rows, bodies):
+                rendered[row.id] = body
+        return rendered
+
+    async def _deliver(self, row: EmailOutbox, body: Union[str, Exception]) -> Optional[str]:
+        """Sends one row; returns the error message on failure."""
+        try:
+            if isinstance(body, Exception):
+                raise body
+            await EmailService.send_html(to_email=row.to_email, subject=row.subject, html_content=body)
+            return None
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    def _retry_at(self, attempts: int) -> Optional[datetime]:
+        if attempts >= self.max_attempts:
+            return None
+        return datetime.now(timezone.utc) + timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1))
+
+    async def drain(self) -> int:
+        """Sends every due row, one claimed batch at a time; returns how many were sent."""
+        sent = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                rows = await email_outbox_crud.aclaim_due(db, batch_size=self.batch_size, lease_seconds=self.lease_seconds)
+            if not rows:
+                return sent
+
+            rendered = self._render(rows)
+            # The SMTP pool bounds how many of these are actually on the wire at once
+            errors = await asyncio.gather(*(self._deliver(row, rendered[row.id]) for row in rows))
+
+            async with AsyncSessionLocal() as db:
+                await email_outbox_crud.amark_sent(db, ids=[row.id for row, error in zip(rows, errors) if error is None])
+                for row, error in zip(rows, errors):
+                    if error is None:
+                        continue
+                    retry_at = self._retry_at(row.attempts)
+                    await email_outbox_crud.amark_failed(db, id=row.id, error=error, retry_at=retry_at)
+                    if retry_at is None:
+                        self.stats["failed"] += 1
+                        logger.error(f"Giving up on email {row.id} to {row.to_email} after {row.attempts} attempts: {error}")
+                    else:
+                        self.stats["retried"] += 1
+                        logger.warning(f"Email {row.id} to {row.to_email} failed, retrying at {retry_at.isoformat()}: {error}")
+
+            batch_sent = sum(1 for error in errors if error is None)
+            self.stats["sent"] += batch_sent
+            sent += batch_sent
+            if len(rows) < self.batch_size:
+                return sent
+
+    async def sweep(self) -> int:
+        """Deletes sent and failed rows older than the retention period; returns how many were deleted."""
+        before = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        deleted = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch = await email_outbox_crud.adelete_finished_batch(db, before=before, batch_size=self.sweep_batch_size)
+            deleted += batch
+            if batch < self.sweep_batch_size:
+                break
+        self.stats["swept"] += deleted
+        return deleted
+
+    async def run(self) -> None:
+        """
+        Background loop: drain on every enqueue in this process, poll for rows queued by
+        other workers, and periodically sweep finished rows.
+        """
+        last_sweep = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Email outbox drain failed: {e}")
+            if time.monotonic() - last_sweep >= self.sweep_interval_seconds:
+                last_sweep = time.monotonic()
+                try:
+                    deleted = await self.sweep()
+                    if deleted:
+                        logger.info(f"Swept {deleted} finished email outbox rows.")
+                except Exception as e:
+                    logger.error(f"Email outbox sweep failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+email_outbox_worker = EmailOutboxWorker(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval_seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    retention_days=settings.EMAIL_OUTBOX_RETENTION_DAYS,
+    sweep_interval_seconds=settings.EMAIL_OUTBOX_SWEEP_SECONDS,
+    sweep_batch_size=settings.EMAIL_OUTBOX_SWEEP_BATCH_SIZE,
+)
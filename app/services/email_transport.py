@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiosmtplib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# The server answered and rejected this message; the connection itself is still good
+# (aiosmtplib resets the transaction before raising these)
+_MESSAGE_ERRORS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+class _PooledConnection:
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.last_used_at = time.monotonic()
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open and reuses them across sends.
+
+    Connections idle for longer than `idle_seconds` are closed before reuse, since most
+    servers drop them on their side anyway; a send on a connection the server already
+    closed is retried once on a fresh one.
+    """
+
+    def __init__(self, hostname: str, port: int, username: str, password: str, size: int, idle_seconds: float, timeout: float):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: List[_PooledConnection] = []
+        self.stats: Dict[str, int] = {"sent": 0, "connects": 0, "reuses": 0, "reconnects": 0, "errors": 0}
+
+    async def _connect(self) -> _PooledConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=True,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        self.stats["connects"] += 1
+        return _PooledConnection(client)
+
+    async def _close(self, connection: _PooledConnection) -> None:
+        try:
+            await connection.client.quit()
+        except Exception:
+            connection.client.close()
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[_PooledConnection]:
+        async with self._semaphore:
+            connection: Optional[_PooledConnection] = None
+            while self._idle and connection is None:
+                candidate = self._idle.pop()
+                if candidate.client.is_connected and time.monotonic() - candidate.last_used_at < self.idle_seconds:
+                    connection = candidate
+                    self.stats["reuses"] += 1
+                else:
+                    await self._close(candidate)
+            if connection is None:
+                connection = await self._connect()
+            try:
+                yield connection
+            except _MESSAGE_ERRORS:
+                if connection.client.is_connected:
+                    connection.last_used_at = time.monotonic()
+                    self._idle.append(connection)
+                else:
+                    await self._close(connection)
+                raise
+            except BaseException:
+                # Disconnects, timeouts, cancellation: the connection's state is unknown
+                await self._close(connection)
+                raise
+            connection.last_used_at = time.monotonic()
+            self._idle.append(connection)
+
+    async def send(self, message: Message, sender: str, recipients: List[str]) -> None:
+        async with self._acquire() as connection:
+            try:
+                await connection.client.send_message(message, sender=sender, recipients=recipients)
+            except aiosmtplib.SMTPServerDisconnected:
+                self.stats["reconnects"] += 1
+                connection.client.close()
+                fresh = await self._connect()
+                connection.client = fresh.client
+                await connection.client.send_message(message, sender=sender, recipients=recipients)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+        self.stats["sent"] += 1
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await self._close(connection)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "idle": len(self._idle), "size": self.size}
+
+smtp_pool = SMTPConnectionPool(
+    hostname=settings.SMTP_SERVER,
+    port=settings.SMTP_PORT,
+    username=settings.SMTP_USERNAME,
+    password=settings.SMTP_PASSWORD,
+    size=settings.EMAIL_SMTP_POOL_SIZE,
+    idle_seconds=settings.EMAIL_SMTP_IDLE_SECONDS,
+    timeout=settings.EMAIL_SMTP_TIMEOUT_SECONDS,
+)
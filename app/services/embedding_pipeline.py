@@ -0,0 +1,177 @@
+"""
+Batch embedding backfill for trends, news items and ingredients.
+
+Rows are read in id order in large batches, embedded with one request per
+batch and written to the vector index in bulk. A per-kind watermark records
+the last embedded id, so an interrupted run resumes where it stopped.
+
+    python -m app.services.embedding_pipeline --kinds trends ingredients
+    python -m app.services.embedding_pipeline --hashing --index-dir ./vector_index_hashing   # offline, no API calls
+
+Hashing vectors are not comparable with the model's, so --hashing writes to its own
+--index-dir and refuses to touch VECTOR_INDEX_DIR.
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.embedding_watermark import embedding_watermark as embedding_watermark_crud
+from app.models.ingredient import Ingredient
+from app.models.news_feed import NewsFeed
+from app.models.trend import TrendData
+from app.services.semantic_search import SemanticSearch, ingredient_document, semantic_search, trend_document
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+class HashingEmbedder:
+    """
+    Deterministic offline stand-in for an embedding model: signed feature hashing of
+    word unigrams and bigrams, L2-normalised. Texts sharing words land close together.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.model_name = f"hashing-{dim}"
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = _TOKEN_RE.findall(text.lower())
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+# kind -> (model, columns to load, text builder)
+EmbeddingSource = Tuple[type, Sequence[str], Callable[..., str]]
+
+SOURCES: Dict[str, EmbeddingSource] = {
+    "trends": (TrendData, ("title", "description"), trend_document),
+    "news": (NewsFeed, ("title", "source"), lambda title, source: f"{title}\n{source}"),
+    "ingredients": (Ingredient, ("name", "description", "function", "benefits"), ingredient_document),
+}
+
+class EmbeddingPipeline:
+    def __init__(self, embedder, search: SemanticSearch = semantic_search, embedding_model: Optional[str] = None, batch_size: int = 512):
+        """
+        :param embedder: Anything with `async generate_embeddings(texts)`, e.g. an AIProvider or HashingEmbedder.
+        :param embedding_model: Recorded with the watermark; defaults to EMBEDDING_MODEL/EMBEDDING_DIMENSIONS.
+        """
+        self.embedder = embedder
+        self.search = search
+        self.embedding_model = embedding_model or getattr(embedder, "model_name", None) or f"{settings.EMBEDDING_MODEL}/{settings.EMBEDDING_DIMENSIONS}"
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def _next_batch(self, kind: str, after_id: int) -> List[Tuple[int, str]]:
+        model, columns, build_text = SOURCES[kind]
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(model.id, *(getattr(model, column) for column in columns))
+                .filter(model.id > after_id)
+                .order_by(model.id)
+                .limit(self.batch_size)
+            )
+            return [(row[0], build_text(*row[1:])) for row in result.all()]
+
+    async def run_kind(self, kind: str, max_batches: Optional[int] = None) -> int:
+        """Embeds rows of `kind` past its watermark. Returns the number of rows embedded."""
+        async with AsyncSessionLocal() as db:
+            last_id = await embedding_watermark_crud.aget_last_id(db, kind=kind, embedding_model=self.embedding_model)
+
+        embedded = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = await self._next_batch(kind, last_id)
+            if not rows:
+                break
+            items = [(row_id, text) for row_id, text in rows if text]
+            if items:
+                vectors = await self.embedder.generate_embeddings([text for _, text in items])
+                await self.search.add_vectors(kind, [row_id for row_id, _ in items], vectors)
+            last_id = rows[-1][0]
+            async with AsyncSessionLocal() as db:
+                await embedding_watermark_crud.aadvance(db, kind=kind, embedding_model=self.embedding_model, last_id=last_id)
+            embedded += len(items)
+            batches += 1
+            logger.info(f"Embedded {embedded} {kind} (watermark {last_id}).")
+        return embedded
+
+    async def run(self, kinds: Optional[Sequence[str]] = None, max_batches: Optional[int] = None) -> Dict[str, int]:
+        kinds = list(kinds or SOURCES)
+        counts = await asyncio.gather(*(self.run_kind(kind, max_batches=max_batches) for kind in kinds))
+        return dict(zip(kinds, counts))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, kinds: Optional[Sequence[str]] = None) -> bool:
+        """
+        Starts `run` as a background task unless one started here is still going; returns
+        whether it started. Only guards this process, so trigger backfills from one place.
+        """
+        if self.running:
+            return False
+        self._task = asyncio.create_task(self._run_logged(kinds))
+        return True
+
+    async def _run_logged(self, kinds: Optional[Sequence[str]]) -> None:
+        try:
+            counts = await self.run(kinds)
+            logger.info(f"Embedding backfill finished: {counts}")
+        except Exception as e:
+            logger.error(f"Embedding backfill failed: {e}")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", nargs="+", choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches per kind")
+    parser.add_argument("--hashing", action="store_true", help="Use the offline HashingEmbedder instead of the AI provider")
+    parser.add_argument("--index-dir", default=None, help="Vector index directory (defaults to VECTOR_INDEX_DIR; required with --hashing)")
+    args = parser.parse_args()
+    if args.hashing:
+        if args.index_dir is None:
+            parser.error("--hashing requires --index-dir")
+        if os.path.realpath(args.index_dir) == os.path.realpath(settings.VECTOR_INDEX_DIR):
+            parser.error("--hashing must not write to VECTOR_INDEX_DIR")
+    return args
+
+async def main(args: argparse.Namespace) -> None:
+    if args.hashing:
+        embedder = HashingEmbedder(settings.EMBEDDING_DIMENSIONS)
+    else:
+        from app.services.ai_provider import OpenAIProvider
+        embedder = OpenAIProvider()
+    search = semantic_search
+    if args.index_dir is not None:
+        search = SemanticSearch(
+            directory=args.index_dir,
+            dim=settings.EMBEDDING_DIMENSIONS,
+            ivf_threshold=settings.VECTOR_INDEX_IVF_THRESHOLD,
+            nprobe=settings.VECTOR_INDEX_NPROBE,
+        )
+    pipeline = EmbeddingPipeline(embedder, search=search, batch_size=args.batch_size)
+    counts = await pipeline.run(args.kinds, max_batches=args.max_batches)
+    for kind, count in counts.items():
+        print(f"{kind}: {count} embedded")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.crud.feed_source import feed_source as feed_source_crud
+from app.models.feed_source import FeedSource
+from app.services.feed_state import feed_state_store
+
+logger = logging.getLogger(__name__)
+
+class FeedScheduler:
+    """
+    Polls every enabled row of feed_sources on its own interval.
+
+    Due sources are claimed with a lease (so several workers can run the loop),
+    run at most `max_parallel` at a time, each with its own database sessions, and
+    rescheduled with jitter; failures back off exponentially up to `max_backoff_seconds`.
+    """
+
+    def __init__(self, max_parallel: int, poll_interval_seconds: float, jitter: float, max_backoff_seconds: float, lease_seconds: float):
+        self.max_parallel = max_parallel
+        self.poll_interval_seconds = poll_interval_seconds
+        self.jitter = jitter
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self.running = False
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._wakeup = asyncio.Event()
+        self._enrichment_tasks: Set[asyncio.Task] = set()
+        self._scraper = None
+        self._trend_service = None
+        self._news_feed_service = None
+        self.stats: Dict[str, int] = {"runs": 0, "failures": 0, "items": 0, "in_progress": 0}
+        # Last run of each source in this process, by source name
+        self.last_runs: Dict[str, Dict[str, Any]] = {}
+
+    def _services(self):
+        # Built on first use: the scraper refuses to start without a ScraperAPI key
+        if self._scraper is None:
+            from app.services.ai_provider import OpenAIProvider
+            from app.services.news_feed import NewsFeedService
+            from app.services.scraper import ScraperAPIScraper
+            from app.services.trend import TrendService
+
+            self._scraper = ScraperAPIScraper()
+            self._trend_service = TrendService(scraper=self._scraper, ai_provider=OpenAIProvider())
+            self._news_feed_service = NewsFeedService(scraper=self._scraper)
+        return self._scraper, self._trend_service, self._news_feed_service
+
+    def _delay_seconds(self, source: FeedSource, failed: bool) -> float:
+        delay = float(source.interval_seconds)
+        if failed:
+            failures = (source.consecutive_failures or 0) + 1
+            delay = min(self.max_backoff_seconds, delay * 2 ** failures)
+        # Spread sources out so they do not keep firing together
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run_enrichment(self, background_tasks: BackgroundTasks, db) -> None:
+        try:
+            await background_tasks()
+        except Exception as e:
+            logger.error(f"Feed enrichment failed: {e}")
+        finally:
+            db.close()
+
+    def _store(self, source: FeedSource, articles: List[Dict]) -> Tuple[int, Session, BackgroundTasks]:
+        """Saves a fetched batch; runs in a worker thread since the ingest services use a sync session."""
+        _, trend_service, news_feed_service = self._services()
+        # A fresh session per run; the trend enrichment tasks keep using it after this returns
+        db = SessionLocal()
+        background_tasks = BackgroundTasks()
+        try:
+            if source.kind == "trends":
+                created = trend_service.ingest_trends(db, background_tasks, articles)
+            else:
+                created = news_feed_service.ingest_news(db, articles, source=source.name)
+        except BaseException:
+            db.close()
+            raise
+        return created, db, background_tasks
+
+    async def _ingest(self, source: FeedSource) -> int:
+        scraper, _, _ = self._services()
+        if source.kind == "trends":
+            fetched = await scraper.fetch_food_trends(source.url)
+        elif source.kind == "news":
+            fetched = await scraper.fetch_food_news(source.url)
+        else:
+            raise ValueError(f"Unknown feed source kind '{source.kind}'")
+
+        created, db, background_tasks = await asyncio.to_thread(self._store, source, fetched.articles)
+        # Only now that the items are committed; a failed insert leaves the old state so the feed is re-read
+        if fetched.fingerprint is not None:
+            await feed_state_store.save(source.url, fetched.fingerprint)
+        if background_tasks.tasks:
+            task = asyncio.create_task(self._run_enrichment(background_tasks, db))
+            self._enrichment_tasks.add(task)
+            task.add_done_callback(self._enrichment_tasks.discard)
+        else:
+            db.close()
+        return created
+
+    async def run_source(self, source: FeedSource) -> None:
+        async with self._semaphore:
+            self.stats["in_progress"] += 1
+            started = time.monotonic()
+            created: Optional[int] = None
+            error: Optional[str] = None
+            try:
+                created = await self._ingest(source)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                self.stats["in_progress"] -= 1
+
+            duration_ms = int((time.monotonic() - started) * 1000)
+            next_run_at = datetime.now(timezone.utc) + timedelta(seconds=self._delay_seconds(source, failed=error is not None))
+            self.stats["runs"] += 1
+            if error is None:
+                self.stats["items"] += created
+                logger.info(f"Feed '{source.name}' ingested {created} new items in {duration_ms}ms.")
+            else:
+                self.stats["failures"] += 1
+                logger.error(f"Feed '{source.name}' failed, next attempt at {next_run_at.isoformat()}: {error}")
+            self.last_runs[source.name] = {
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": duration_ms,
+                "items": created,
+                "error": error,
+                "next_run_at": next_run_at.isoformat(),
+            }
+
+            async with AsyncSessionLocal() as db:
+                await feed_source_crud.arecord_run(
+                    db, id=source.id, next_run_at=next_run_at, duration_ms=duration_ms, item_count=created, error=error
+                )
+
+    async def run_due(self) -> int:
+        """Runs every source that is due now; returns how many were run."""
+        async with AsyncSessionLocal() as db:
+            sources = await feed_source_crud.aclaim_due(db, limit=self.max_parallel * 4, lease_seconds=self.lease_seconds)
+        results = await asyncio.gather(*(self.run_source(source) for source in sources), return_exceptions=True)
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Could not record the run of feed '{source.name}': {result}")
+        return len(sources)
+
+    async def trigger(self, kind: Optional[str] = None) -> int:
+        """Makes the enabled sources (of `kind`, if given) due now and wakes the loop."""
+        async with AsyncSessionLocal() as db:
+            count = await feed_source_crud.atrigger(db, kind=kind)
+        self._wakeup.set()
+        return count
+
+    async def run(self) -> None:
+        """Background loop started from the app lifespan."""
+        self.running = True
+        try:
+            while True:
+                try:
+                    while await self.run_due():
+                        pass
+                except Exception as e:
+                    logger.error(f"Feed scheduler pass failed: {e}")
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+        finally:
+            self.running = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "running": self.running,
+            "enrichment_in_progress": len(self._enrichment_tasks),
+            "sources": self.last_runs,
+        }
+
+feed_scheduler = FeedScheduler(
+    max_parallel=settings.FEED_SCHEDULER_MAX_PARALLEL,
+    poll_interval_seconds=settings.FEED_SCHEDULER_POLL_SECONDS,
+    jitter=settings.FEED_SCHEDULER_JITTER,
+    max_backoff_seconds=settings.FEED_SCHEDULER_MAX_BACKOFF_SECONDS,
+    lease_seconds=settings.FEED_SCHEDULER_LEASE_SECONDS,
+)
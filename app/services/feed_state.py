@@ -0,0 +1,73 @@
+import hashlib
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.database import AsyncSessionLocal
+from app.crud.feed_state import feed_state as feed_state_crud
+
+logger = logging.getLogger(__name__)
+
+class FeedFingerprint(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+
+class FetchedFeed(NamedTuple):
+    """Articles of one fetch, and the fingerprint to save once they have been ingested (None if unchanged)."""
+    articles: List[Dict]
+    fingerprint: Optional[FeedFingerprint]
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+class FeedStateStore:
+    """
+    Per-feed validators (ETag, Last-Modified) and body hash from the last parsed fetch.
+
+    The scraper sends the validators as a conditional request and compares the hash
+    of whatever comes back, so an unchanged feed is neither re-parsed nor re-ingested.
+    The caller saves the new state only once the parsed items have been ingested, so a
+    failed parse or insert is retried on the next run.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, int] = {"changed": 0, "not_modified": 0, "unchanged_body": 0}
+
+    async def get(self, url: str) -> Optional[FeedFingerprint]:
+        async with AsyncSessionLocal() as db:
+            state = await feed_state_crud.aget_by_url(db, url=url)
+        if state is None:
+            return None
+        return FeedFingerprint(state.etag, state.last_modified, state.content_hash)
+
+    def conditional_headers(self, fingerprint: Optional[FeedFingerprint]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if fingerprint is None:
+            return headers
+        if fingerprint.etag:
+            headers["If-None-Match"] = fingerprint.etag
+        if fingerprint.last_modified:
+            headers["If-Modified-Since"] = fingerprint.last_modified
+        return headers
+
+    async def mark_unchanged(self, url: str, not_modified: bool, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Records an unchanged fetch, keeping any validators the server sent with it."""
+        self.stats["not_modified" if not_modified else "unchanged_body"] += 1
+        async with AsyncSessionLocal() as db:
+            await feed_state_crud.amark_fetched(db, url=url, etag=etag, last_modified=last_modified)
+
+    async def save(self, url: str, fingerprint: FeedFingerprint) -> None:
+        self.stats["changed"] += 1
+        async with AsyncSessionLocal() as db:
+            await feed_state_crud.asave(
+                db,
+                url=url,
+                etag=fingerprint.etag,
+                last_modified=fingerprint.last_modified,
+                content_hash=fingerprint.content_hash,
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+feed_state_store = FeedStateStore()
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.formula import formula as formula_crud
 from app.crud.ingredient import ingredient as ingredient_crud
@@ -29,13 +30,13 @@ class FormulaService:
         self.ingredient_service = IngredientService(ai_provider)
         self.fake = Faker()
 
-    async def generate_formula_from_concept(self, db: Session, product_concept: str, current_user: User, market_insights: Optional[dict] = None, conversation_id: Optional[int] = None) -> Any:
+    async def generate_formula_from_concept(self, db: AsyncSession, product_concept: str, current_user: User, market_insights: Optional[dict] = None, conversation_id: Optional[int] = None) -> Any:
         chat_context = None
         if conversation_id:
             from app.services.insight_portal import InsightPortalService
             insight_service = InsightPortalService(ai_provider=self.ai_provider)
             try:
-                chat_context = insight_service.create_chat_context_for_insights(db, conversation_id, current_user.id)
+                chat_context = await insight_service.acreate_chat_context_for_insights(db, conversation_id, current_user.id)
             except ValueError:
                 chat_context = None
 
@@ -44,7 +45,7 @@ class FormulaService:
         except AIProviderError as e:
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"AI service failed to generate formula details: {e}")
 
-        formula_ingredients_create, enrichment_tasks = self._prepare_ingredients_data(db, ai_formula_details.ingredients)
+        formula_ingredients_create, enrichment_tasks = await self._prepare_ingredients_data(db, ai_formula_details.ingredients)
 
         if enrichment_tasks:
             results = await asyncio.gather(*enrichment_tasks, return_exceptions=True)
@@ -52,9 +53,9 @@ class FormulaService:
                 if isinstance(result, Exception):
                     print(f"An enrichment task failed after all retries: {result}")
 
-        return self._create_formula_with_ingredients(db, ai_formula_details, product_concept, formula_ingredients_create, current_user.id, conversation_id)
+        return await self._create_formula_with_ingredients(db, ai_formula_details, product_concept, formula_ingredients_create, current_user.id, conversation_id)
 
-    def _prepare_ingredients_data(self, db: Session, ai_ingredients: List[Any]):
+    async def _prepare_ingredients_data(self, db: AsyncSession, ai_ingredients: List[Any]):
         formula_ingredients_create = []
         enrichment_tasks = []
 
@@ -66,17 +67,17 @@ class FormulaService:
                 continue
 
             ingredient_slug = generate_slug(ingredient_name)
-            existing_ingredient = ingredient_crud.get_by_slug(db, slug=ingredient_slug)
+            existing_ingredient = await ingredient_crud.aget_by_slug(db, slug=ingredient_slug)
 
             if not existing_ingredient:
                 new_ingredient_data = IngredientCreate(name=ingredient_name, slug=ingredient_slug)
-                created_ingredient = self.ingredient_service.create_ingredient(db, ingredient_data=new_ingredient_data)
+                created_ingredient = await self.ingredient_service.acreate_ingredient(db, ingredient_data=new_ingredient_data)
                 ingredient_id = created_ingredient.id
                 enrichment_tasks.append(self.ingredient_service.enrich_ingredient_with_ai(ingredient_id=created_ingredient.id))
             else:
                 ingredient_id = existing_ingredient.id
 
-            cheapest_supplier = supplier_crud.get_cheapest_supplier_for_ingredient(db, ingredient_id)
+            cheapest_supplier = await supplier_crud.aget_cheapest_supplier_for_ingredient(db, ingredient_id)
             if cheapest_supplier:
                 supplier_id = cheapest_supplier.id
             else:
@@ -92,7 +93,7 @@ class FormulaService:
                     delivery_duration=random.choice(["1-3 days", "1 week", "2 weeks"]),
                     us_approved_status=self.fake.boolean()
                 )
-                created_supplier = supplier_crud.create(db, obj_in=mock_supplier_data)
+                created_supplier = await supplier_crud.acreate(db, obj_in=mock_supplier_data)
                 supplier_id = created_supplier.id
 
             formula_ingredients_create.append(FormulaIngredientCreate(
@@ -103,14 +104,14 @@ class FormulaService:
 
         return formula_ingredients_create, enrichment_tasks
 
-    def _create_formula_with_ingredients(self, db: Session, ai_formula_details: Any, product_concept: str, ingredients_data: List[FormulaIngredientCreate], author_id: int, conversation_id: Optional[int] = None):
+    async def _create_formula_with_ingredients(self, db: AsyncSession, ai_formula_details: Any, product_concept: str, ingredients_data: List[FormulaIngredientCreate], author_id: int, conversation_id: Optional[int] = None):
         formula_create_data = FormulaCreate(
             name=ai_formula_details.formula_name,
             description=ai_formula_details.formula_description,
             product_concept=product_concept,
             ingredients=ingredients_data,
         )
-        return formula_crud.create_with_author(db, obj_in=formula_create_data, author_id=author_id, conversation_id=conversation_id)
+        return await formula_crud.acreate_with_author(db, obj_in=formula_create_data, author_id=author_id, conversation_id=conversation_id)
 
     def get_formula(self, db: Session, id: int):
         return formula_crud.get(db, id=id)
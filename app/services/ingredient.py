@@ -1,13 +1,16 @@
 import logging
 import random
 from tenacity import retry, stop_after_attempt, wait_fixed, RetryError
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal
 from app.crud.ingredient import ingredient as ingredient_crud
 from app.crud.supplier import supplier as supplier_crud
 from app.schemas.ingredient import IngredientCreate, IngredientUpdate
 from app.schemas.supplier import SupplierCreate
 from app.services.ai_provider import AIProvider, AIProviderError
+from app.services.semantic_search import ingredient_document, semantic_search
 from app.services.supplier import SupplierService
 from faker import Faker
 from fastapi import HTTPException, status
@@ -33,9 +36,35 @@ class IngredientService:
 
         new_ingredient = ingredient_crud.create(db, obj_in=ingredient_data)
 
-        num_suppliers = random.randint(0, 10)
-        for _ in range(num_suppliers):
-            mock_supplier_data = SupplierCreate(
+        for mock_supplier_data in self._build_mock_suppliers(new_ingredient.id):
+            created_supplier = self.supplier_service.create_supplier(db, mock_supplier_data)
+
+        db.commit()
+        db.refresh(new_ingredient)
+        return new_ingredient
+
+    async def acreate_ingredient(self, db: AsyncSession, *, ingredient_data: IngredientCreate):
+        existing_ingredient = await ingredient_crud.aget_by_slug(db, slug=ingredient_data.slug)
+        if existing_ingredient:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"An ingredient with the slug '{ingredient_data.slug}' already exists."
+            )
+
+        if not ingredient_data.image:
+            ingredient_data.image = self.fake.image_url(width=640, height=480, placeholder_url='https://picsum.photos/{width}/{height}')
+
+        new_ingredient = await ingredient_crud.acreate(db, obj_in=ingredient_data)
+
+        for mock_supplier_data in self._build_mock_suppliers(new_ingredient.id):
+            await supplier_crud.acreate(db, obj_in=mock_supplier_data)
+
+        await db.refresh(new_ingredient)
+        return new_ingredient
+
+    def _build_mock_suppliers(self, ingredient_id: int) -> List[SupplierCreate]:
+        return [
+            SupplierCreate(
                 full_name=self.fake.company(),
                 avatar=self.fake.image_url(width=640, height=480, placeholder_url='https://picsum.photos/{width}/{height}'),
                 image=self.fake.image_url(width=640, height=480, placeholder_url='https://picsum.photos/{width}/{height}'),
@@ -46,13 +75,10 @@ class IngredientService:
                 moq_weight_kg=random.choice([10, 25, 50, 100]),
                 delivery_duration=random.choice(["1-3 days", "1 week", "2 weeks"]),
                 us_approved_status=self.fake.boolean(),
-                ingredient_id=new_ingredient.id
+                ingredient_id=ingredient_id
             )
-            created_supplier = self.supplier_service.create_supplier(db, mock_supplier_data)
-
-        db.commit()
-        db.refresh(new_ingredient)
-        return new_ingredient
+            for _ in range(random.randint(0, 10))
+        ]
 
     def get_ingredient(self, db: Session, id: int):
         return ingredient_crud.get(db, id=id)
@@ -85,8 +111,8 @@ class IngredientService:
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
     async def enrich_ingredient_with_ai(self, ingredient_id: int):
-        with SessionLocal() as db:
-            ingredient = self.get_ingredient(db, ingredient_id)
+        async with AsyncSessionLocal() as db:
+            ingredient = await ingredient_crud.aget(db, id=ingredient_id)
             if not ingredient:
                 logger.warning(f"Attempted to enrich non-existent ingredient with ID: {ingredient_id}")
                 return
@@ -108,7 +134,11 @@ class IngredientService:
                     "enrichment_status": "success",
                     "enrichment_error": None,
                 }
-                ingredient_crud.update(db, db_obj=ingredient, obj_in=update_data)
+                await ingredient_crud.aupdate(db, db_obj=ingredient, obj_in=update_data)
+                await semantic_search.index_items(self.ai_provider, "ingredients", [(
+                    ingredient.id,
+                    ingredient_document(ingredient.name, ingredient.description, ingredient.function, ingredient.benefits)
+                )])
 
             except Exception as e:
                 logger.error(f"AI enrichment failed for ingredient '{ingredient.name}' (ID: {ingredient_id}): {e}")
@@ -116,5 +146,5 @@ class IngredientService:
                     "enrichment_status": "failed",
                     "enrichment_error": str(e),
                 }
-                ingredient_crud.update(db, db_obj=ingredient, obj_in=update_data)
+                await ingredient_crud.aupdate(db, db_obj=ingredient, obj_in=update_data)
                 raise
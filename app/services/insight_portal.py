@@ -1,4 +1,5 @@
 from typing import Any, Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.services.ai_provider import AIProvider, AIProviderError
 from app.schemas.ai_responses import AIInsightPortalData
@@ -43,7 +44,15 @@ class InsightPortalService:
         if not conversation:
             raise ValueError("Conversation not found or access denied")
 
-        messages = chat_message.get_by_conversation_id(db, conversation_id=conversation_id)
+        messages = chat_message.get_last(db, conversation_id=conversation_id, limit=50)
+        return self._process_conversation_messages(messages)
+
+    async def acreate_chat_context_for_insights(self, db: AsyncSession, conversation_id: int, user_id: int) -> str:
+        conversation = await conversation_crud.aget_by_id_and_user(db, conversation_id=conversation_id, user_id=user_id)
+        if not conversation:
+            raise ValueError("Conversation not found or access denied")
+
+        messages = await chat_message.aget_last(db, conversation_id=conversation_id, limit=50)
         return self._process_conversation_messages(messages)
 
     def _process_conversation_messages(self, messages: List[Any]) -> str:
@@ -10,8 +10,6 @@ from app.utils.text_utils import generate_slug
 
 
 class NewsFeedService:
-    FOOD_DIVE_RSS_FEED_URL = "https://www.fooddive.com/feeds/news/"
-
     def __init__(self, scraper: Scraper):
         self.scraper = scraper
 
@@ -25,34 +23,39 @@ class NewsFeedService:
             print(f"Warning: Could not parse pubDate '{pubDate_str}' for news '{title}'. Setting to None.")
             return None
 
-    async def fetch_and_process_news(self, db: Session):
-        print(f"Fetching articles from RSS feed: {self.FOOD_DIVE_RSS_FEED_URL}")
-        articles = self.scraper.fetch_food_news(self.FOOD_DIVE_RSS_FEED_URL)
+    def ingest_news(self, db: Session, articles: List[dict], *, source: str) -> int:
+        """Saves the new items among `articles`, attributed to `source`; returns how many were saved."""
         print(f"Found {len(articles)} news articles")
 
+        candidates = {}
         for entry in articles:
             if not entry["title"] or not entry["link"]:
                 continue
 
             slug = generate_slug(entry["title"])
-            if news_feed_crud.get_by_slug(db, slug=slug):
-                # print(f"Skipping duplicate news: {entry["title"]}")
+            if slug in candidates:
                 continue
 
-            news_data_create = NewsFeedCreate(
-                title=entry["title"],
-                slug=slug,
-                source="Food Dive", # Hardcode the source
-                url=entry["link"],
-                image=entry["image"],
-                published_at=self._parse_pub_date(entry["pubDate"], entry["title"])
-            )
-
             try:
-                news_feed_crud.create(db, obj_in=news_data_create)
+                candidates[slug] = NewsFeedCreate(
+                    title=entry["title"],
+                    slug=slug,
+                    source=source,
+                    url=entry["link"],
+                    image=entry["image"],
+                    published_at=self._parse_pub_date(entry["pubDate"], entry["title"])
+                )
             except Exception as e:
                 print(f"Error processing news from {entry['link']}: {e}")
 
+        # One IN query for the slugs we already have, one multi-row insert for the rest
+        existing_slugs = news_feed_crud.get_existing_slugs(db, slugs=list(candidates))
+        created = news_feed_crud.create_many_by_slug(
+            db, objs_in=[news for slug, news in candidates.items() if slug not in existing_slugs]
+        )
+        print(f"Saved {len(created)} new news articles, skipped {len(existing_slugs)} duplicates")
+        return len(created)
+
     def get_news(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[NewsFeed]:
         """Retrieve news with pagination."""
         return news_feed_crud.get_multi(db, skip=skip, limit=limit)
@@ -1,66 +1,136 @@
 from abc import ABC, abstractmethod
-import requests
+import asyncio
+import httpx
 import logging
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import feedparser
-from typing import Optional, List, Dict, Any
-import xml.etree.ElementTree as ET
+from typing import Optional, List, Dict, Any, Tuple, Callable, Iterable, Iterator
 from html import unescape
 import re
 
 from app.core.config import settings
+from app.services.feed_state import FeedFingerprint, FetchedFeed, content_hash, feed_state_store
+from app.utils.rss import iter_chunks, iter_rss_items
 
 logger = logging.getLogger(__name__)
 
+# Cleaning patterns, compiled once rather than per item
+_TRENDHUNTER_SUFFIX_RE = re.compile(r'\s*\(TrendHunter\.com\)\s*')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
 # Define a common User-Agent header
 DEFAULT_REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "application/xml, text/xml, */*; q=0.01", # More appropriate for RSS/XML
     "Accept-Language": "en-US,en;q=0.9",
     "Cache-Control": "no-cache",
-    "Connection": "keep-alive",
-    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Encoding": "gzip, deflate",
 }
 
+def build_http_client() -> httpx.AsyncClient:
+    """Shared client for feed fetches: pooled keep-alive connections, HTTP/2 where the server offers it."""
+    return httpx.AsyncClient(
+        headers=DEFAULT_REQUEST_HEADERS,
+        http2=settings.SCRAPER_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SCRAPER_MAX_CONNECTIONS,
+            keepalive_expiry=settings.SCRAPER_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(settings.SCRAPER_TIMEOUT_SECONDS, connect=settings.SCRAPER_CONNECT_TIMEOUT_SECONDS),
+    )
+
+# Shared by every scraper instance in the process; closed from the app lifespan
+scraper_http_client = build_http_client()
+
 class Scraper(ABC):
     """Abstract base class for web scraping services."""
 
     @abstractmethod
-    def fetch_food_trends(self, rss_url: str) -> List[Dict]:
+    async def fetch_food_trends(self, rss_url: str) -> FetchedFeed:
+        """
+        Articles of one trend feed; raises if the feed cannot be fetched or parsed.
+        The caller saves the returned fingerprint once the articles are stored.
+        """
         pass
 
     @abstractmethod
-    def fetch_food_news(self, rss_url: str) -> List[Dict]:
+    async def fetch_food_news(self, rss_url: str) -> FetchedFeed:
+        """
+        Articles of one news feed; raises if the feed cannot be fetched or parsed.
+        The caller saves the returned fingerprint once the articles are stored.
+        """
         pass
 
 class ScraperAPIScraper(Scraper):
     """Scraper implementation that routes requests through ScraperAPI."""
 
-    def __init__(self):
+    # Per target host, so a dozen feeds from one site do not all hit it at once
+    _host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.api_key=settings.SCRAPER_API_KEY
         self.base_url: str = settings.SCRAPER_API_BASE_URL # Use settings for base_url
+        self.client = client or scraper_http_client
 
         if not self.api_key:
             raise ValueError("ScraperAPI key must be provided for ScraperAPIScraper.")
 
-    def _make_request(self, url: str, method: str = "GET", timeout: int = 10, **kwargs) -> requests.Response:
-        session = requests.Session()
-        session.headers.update(DEFAULT_REQUEST_HEADERS)
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(settings.SCRAPER_MAX_CONNECTIONS_PER_HOST)
+        return self._host_semaphores[host]
 
+    async def _make_request(self, url: str, method: str = "GET", timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
         payload = {"api_key": self.api_key, "url": url}
-        if method == "GET":
-            response = session.get(self.base_url, params=payload, timeout=timeout, **kwargs)
-        else:
+        if headers:
+            # ScraperAPI only forwards our own headers to the target when asked to
+            payload["keep_headers"] = "true"
+        if method != "GET":
             raise NotImplementedError("ScraperAPI integration for non-GET methods not fully implemented yet.")
 
+        async with self._host_semaphore(url):
+            response = await self.client.get(
+                self.base_url,
+                params=payload,
+                headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                **kwargs
+            )
+
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return response
         response.raise_for_status()
         return response
 
+    async def _fetch_feed(self, rss_url: str) -> Optional[Tuple[bytes, FeedFingerprint]]:
+        """
+        Conditionally fetches a feed. Returns None if it is unchanged since the last
+        parsed fetch (304, or an identical body), else the body and its new fingerprint.
+        """
+        previous = await feed_state_store.get(rss_url)
+        response = await self._make_request(rss_url, headers=feed_state_store.conditional_headers(previous))
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            await feed_state_store.mark_unchanged(rss_url, not_modified=True, etag=etag, last_modified=last_modified)
+            return None
+
+        digest = content_hash(response.content)
+        if previous is not None and previous.content_hash == digest:
+            # Same body under new validators; store them so the next request can get a 304
+            await feed_state_store.mark_unchanged(rss_url, not_modified=False, etag=etag, last_modified=last_modified)
+            return None
+
+        return response.content, FeedFingerprint(etag=etag, last_modified=last_modified, content_hash=digest)
+
     def _clean_title(self, title_text):
         """Clean title by removing CDATA tags and HTML entities"""
         if title_text.startswith('<![CDATA[') and title_text.endswith(']]>'):
             title_text = title_text[9:-3]  # Remove CDATA wrapper
-        title_text = re.sub(r'\s*\(TrendHunter\.com\)\s*', '', title_text)
+        title_text = _TRENDHUNTER_SUFFIX_RE.sub('', title_text)
         return unescape(title_text)
 
     def _clean_description(self, desc_text):
@@ -69,8 +139,8 @@ class ScraperAPIScraper(Scraper):
             desc_text = desc_text[9:-3]  # Remove CDATA wrapper
 
         # Remove HTML tags but keep the text content
-        desc_text = re.sub(r'<[^>]+>', '', desc_text)
-        desc_text = re.sub(r'\s*\(TrendHunter\.com\)\s*', '', desc_text)
+        desc_text = _HTML_TAG_RE.sub('', desc_text)
+        desc_text = _TRENDHUNTER_SUFFIX_RE.sub('', desc_text)
 
         # Clean up extra whitespace
         desc_text = ' '.join(desc_text.split())
@@ -97,72 +167,66 @@ class ScraperAPIScraper(Scraper):
                     desc_text = desc_text[9:-3]
 
                 # Look for img src attributes
-                img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', desc_text, re.IGNORECASE)
+                img_match = _IMG_SRC_RE.search(desc_text)
                 if img_match:
                     image_url = img_match.group(1)
 
         return image_url
 
-    def fetch_food_trends(self, rss_url: str) -> List[Dict]:
-        articles = []
+    def iter_food_trends(self, chunks: Iterable[bytes]) -> Iterator[Dict]:
+        """Normalized trend dicts from an RSS document fed in as byte chunks, one per item."""
+        for item in iter_rss_items(chunks):
+            title = item.find('title')
+            link = item.find('link')
+            description = item.find('description')
+            pub_date = item.find('pubDate')
+            enclosure = item.find('enclosure')
+
+            yield {
+                'title': self._clean_title(title.text) if title is not None and title.text else None,
+                'link': link.text if link is not None else None,
+                'description': self._clean_description(description.text) if description is not None and description.text else None,
+                'pubDate': pub_date.text if pub_date is not None else None,
+                'enclosure': enclosure.get('url') if enclosure is not None else None
+            }
+
+    def iter_food_news(self, chunks: Iterable[bytes]) -> Iterator[Dict]:
+        """Normalized news dicts from an RSS document fed in as byte chunks, one per item."""
+        for item in iter_rss_items(chunks):
+            title = item.find('title')
+            link = item.find('link')
+            description = item.find('description')
+            pub_date = item.find('pubDate')
+            image_url = self._extract_image_url(description, item)
+
+            yield {
+                'title': self._clean_title(title.text) if title is not None and title.text else None,
+                'link': link.text if link is not None else None,
+                'description': self._clean_description(description.text) if description is not None and description.text else None,
+                'pubDate': pub_date.text if pub_date is not None else None,
+                'image': image_url
+            }
+
+    async def _fetch_and_parse(self, rss_url: str, parse: Callable[[Iterable[bytes]], Iterator[Dict]]) -> FetchedFeed:
         try:
-            response = self._make_request(rss_url, timeout=30)
-            response_text = response.text
-            root = ET.fromstring(response_text)
-            feeds = root.findall('.//item')
-
-            for item in feeds:
-                title = item.find('title')
-                link = item.find('link')
-                description = item.find('description')
-                pub_date = item.find('pubDate')
-                enclosure = item.find('enclosure')
-
-                item_data = {
-                    'title': self._clean_title(title.text) if title is not None else None,
-                    'link': link.text if link is not None else None,
-                    'description': self._clean_description(description.text) if description is not None else None,
-                    'pubDate': pub_date.text if pub_date is not None else None,
-                    'enclosure': enclosure.get('url') if enclosure is not None else None
-                }
-
-                articles.append(item_data)
-        except requests.RequestException as e:
+            fetched = await self._fetch_feed(rss_url)
+            if fetched is None:
+                logger.info(f"RSS feed {rss_url} unchanged since the last fetch; skipping.")
+                return FetchedFeed([], None)
+            body, fingerprint = fetched
+            # Parsing is CPU-bound; keep it off the event loop
+            articles = await asyncio.to_thread(list, parse(iter_chunks(body)))
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching RSS feed {rss_url}: {e}")
+            raise
         except Exception as e:
             logger.error(f"Error parsing RSS feed {rss_url}: {e}")
+            raise
 
-        return articles
+        return FetchedFeed(articles, fingerprint)
 
-    def fetch_food_news(self, rss_url: str) -> List[Dict]:
-        articles = []
-        try:
-            response = self._make_request(rss_url, timeout=30)
-            response_text = response.text
-            # Register namespace to handle media:content tags
-            namespaces = {'media': 'http://search.yahoo.com/mrss/'}
-            root = ET.fromstring(response_text)
-            feeds = root.findall('.//item')
-
-            for item in feeds:
-                title = item.find('title')
-                link = item.find('link')
-                description = item.find('description')
-                pub_date = item.find('pubDate')
-                image_url = self._extract_image_url(description, item)
-
-                item_data = {
-                    'title': self._clean_title(title.text) if title is not None else None,
-                    'link': link.text if link is not None else None,
-                    'description': self._clean_description(description.text) if description is not None else None,
-                    'pubDate': pub_date.text if pub_date is not None else None,
-                    'image': image_url
-                }
-
-                articles.append(item_data)
-        except requests.RequestException as e:
-            logger.error(f"Error fetching RSS feed {rss_url}: {e}")
-        except Exception as e:
-            logger.error(f"Error parsing RSS feed {rss_url}: {e}")
+    async def fetch_food_trends(self, rss_url: str) -> FetchedFeed:
+        return await self._fetch_and_parse(rss_url, self.iter_food_trends)
 
-        return articles
+    async def fetch_food_news(self, rss_url: str) -> FetchedFeed:
+        return await self._fetch_and_parse(rss_url, self.iter_food_news)
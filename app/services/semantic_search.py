@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+def trend_document(title: str, description: Optional[str]) -> str:
+    return f"{title}\n{description or ''}".strip()
+
+def ingredient_document(name: str, description: Optional[str], function: Optional[str] = None, benefits: Optional[str] = None) -> str:
+    return "\n".join(part for part in (name, description, function, benefits) if part)
+
+class SemanticSearch:
+    """Embedding indexes for the entities chat retrieval can surface, one VectorIndex per kind."""
+
+    KINDS = ("trends", "news", "ingredients")
+
+    def __init__(self, directory: str, dim: int, ivf_threshold: int, nprobe: int):
+        self.indexes: Dict[str, VectorIndex] = {
+            kind: VectorIndex(directory, kind, dim, ivf_threshold=ivf_threshold, nprobe=nprobe)
+            for kind in self.KINDS
+        }
+
+    def is_empty(self, kinds: Sequence[str] = KINDS) -> bool:
+        return all(self.indexes[kind].count == 0 for kind in kinds)
+
+    async def add_vectors(self, kind: str, ids: Sequence[int], vectors: Sequence[Sequence[float]]) -> None:
+        await asyncio.to_thread(self.indexes[kind].upsert, list(ids), np.asarray(vectors, dtype=np.float32))
+
+    async def index_items(self, ai_provider, kind: str, items: List[Tuple[int, str]]) -> None:
+        """Embeds `(id, text)` items and adds them to the `kind` index. Failures are logged, not raised."""
+        items = [(item_id, text) for item_id, text in items if text]
+        if not items:
+            return
+        try:
+            vectors = await ai_provider.generate_embeddings([text for _, text in items])
+            await self.add_vectors(kind, [item_id for item_id, _ in items], vectors)
+        except Exception as e:
+            logger.error(f"Failed to index {len(items)} {kind} for semantic search: {e}")
+
+    async def search(self, ai_provider, query: str, k: int, kinds: Sequence[str] = KINDS) -> Dict[str, List[int]]:
+        """Ids of the `k` nearest items of each kind, best first."""
+        [query_vector] = await ai_provider.generate_embeddings([query])
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        # The scans are numpy-bound (and IVF-probed on large indexes); keep them off the event loop
+        results = await asyncio.gather(*(asyncio.to_thread(self.indexes[kind].search, query_vector, k) for kind in kinds))
+        return {kind: [item_id for item_id, _ in hits] for kind, hits in zip(kinds, results)}
+
+semantic_search = SemanticSearch(
+    directory=settings.VECTOR_INDEX_DIR,
+    dim=settings.EMBEDDING_DIMENSIONS,
+    ivf_threshold=settings.VECTOR_INDEX_IVF_THRESHOLD,
+    nprobe=settings.VECTOR_INDEX_NPROBE,
+)
@@ -12,8 +12,8 @@ from app.models.ingredient import Ingredient
 from app.models.supplier import Supplier as SupplierModel
 
 class SupplierService:
-    def get_bookmarked_suppliers(self, *, current_user: User):
-        return current_user.bookmarked_suppliers
+    def get_bookmarked_suppliers(self, *, db: Session, current_user: User):
+        return bookmarked_supplier_crud.get_suppliers_for_user(db, user_id=current_user.id)
 
     def bookmark_supplier(self, *, db: Session, supplier_id: int, current_user: User) -> str:
         db_supplier = supplier_crud.get(db, id=supplier_id)
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.token_denylist import token_denylist as token_denylist_crud
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing of one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class TokenDenylistCache:
+    """
+    In-memory copy of the unexpired token_denylist rows.
+
+    Lookups check a Bloom filter first, so the common case (token not revoked)
+    never touches the exact set or the database. Revocations from other workers
+    are picked up by polling for rows past the highest id seen, less `sync_overlap_ids`
+    since ids are not committed in order, and expired rows are swept from the table in batches.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_overlap_ids: int):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_overlap_ids = sync_overlap_ids
+        self.loaded = False
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._jtis: Dict[str, float] = {}
+        self._last_id = 0
+        self.stats: Dict[str, int] = {"lookups": 0, "bloom_positives": 0, "revoked_hits": 0, "synced": 0, "swept": 0}
+
+    def add(self, jti: str, exp: datetime) -> None:
+        self._jtis[jti] = exp.timestamp()
+        if len(self._jtis) > self._bloom.capacity:
+            self._rebuild()
+        else:
+            self._bloom.add(jti)
+
+    def contains(self, jti: str) -> bool:
+        self.stats["lookups"] += 1
+        if jti not in self._bloom:
+            return False
+        self.stats["bloom_positives"] += 1
+        revoked = jti in self._jtis
+        if revoked:
+            self.stats["revoked_hits"] += 1
+        return revoked
+
+    def _rebuild(self) -> None:
+        """Drops expired entries; Bloom filters cannot delete, so build a fresh one."""
+        now = datetime.now(timezone.utc).timestamp()
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        bloom = BloomFilter(max(self.capacity, len(self._jtis) * 2), self.error_rate)
+        for jti in self._jtis:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def _load_after(self, after_id: int) -> int:
+        async with AsyncSessionLocal() as db:
+            rows = await token_denylist_crud.aget_unexpired_after(db, after_id=after_id)
+        added = 0
+        for row in rows:
+            # The overlap re-reads rows we already hold
+            if row.jti not in self._jtis:
+                self.add(row.jti, row.exp)
+                added += 1
+            self._last_id = max(self._last_id, row.id)
+        return added
+
+    async def load(self) -> None:
+        count = await self._load_after(0)
+        self.loaded = True
+        logger.info(f"Loaded {count} revoked tokens into the denylist cache.")
+
+    async def sync(self) -> None:
+        self.stats["synced"] += await self._load_after(max(0, self._last_id - self.sync_overlap_ids))
+
+    async def sweep(self, batch_size: int) -> int:
+        deleted = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch = await token_denylist_crud.adelete_expired_batch(db, batch_size=batch_size)
+            deleted += batch
+            if batch < batch_size:
+                break
+        self._rebuild()
+        self.stats["swept"] += deleted
+        return deleted
+
+    async def run(self, sync_interval_seconds: float, sweep_interval_seconds: float, sweep_batch_size: int) -> None:
+        """Background loop: poll for new revocations and periodically sweep expired rows."""
+        seconds_since_sweep = 0.0
+        while True:
+            await asyncio.sleep(sync_interval_seconds)
+            seconds_since_sweep += sync_interval_seconds
+            try:
+                if not self.loaded:
+                    await self.load()
+                else:
+                    await self.sync()
+                if seconds_since_sweep >= sweep_interval_seconds:
+                    seconds_since_sweep = 0.0
+                    deleted = await self.sweep(sweep_batch_size)
+                    if deleted:
+                        logger.info(f"Swept {deleted} expired denylist rows.")
+            except Exception as e:
+                logger.error(f"Token denylist sync failed: {e}")
+
+    def get_stats(self) -> Dict[str, Optional[int]]:
+        return {**self.stats, "loaded": self.loaded, "entries": len(self._jtis), "last_id": self._last_id}
+
+token_denylist_cache = TokenDenylistCache(
+    capacity=settings.AUTH_DENYLIST_BLOOM_CAPACITY,
+    error_rate=settings.AUTH_DENYLIST_BLOOM_ERROR_RATE,
+    sync_overlap_ids=settings.AUTH_DENYLIST_SYNC_OVERLAP_IDS,
+)
@@ -1,3 +1,4 @@
+import asyncio
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -8,11 +9,10 @@ from app.crud.trend import trend as trend_crud
 from app.schemas.trend import TrendDataCreate, TrendCategory, TrendData
 from app.services.scraper import Scraper
 from app.services.ai_provider import AIProvider, OpenAIProvider
+from app.services.semantic_search import semantic_search, trend_document
 from app.utils.text_utils import generate_slug
 
 class TrendService:
-    TRENDHUNTER_RSS_FEED_URL = "https://www.trendhunter.com/rss/category/Food-Trends"
-
     def __init__(self, scraper: Scraper, ai_provider: AIProvider):
         self.scraper = scraper
         self.ai_provider = ai_provider
@@ -26,9 +26,12 @@ class TrendService:
             return None
 
     async def _categorize_and_tag_trend(self, db: Session, trend_id: int):
-        """Background task to enrich a trend with AI-generated category and tags."""
+        """
+        Background task to enrich a trend with AI-generated category and tags.
+        `db` is a sync session, so its queries run in a worker thread rather than on the event loop.
+        """
         print(f"Starting AI categorization for trend ID: {trend_id}")
-        db_obj = trend_crud.get(db, id=trend_id)
+        db_obj = await asyncio.to_thread(trend_crud.get, db, id=trend_id)
         if not db_obj:
             print(f"Error: Trend with ID {trend_id} not found for AI processing.")
             return
@@ -50,39 +53,54 @@ class TrendService:
                 "category": category_enum.value,
                 "tags": ai_data.tags
             }
-            trend_crud.update(db, db_obj=db_obj, obj_in=update_data)
+            await asyncio.to_thread(trend_crud.update, db, db_obj=db_obj, obj_in=update_data)
             print(f"Successfully categorized and tagged trend ID: {trend_id}")
         except Exception as e:
             print(f"Error during AI categorization for trend ID {trend_id}: {e}")
 
-    async def fetch_and_process_trends(self, db: Session, background_tasks: BackgroundTasks):
-        print(f"Fetching articles from RSS feed: {self.TRENDHUNTER_RSS_FEED_URL}")
-        articles = self.scraper.fetch_food_trends(self.TRENDHUNTER_RSS_FEED_URL)
+    def ingest_trends(self, db: Session, background_tasks: BackgroundTasks, articles: List[dict]) -> int:
+        """Saves the new trends among `articles` and queues their enrichment; returns how many were saved."""
         print(f"Found {len(articles)} articles")
 
+        candidates = {}
         for entry in articles:
+            if not entry["title"]:
+                continue
             slug = generate_slug(entry["title"])
-            if trend_crud.get_by_slug(db, slug=slug):
-                print(f"Skipping duplicate trend: {entry['title']}")
+            if slug in candidates:
                 continue
-
-            trend_data_create = TrendDataCreate(
-                link=entry["link"],
-                title=entry["title"],
-                slug=slug,
-                description=entry["description"],
-                pub_date=self._parse_pub_date(entry["pubDate"], entry["title"]),
-                image=entry["enclosure"]
-            )
-
             try:
-                new_trend = trend_crud.create(db, obj_in=trend_data_create)
-                print(f"Successfully saved trend: {new_trend.title}")
-                # Add the AI enrichment task to the background
-                background_tasks.add_task(self._categorize_and_tag_trend, db, new_trend.id)
+                candidates[slug] = TrendDataCreate(
+                    link=entry["link"],
+                    title=entry["title"],
+                    slug=slug,
+                    description=entry["description"],
+                    pub_date=self._parse_pub_date(entry["pubDate"], entry["title"]),
+                    image=entry["enclosure"]
+                )
             except Exception as e:
                 print(f"Error processing trend from {entry['link']}: {e}")
 
+        # One IN query for the slugs we already have, one multi-row insert for the rest
+        existing_slugs = trend_crud.get_existing_slugs(db, slugs=list(candidates))
+        print(f"Skipping {len(existing_slugs)} duplicate trends")
+        created = trend_crud.create_many_by_slug(
+            db, objs_in=[trend for slug, trend in candidates.items() if slug not in existing_slugs]
+        )
+        print(f"Successfully saved {len(created)} trends")
+
+        new_trends = []
+        for trend_id, slug in created:
+            trend = candidates[slug]
+            new_trends.append((trend_id, trend_document(trend.title, trend.description)))
+            # Add the AI enrichment task to the background
+            background_tasks.add_task(self._categorize_and_tag_trend, db, trend_id)
+
+        # One batched embedding request for everything saved in this run
+        if new_trends:
+            background_tasks.add_task(semantic_search.index_items, self.ai_provider, "trends", new_trends)
+        return len(created)
+
     def get_trends(self, db: Session, *, skip: int = 0, limit: int = 100, category: Optional[TrendCategory] = None, search: Optional[str] = None) -> List[TrendData]:
         """Retrieve trends with pagination, optional category filtering, and search."""
         return trend_crud.get_multi(db, skip=skip, limit=limit, category=category, search=search)
@@ -1,15 +1,17 @@
 from fastapi import HTTPException, status
 from app.crud.user import user as user_crud
-from app.core.security import pwd_context
+from app.core.security import hash_password
+from app.services.auth_cache import auth_cache
 
 class UserService:
-    def create_user(self, db, user_data):
+    async def create_user(self, db, user_data):
         if user_crud.get_by_email(db, email=user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        return user_crud.create(db, obj_in=user_data)
+        hashed_password = await hash_password(user_data.password)
+        return user_crud.create(db, obj_in=user_data, hashed_password=hashed_password)
 
     def update_user(self, db, user, user_data):
         # if any(key in user_data for key in ['email', 'password', 'hashed_password']):
@@ -17,7 +19,18 @@ class UserService:
         #         status_code=status.HTTP_400_BAD_REQUEST,
         #         detail="Email and password cannot be updated through this endpoint."
         #     )
-        return user_crud.update(db, db_obj=user, obj_in=user_data)
+        # current_user may be a stale copy from auth_cache; merging it would write every cached
+        # column back, so load the row fresh and apply only the fields being changed
+        db_user = user_crud.get(db, id=user.id)
+        if not db_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        previous_email = db_user.email
+        updated_user = user_crud.update(db, db_obj=db_user, obj_in=user_data)
+        auth_cache.invalidate_user(previous_email, updated_user.email)
+        return updated_user
 
     def find_user_by_reset_token(self, db, token):
         user = user_crud.get_by_reset_token(db, token=token)
@@ -37,7 +50,7 @@ class UserService:
             )
         return user
 
-    def change_password(self, db, user, old_password, new_password):
+    async def change_password(self, db, user, old_password, new_password):
         # Validate new_password
         if not new_password or not new_password.strip():
             raise HTTPException(
@@ -60,7 +73,7 @@ class UserService:
                 detail="New password must be different from the current password."
             )
 
-        if not user_crud.authenticate(db, email=user.email, password=old_password):
+        if not await user_crud.authenticate(db, email=user.email, password=old_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Incorrect password"
@@ -69,5 +82,5 @@ class UserService:
         self.update_user(
             db,
             user,
-            {"hashed_password": pwd_context.hash(new_password)}
+            {"hashed_password": await hash_password(new_password)}
         )
\ No newline at end of file
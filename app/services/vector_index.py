@@ -0,0 +1,257 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CHUNK_ROWS = 65536
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates])]
+
+class VectorIndex:
+    """
+    Cosine-similarity index over unit vectors stored in memory-mapped files.
+
+    Files live under `directory` as `<name>.vectors` (float32 rows), `<name>.ids`
+    (int64 row ids) and `<name>.meta.json`. Every worker maps the same files, so
+    the OS page cache holds one copy; a worker notices another worker's writes by
+    the meta file's version and remaps. Writes are serialised with a file lock.
+
+    Below `ivf_threshold` rows, search is an exact batched scan. Above it, rows
+    are clustered (spherical k-means) into inverted lists and a search scans
+    only the `nprobe` closest lists plus rows added since the last training.
+    """
+
+    def __init__(self, directory: str, name: str, dim: int, ivf_threshold: int = 50_000, nprobe: int = 8):
+        self.directory = Path(directory)
+        self.name = name
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._thread_lock = threading.Lock()
+        self._meta_mtime: Optional[int] = None
+        self._meta: Dict[str, int] = {"count": 0, "capacity": 0, "version": 0, "ivf_version": 0}
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        self._ivf: Optional[Dict[str, np.ndarray]] = None
+        self._positions: Optional[Dict[int, int]] = None
+        self._positions_version = -1
+
+    def _path(self, suffix: str) -> Path:
+        return self.directory / f"{self.name}.{suffix}"
+
+    @property
+    def count(self) -> int:
+        self._refresh()
+        return self._meta["count"]
+
+    # Loading
+
+    def _refresh(self, force: bool = False) -> None:
+        try:
+            mtime = os.stat(self._path("meta.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if not force and mtime == self._meta_mtime:
+            return
+        meta = json.loads(self._path("meta.json").read_text())
+        if meta.get("dim") != self.dim:
+            raise ValueError(f"Vector index '{self.name}' has dimension {meta.get('dim')}, expected {self.dim}.")
+        if meta["capacity"] != self._meta["capacity"] or self._vectors is None:
+            self._vectors = np.memmap(self._path("vectors"), dtype=np.float32, mode="r+", shape=(meta["capacity"], self.dim))
+            self._ids = np.memmap(self._path("ids"), dtype=np.int64, mode="r+", shape=(meta["capacity"],))
+        if meta.get("ivf_version") != self._meta.get("ivf_version") or (self._ivf is None and meta.get("ivf_version")):
+            self._ivf = self._load_ivf() if meta.get("ivf_version") else None
+        self._meta = meta
+        self._meta_mtime = mtime
+
+    def _load_ivf(self) -> Optional[Dict[str, np.ndarray]]:
+        try:
+            with np.load(self._path("ivf.npz")) as data:
+                return {key: data[key] for key in data.files}
+        except FileNotFoundError:
+            return None
+
+    # Writing
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._thread_lock, open(self._path("lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh(force=True)
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_meta(self) -> None:
+        self._meta["dim"] = self.dim
+        self._meta["version"] += 1
+        temp_path = self._path("meta.json.tmp")
+        temp_path.write_text(json.dumps(self._meta))
+        os.replace(temp_path, self._path("meta.json"))
+        self._meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+
+    def _grow(self, required: int) -> None:
+        capacity = max(1024, self._meta["capacity"])
+        while capacity < required:
+            capacity *= 2
+        if capacity == self._meta["capacity"]:
+            return
+        count = self._meta["count"]
+        for suffix, dtype, shape in (("vectors", np.float32, (capacity, self.dim)), ("ids", np.int64, (capacity,))):
+            temp_path = self._path(f"{suffix}.tmp")
+            grown = np.memmap(temp_path, dtype=dtype, mode="w+", shape=shape)
+            current = self._vectors if suffix == "vectors" else self._ids
+            if current is not None and count:
+                grown[:count] = current[:count]
+            grown.flush()
+            del grown
+            os.replace(temp_path, self._path(suffix))
+        self._vectors = np.memmap(self._path("vectors"), dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._ids = np.memmap(self._path("ids"), dtype=np.int64, mode="r+", shape=(capacity,))
+        self._meta["capacity"] = capacity
+
+    def _row_positions(self) -> Dict[int, int]:
+        if self._positions is None or self._positions_version != self._meta["version"]:
+            count = self._meta["count"]
+            self._positions = {int(row_id): row for row, row_id in enumerate(self._ids[:count])} if count else {}
+            self._positions_version = self._meta["version"]
+        return self._positions
+
+    def upsert(self, ids: List[int], vectors: np.ndarray) -> None:
+        """Adds or replaces the vectors of `ids`. Blocking; call from a worker thread."""
+        if not ids:
+            return
+        vectors = normalize(vectors)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(ids)}, {self.dim}), got {vectors.shape}.")
+
+        # The last vector given for an id wins
+        latest = {int(row_id): i for i, row_id in enumerate(ids)}
+
+        with self._write_lock():
+            positions = self._row_positions()
+            count = self._meta["count"]
+            new_ids = [row_id for row_id in latest if row_id not in positions]
+            self._grow(count + len(new_ids))
+
+            for row_id, i in latest.items():
+                row = positions.get(row_id)
+                if row is not None:
+                    self._vectors[row] = vectors[i]
+            if new_ids:
+                self._vectors[count:count + len(new_ids)] = vectors[[latest[row_id] for row_id in new_ids]]
+                self._ids[count:count + len(new_ids)] = np.asarray(new_ids, dtype=np.int64)
+                for offset, row_id in enumerate(new_ids):
+                    positions[row_id] = count + offset
+                self._meta["count"] = count + len(new_ids)
+            self._vectors.flush()
+            self._ids.flush()
+
+            if self._needs_training():
+                self._train_ivf()
+            self._write_meta()
+            self._positions_version = self._meta["version"]
+
+    # IVF
+
+    def _needs_training(self) -> bool:
+        count = self._meta["count"]
+        if count < self.ivf_threshold:
+            return False
+        if self._ivf is None:
+            return True
+        trained_count = int(self._ivf["trained_count"])
+        return count - trained_count > trained_count // 10
+
+    def _assign(self, centroids: np.ndarray, start: int, end: int) -> np.ndarray:
+        assignments = np.empty(end - start, dtype=np.int32)
+        for chunk_start in range(start, end, SEARCH_CHUNK_ROWS):
+            chunk_end = min(end, chunk_start + SEARCH_CHUNK_ROWS)
+            assignments[chunk_start - start:chunk_end - start] = np.argmax(self._vectors[chunk_start:chunk_end] @ centroids.T, axis=1)
+        return assignments
+
+    def _train_ivf(self) -> None:
+        count = self._meta["count"]
+        nlist = int(min(4096, max(16, np.sqrt(count))))
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(count, size=min(count, nlist * KMEANS_SAMPLE_PER_LIST), replace=False))
+        sample = np.asarray(self._vectors[sample_rows])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            populated = np.bincount(assignments, minlength=nlist) > 0
+            centroids[populated] = normalize(sums[populated])
+
+        assignments = self._assign(centroids, 0, count)
+        list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        list_offsets = np.searchsorted(assignments[list_rows], np.arange(nlist + 1)).astype(np.int64)
+        self._ivf = {
+            "centroids": centroids,
+            "list_rows": list_rows,
+            "list_offsets": list_offsets,
+            "trained_count": np.asarray(count),
+        }
+        temp_path = self._path("ivf.tmp.npz")
+        np.savez(temp_path, **self._ivf)
+        os.replace(temp_path, self._path("ivf.npz"))
+        self._meta["ivf_version"] = self._meta.get("ivf_version", 0) + 1
+        logger.info(f"Trained vector index '{self.name}': {count} rows in {nlist} lists.")
+
+    # Search
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """The `k` most similar (id, cosine score) pairs, best first."""
+        self._refresh()
+        count = self._meta["count"]
+        if count == 0 or self._vectors is None:
+            return []
+        query = normalize(query)
+
+        if self._ivf is None or count < self.ivf_threshold:
+            best_rows: List[np.ndarray] = []
+            best_scores: List[np.ndarray] = []
+            for start in range(0, count, SEARCH_CHUNK_ROWS):
+                scores = self._vectors[start:min(count, start + SEARCH_CHUNK_ROWS)] @ query
+                top = _top_k(scores, k)
+                best_rows.append(top + start)
+                best_scores.append(scores[top])
+            rows = np.concatenate(best_rows)
+            scores = np.concatenate(best_scores)
+        else:
+            ivf = self._ivf
+            probes = _top_k(ivf["centroids"] @ query, self.nprobe)
+            offsets = ivf["list_offsets"]
+            candidate_parts = [ivf["list_rows"][offsets[probe]:offsets[probe + 1]] for probe in probes]
+            # Rows added after training are not in any list yet
+            candidate_parts.append(np.arange(int(ivf["trained_count"]), count, dtype=np.int64))
+            rows = np.sort(np.concatenate(candidate_parts))
+            scores = self._vectors[rows] @ query
+
+        top = _top_k(scores, k)
+        return [(int(self._ids[rows[i]]), float(scores[i])) for i in top]
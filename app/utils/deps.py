@@ -1,62 +1,86 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.crud.user import user as user_crud
 from app.models.user import User
 from app.crud.token_denylist import token_denylist as token_denylist_crud
+from app.services.auth_cache import auth_cache
+from app.services.token_denylist import token_denylist_cache
 
 http_bearer = HTTPBearer()
 
+# The returned User is detached from the lookup session so that routes can use it
+# with either session type; sync routes that modify it merge it into their session.
+
+class _TokenRevoked(Exception):
+    pass
+
+class _InvalidToken(Exception):
+    pass
+
+async def _resolve_user(db: AsyncSession, token: str) -> User | None:
+    """Validates the token and loads its user, from auth_cache where possible."""
+    payload = auth_cache.get_claims(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        except JWTError:
+            raise _InvalidToken()
+        auth_cache.set_claims(token, payload)
+
+    # Check if token is in denylist
+    jti = payload.get("jti")
+    if jti:
+        if token_denylist_cache.loaded:
+            revoked = token_denylist_cache.contains(jti)
+        else:
+            # Not loaded yet (startup failed or no lifespan, e.g. in-process benchmarks)
+            revoked = await token_denylist_crud.aget_by_jti(db, jti=jti) is not None
+        if revoked:
+            raise _TokenRevoked()
+
+    email: str = payload.get("sub")
+    if email is None:
+        raise _InvalidToken()
+
+    user = auth_cache.get_user(email)
+    if user is None:
+        user = await user_crud.aget_by_email(db, email=email)
+        if user:
+            db.expunge(user)
+            auth_cache.set_user(user)
+    return user
+
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer)
 ) -> User:
     try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-
-        # Check if token is in denylist
-        jti = payload.get("jti")
-        if jti and token_denylist_crud.get_by_jti(db, jti=jti):
-            raise HTTPException(status_code=401, detail="Token has been revoked")
-
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+        user = await _resolve_user(db, credentials.credentials)
+    except _TokenRevoked:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    except _InvalidToken:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = user_crud.get_by_email(db, email=email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """The current user, if listed in ADMIN_EMAILS."""
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
 async def get_current_user_optional(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer)
 ) -> User:
     """Get current user if authenticated, otherwise return None."""
     try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-
-        # Check if token is in denylist
-        jti = payload.get("jti")
-        if jti and token_denylist_crud.get_by_jti(db, jti=jti):
-            return None  # Token revoked, treat as unauthenticated
-
-        email: str = payload.get("sub")
-        if email is None:
-            return None  # Invalid token, treat as unauthenticated
-    except JWTError:
-        return None  # Invalid token, treat as unauthenticated
-
-    user = user_crud.get_by_email(db, email=email)
-    return user  # Return user if found, None if not
+        return await _resolve_user(db, credentials.credentials)  # None if the user no longer exists
+    except (_TokenRevoked, _InvalidToken):
+        return None  # Revoked or invalid token, treat as unauthenticated
@@ -1,5 +1,10 @@
 """Central storage for all AI prompt templates and instructions."""
 
+import json
+from typing import Dict, Iterable, Type
+
+from pydantic import BaseModel
+
 # Marketing Service Prompts
 
 IMAGE_PROMPT_TEMPLATE = """A professional {lifestyle_or_mockup} of '{product_name}', which is a {product_description}.
@@ -126,6 +131,12 @@ DEFAULT_AGENT_SYSTEM_PROMPT = (
     "\n--- CONTEXT END ---"
 )
 
+CONVERSATION_SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and Nuriq's food and beverage assistant. "
+    "Update the existing summary with the new messages. Keep product concepts, ingredients, constraints, decisions and open questions; "
+    "drop pleasantries. Write concise plain prose of no more than a few short paragraphs."
+)
+
 COMMERCIALIZATION_INSIGHTS_INSTRUCTION = (
     "You are an expert commercialization strategist and risk analyst for the food and beverage industry. "
     "Your task is to analyze a product formula's commercialization workflow. "
@@ -156,3 +167,38 @@ COST_ANALYSIS_INSTRUCTION = (
     "5. Potential savings opportunities. "
     "Return detailed cost analysis as a JSON object."
 )
+
+# Structured Output Prompts
+
+STRUCTURED_OUTPUT_PREAMBLE = (
+    "Your response MUST be a single JSON object that strictly adheres to the following JSON Schema.\n\n"
+    "### JSON Schema\n"
+)
+
+class SchemaPromptRegistry:
+    """
+    Builds the JSON-schema block of structured system prompts once per response model.
+
+    The schema block is placed first so that every prompt for a given model shares a
+    byte-identical prefix, which lets upstream prompt caching reuse it.
+    """
+
+    def __init__(self):
+        self._prefixes: Dict[Type[BaseModel], str] = {}
+
+    def get_prefix(self, model_class: Type[BaseModel]) -> str:
+        prefix = self._prefixes.get(model_class)
+        if prefix is None:
+            schema_str = json.dumps(model_class.model_json_schema(), separators=(",", ":"))
+            prefix = f"{STRUCTURED_OUTPUT_PREAMBLE}{schema_str}\n\n### Instructions\n"
+            self._prefixes[model_class] = prefix
+        return prefix
+
+    def build(self, model_class: Type[BaseModel], instruction: str) -> str:
+        return self.get_prefix(model_class) + instruction.strip()
+
+    def warm(self, model_classes: Iterable[Type[BaseModel]]) -> None:
+        for model_class in model_classes:
+            self.get_prefix(model_class)
+
+schema_prompts = SchemaPromptRegistry()
@@ -0,0 +1,37 @@
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, List
+
+# Bytes handed to the XML parser at a time
+PARSE_CHUNK_SIZE = 64 * 1024
+
+def iter_chunks(body: bytes, size: int = PARSE_CHUNK_SIZE) -> Iterator[bytes]:
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+def iter_rss_items(chunks: Iterable[bytes]) -> Iterator[ET.Element]:
+    """
+    Yields each <item> element of an RSS document fed in as byte chunks, as soon as it closes.
+
+    An element is only valid until the next one is requested: it is then cleared and
+    detached from its parent, so memory stays flat however long the feed is.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elements: List[ET.Element] = []
+
+    def drain() -> Iterator[ET.Element]:
+        for event, element in parser.read_events():
+            if event == "start":
+                open_elements.append(element)
+                continue
+            open_elements.pop()
+            if element.tag == "item":
+                yield element
+                element.clear()
+                if open_elements:
+                    open_elements[-1].remove(element)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
@@ -0,0 +1,51 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+# Stop proxies (nginx in particular) from buffering or caching the event stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+class ServerSentEvent(NamedTuple):
+    data: Any
+    event: Optional[str] = None
+    id: Optional[str] = None
+
+    def encode(self) -> str:
+        # JSON keeps newlines inside tokens from breaking the single `data:` line
+        lines = []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        if self.event:
+            lines.append(f"event: {self.event}")
+        lines.append(f"data: {json.dumps(self.data, ensure_ascii=False)}")
+        return "\n".join(lines) + "\n\n"
+
+def encode_comment(text: str = "") -> str:
+    return f": {text}\n\n"
+
+async def encode_stream(events: AsyncIterator[ServerSentEvent], heartbeat_seconds: float) -> AsyncIterator[str]:
+    """
+    Encodes events as SSE frames, emitting a heartbeat comment whenever the source
+    has been quiet for `heartbeat_seconds` so idle connections are not reaped.
+    """
+    yield encode_comment("stream open")
+    iterator = events.__aiter__()
+    next_event = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_event}, timeout=heartbeat_seconds)
+            if not done:
+                yield encode_comment("ping")
+                continue
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
+            yield event.encode()
+            next_event = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        if not next_event.done():
+            next_event.cancel()
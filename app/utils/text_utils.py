@@ -1,4 +1,30 @@
+import re
+from typing import List
+
 from slugify import slugify
 
 def generate_slug(text: str) -> str:
     return slugify(text)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Common English words that carry no retrieval signal
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out over own
+please same she should so some such than that the their theirs them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your yours
+tell give show know want need like make find get let any many much use using
+""".split())
+
+def extract_keywords(text: str, max_keywords: int = 8) -> List[str]:
+    """Distinct, lower-cased content words of `text` in order of appearance."""
+    keywords: List[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) < 3 or word in STOPWORDS or word in keywords:
+            continue
+        keywords.append(word)
+        if len(keywords) == max_keywords:
+            break
+    return keywords
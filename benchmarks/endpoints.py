@@ -0,0 +1,171 @@
+"""
+End-to-end latency benchmark for the AI-backed endpoints.
+
+Drives chat streaming, formula generation, commercial analysis and marketing copy
+through the real FastAPI app in-process, with the AI provider swapped for a
+ReplayProvider so results measure the application's own overhead.
+
+Record fixtures once against OpenAI (needs OPENAI_API_KEY):
+    python -m benchmarks.endpoints --mode record --iterations 1
+
+Replay them with synthetic model latency:
+    python -m benchmarks.endpoints --mode replay --latency 0.05 --concurrency 20 --iterations 200
+
+By default a throwaway SQLite database is used; pass --database-url to run against Postgres.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+# Settings are read at import time, so the environment must be prepared first.
+DEFAULT_ENV = {
+    "SECRET_KEY": "benchmark-secret",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_PORT": "5432",
+    "DATABASE_USER": "benchmark",
+    "DATABASE_PASSWORD": "benchmark",
+    "DATABASE_NAME": "benchmark",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USERNAME": "benchmark",
+    "SMTP_PASSWORD": "benchmark",
+    "EMAILS_FROM_EMAIL": "benchmark@example.com",
+    "EMAILS_FROM_NAME": "Benchmark",
+    "CLOUDINARY_CLOUD_NAME": "benchmark",
+    "CLOUDINARY_API_KEY": "benchmark",
+    "CLOUDINARY_API_SECRET": "benchmark",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "SCRAPER_API_KEY": "benchmark",
+    "AI_CACHE_PERSISTENT": "false",
+}
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def report(name: str, samples: List[float], errors: int, elapsed: float) -> None:
+    if not samples:
+        print(f"{name:<24} no successful requests ({errors} errors)")
+        return
+    print(
+        f"{name:<24} n={len(samples):<5} err={errors:<3} "
+        f"rps={len(samples) / elapsed:8.1f} "
+        f"p50={percentile(samples, 50) * 1000:8.1f}ms "
+        f"p95={percentile(samples, 95) * 1000:8.1f}ms "
+        f"p99={percentile(samples, 99) * 1000:8.1f}ms "
+        f"mean={statistics.mean(samples) * 1000:8.1f}ms"
+    )
+
+async def run_scenario(name: str, request: Callable[[int], Awaitable[None]], iterations: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await request(i)
+            except Exception as e:
+                errors += 1
+                if errors == 1:
+                    print(f"  first {name} error: {e}", file=sys.stderr)
+                return
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    report(name, samples, errors, time.perf_counter() - started)
+
+async def main(args: argparse.Namespace) -> None:
+    import httpx
+    from main import app
+    from app.core.database import Base, engine, SessionLocal
+    from app.core.security import create_access_token
+    from app.crud.user import user as user_crud
+    from app.schemas.user import UserCreate
+    from app.services.ai_provider import OpenAIProvider
+    from app.services.ai_replay import RecordingProvider, ReplayProvider
+    from app.endpoints import chat, formula, commercial_workflow, marketing
+
+    Base.metadata.create_all(bind=engine)
+
+    if args.mode == "record":
+        provider = RecordingProvider(OpenAIProvider(), args.fixtures)
+    else:
+        provider = ReplayProvider(args.fixtures, latency_seconds=args.latency, chunk_latency_seconds=args.chunk_latency)
+
+    # Every service that talks to the AI provider holds its own reference to it
+    chat.chat_service.ai_provider = provider
+    formula.formula_service.ai_provider = provider
+    formula.formula_service.ingredient_service.ai_provider = provider
+    commercial_workflow.service.ai_provider = provider
+    marketing.marketing_service.ai_provider = provider
+    # Mockups are hosted on Cloudinary; keep the generated URL instead of uploading it
+    marketing.marketing_service.cloudinary_service.upload_from_url = lambda url: url
+
+    email = f"bench-{int(time.time())}@example.com"
+    with SessionLocal() as db:
+        user_crud.create(db, obj_in=UserCreate(email=email, password="benchmark123", full_name="Benchmark"))
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': email})}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+        response = await client.post("/chat/conversations/", json={"title": "Benchmark"})
+        response.raise_for_status()
+        conversation_id = response.json()["id"]
+        formula_ids: Dict[int, int] = {}
+
+        async def chat_stream(i: int) -> None:
+            response = await client.post("/chat/", data={
+                "message": args.chat_message,
+                "agent_type": "innovative",
+                "conversation_id": str(conversation_id),
+            })
+            response.raise_for_status()
+
+        async def generate_from_concept(i: int) -> None:
+            response = await client.post("/formulas/generate-from-concept", json={"product_concept": args.product_concept})
+            response.raise_for_status()
+            formula_ids[i] = response.json()["data"]["id"]
+
+        async def commercial_analysis(i: int) -> None:
+            response = await client.get(f"/commercial-workflow/formulas/{formula_ids[i]}/analyze")
+            response.raise_for_status()
+
+        async def marketing_copy(i: int) -> None:
+            response = await client.post(f"/formulas/{formula_ids[i]}/marketing-copy")
+            response.raise_for_status()
+
+        print(f"mode={args.mode} iterations={args.iterations} concurrency={args.concurrency} latency={args.latency}s")
+        await run_scenario("chat stream", chat_stream, args.iterations, args.concurrency)
+        await run_scenario("generate-from-concept", generate_from_concept, args.iterations, args.concurrency)
+        iterations = min(args.iterations, len(formula_ids))
+        await run_scenario("commercial analysis", commercial_analysis, iterations, args.concurrency)
+        await run_scenario("marketing copy", marketing_copy, iterations, args.concurrency)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--fixtures", default="benchmarks/fixtures")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Synthetic seconds before each replayed response")
+    parser.add_argument("--chunk-latency", type=float, default=0.0, help="Synthetic seconds between replayed chat chunks")
+    parser.add_argument("--chat-message", default="What are the current trends for oat milk beverages?")
+    parser.add_argument("--product-concept", default="A high-protein oat milk energy drink")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ["DATABASE_URL"] = args.database_url
+    asyncio.run(main(args))
@@ -0,0 +1,88 @@
+"""
+Login throughput and event-loop lag under concurrent password verification.
+
+Fires concurrent POST /auth/login/email requests at the real FastAPI app in-process
+while a probe task measures how late the event loop wakes it up. Run once with
+bcrypt offloaded to the password-hash pool (the default) and once inline to see
+the difference:
+    python -m benchmarks.password_hashing --mode pool --concurrency 20 --iterations 100
+    python -m benchmarks.password_hashing --mode inline --concurrency 20 --iterations 100
+
+By default a throwaway SQLite database is used; pass --database-url to run against Postgres.
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import List
+
+from benchmarks.endpoints import DEFAULT_ENV, percentile, run_scenario
+
+async def probe_loop_lag(interval: float, lags: List[float], stop: asyncio.Event) -> None:
+    """Sleeps for `interval` repeatedly and records how much later than requested it woke."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+async def main(args: argparse.Namespace) -> None:
+    import httpx
+    from main import app
+    from app.core.database import Base, engine, SessionLocal
+    from app.core.security import pwd_context
+    from app.crud.user import user as user_crud
+    from app.schemas.user import UserCreate
+    from app.services import auth as auth_module
+
+    Base.metadata.create_all(bind=engine)
+
+    if args.mode == "inline":
+        # What the handlers did before: bcrypt straight on the event loop
+        async def verify_inline(plain_password, hashed_password):
+            return pwd_context.verify(plain_password, hashed_password)
+        auth_module.verify_password = verify_inline
+
+    email = f"bench-{int(time.time())}@example.com"
+    password = "benchmark-password-123"
+    with SessionLocal() as db:
+        user_crud.create(db, obj_in=UserCreate(email=email, password=password, full_name="Benchmark"))
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(args.probe_interval, lags, stop))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def login(i: int) -> None:
+            response = await client.post("/auth/login/email", json={"email": email, "password": password})
+            response.raise_for_status()
+
+        print(f"mode={args.mode} iterations={args.iterations} concurrency={args.concurrency}")
+        await run_scenario("email login", login, args.iterations, args.concurrency)
+
+    stop.set()
+    await probe
+    if lags:
+        print(
+            f"{'event loop lag':<24} n={len(lags):<5} "
+            f"p50={percentile(lags, 50) * 1000:8.1f}ms "
+            f"p95={percentile(lags, 95) * 1000:8.1f}ms "
+            f"p99={percentile(lags, 99) * 1000:8.1f}ms "
+            f"max={max(lags) * 1000:8.1f}ms"
+        )
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["pool", "inline"], default="pool")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="Seconds between event-loop lag probes")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ["DATABASE_URL"] = args.database_url
+    asyncio.run(main(args))
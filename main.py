@@ -1,18 +1,64 @@
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.endpoints import auth, account, utility, ingredient, formula, trend, chat, commercial_workflow, news_feed, insight_portal, supplier, marketing
 from fastapi.exceptions import RequestValidationError
 from app.middleware.exceptions import global_exception_handler, validation_exception_handler
+from app.services.ai_cache import ai_response_cache
+from app.services.token_denylist import token_denylist_cache
+from app.services.email import EmailService
+from app.services.email_outbox import email_outbox_worker
+from app.services.email_transport import smtp_pool
+from app.services.scraper import scraper_http_client
+from app.services.feed_scheduler import feed_scheduler
 import logging
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await token_denylist_cache.load()
+    except Exception as e:
+        # Requests fall back to querying the denylist table until the sync loop loads it
+        logger.error(f"Could not load the token denylist at startup: {e}")
+    try:
+        template_count = await asyncio.to_thread(EmailService.precompile_templates)
+        logger.info(f"Precompiled {template_count} email templates.")
+    except Exception as e:
+        # Templates are compiled lazily on first use instead
+        logger.error(f"Could not precompile email templates: {e}")
+    background_tasks = [
+        asyncio.create_task(token_denylist_cache.run(
+            sync_interval_seconds=settings.AUTH_DENYLIST_SYNC_SECONDS,
+            sweep_interval_seconds=settings.AUTH_DENYLIST_SWEEP_SECONDS,
+            sweep_batch_size=settings.AUTH_DENYLIST_SWEEP_BATCH_SIZE,
+        )),
+        asyncio.create_task(email_outbox_worker.run()),
+    ]
+    if ai_response_cache is not None and settings.AI_CACHE_PERSISTENT:
+        background_tasks.append(asyncio.create_task(ai_response_cache.run(
+            sweep_interval_seconds=settings.AI_CACHE_SWEEP_SECONDS,
+            sweep_batch_size=settings.AI_CACHE_SWEEP_BATCH_SIZE,
+        )))
+    if settings.FEED_SCHEDULER_ENABLED:
+        background_tasks.append(asyncio.create_task(feed_scheduler.run()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await smtp_pool.close()
+    await scraper_http_client.aclose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -20,6 +20,11 @@ from app.models.bookmarked_news import BookmarkedNews
 from app.models.marketing import MarketingCopy
 from app.models.token_denylist import TokenDenylist
 from app.models.conversation import Conversation
+from app.models.ai_response_cache import AIResponseCacheEntry
+from app.models.embedding_watermark import EmbeddingWatermark
+from app.models.email_outbox import EmailOutbox
+from app.models.feed_state import FeedState
+from app.models.feed_source import FeedSource
 
 # Alembic Config object, which provides access to the .ini file values
 config = context.config
@@ -38,12 +43,26 @@ config.set_main_option("sqlalchemy.url", DATABASE_URL)
 # MetaData object for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Postgres-only generated columns (and their GIN indexes) added by hand in migration
+# e2a4c6b8d0f1; they are not mapped, so keep autogenerate from dropping them
+UNMAPPED_COLUMNS = {("trend_data", "search_vector"), ("ingredients", "search_vector")}
+UNMAPPED_INDEXES = {"ix_trend_data_search_vector", "ix_ingredients_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "column" and reflected and (object.table.name, name) in UNMAPPED_COLUMNS:
+        return False
+    if type_ == "index" and reflected and name in UNMAPPED_INDEXES:
+        return False
+    return True
+
 
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
     context.configure(
         url=DATABASE_URL,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,6 +83,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,48 @@
+"""add full-text search vectors to trend_data and ingredients
+
+Revision ID: e2a4c6b8d0f1
+Revises: d8f1a3c5e7b9
+Create Date: 2026-10-16 12:31:40.672093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c6b8d0f1'
+down_revision: Union[str, None] = 'd8f1a3c5e7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Generated columns keep the vectors current on every insert/update. They are
+# deliberately not mapped on the models, so SQLite (create_all) is unaffected.
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE trend_data ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    op.create_index('ix_trend_data_search_vector', 'trend_data', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.execute("""
+        ALTER TABLE ingredients ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(function, '') || ' ' || coalesce(benefits, '')), 'C')
+        ) STORED
+    """)
+    op.create_index('ix_ingredients_search_vector', 'ingredients', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingredients_search_vector', table_name='ingredients', postgresql_using='gin')
+    op.drop_column('ingredients', 'search_vector')
+    op.drop_index('ix_trend_data_search_vector', table_name='trend_data', postgresql_using='gin')
+    op.drop_column('trend_data', 'search_vector')